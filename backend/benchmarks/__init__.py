@@ -0,0 +1,6 @@
+"""
+Benchmarks for Employee Status Tracking System.
+
+Run from the backend directory, e.g. ``python -m benchmarks.bench_serializers``.
+Each benchmark builds its own throwaway SQLite test database.
+"""
@@ -0,0 +1,62 @@
+"""
+Minimal asyncio HTTP/1.1 client for load generators (no dependencies).
+"""
+import asyncio
+import json
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def dechunk(body):
+    """Decode a chunked transfer-encoded body."""
+    data = bytearray()
+    while body:
+        size_line, _, body = body.partition(b'\r\n')
+        size = int(size_line.split(b';')[0], 16)
+        if size == 0:
+            break
+        data += body[:size]
+        body = body[size + 2:]
+    return bytes(data)
+
+
+async def request(port, method, path, headers=None, body=None, host='127.0.0.1'):
+    """
+    Send one request on a new connection and read the whole response.
+
+    A dict or list `body` is sent as JSON. Response header names are
+    lower-cased.
+    """
+    headers = {'Host': host, 'Connection': 'close', **(headers or {})}
+    if body is not None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            headers.setdefault('Content-Type', 'application/json')
+        headers['Content-Length'] = str(len(body))
+    head = f'{method} {path} HTTP/1.1\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers.items())
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(head.encode() + b'\r\n' + (body or b''))
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, content = raw.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    if response_headers.get('transfer-encoding') == 'chunked':
+        content = dechunk(content)
+    return Response(int(status_line.split()[1]), response_headers, content)
@@ -0,0 +1,86 @@
+"""
+Shared helpers for benchmarks that start real servers on a seeded SQLite file.
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# Server kind -> (package it needs, command line after the interpreter)
+SERVERS = {
+    'wsgi': ('gunicorn', [
+        '-m', 'gunicorn', 'config.wsgi:application', '--bind', '127.0.0.1:{port}',
+        '--workers', '{workers}', '--log-level', 'warning',
+    ]),
+    'asgi': ('uvicorn', [
+        '-m', 'uvicorn', 'config.asgi:application', '--port', '{port}',
+        '--workers', '{workers}', '--log-level', 'warning', '--no-access-log',
+    ]),
+    'runserver': ('django', ['manage.py', 'runserver', '127.0.0.1:{port}', '--noreload']),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(path):
+    """Point this process at the SQLite file `path` and migrate it."""
+    os.environ['BENCH_DATABASE'] = path
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.server_settings'
+    import benchmarks._setup  # noqa: F401 - configures Django
+
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def server_env(database, **settings):
+    """Environment for a server process on `database`; `settings` are extra variables."""
+    return {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'benchmarks.server_settings',
+        'BENCH_DATABASE': database,
+        'DEBUG': 'False',
+        **settings,
+    }
+
+
+def start_server(kind, port, workers, env, log_file=None):
+    """
+    Start a server and wait until it accepts connections; returns the process.
+
+    Its output goes to `log_file` when given (e.g. runserver's access log),
+    else errors are shown on stderr.
+    """
+    command = [sys.executable] + [
+        arg.format(port=port, workers=workers) for arg in SERVERS[kind][1]
+    ]
+    process = subprocess.Popen(
+        command, env=env, stdout=log_file or subprocess.DEVNULL, stderr=log_file,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{kind} server exited with {process.returncode}')
+        # Gunicorn accepts connections before its workers have booted
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        try:
+            connection.request('GET', '/api/statuses/')
+            connection.getresponse().read()
+            return process
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+        finally:
+            connection.close()
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+def stop_server(process):
+    process.terminate()
+    process.wait()
@@ -0,0 +1,86 @@
+"""
+Shared helpers for benchmarks: Django bootstrap and data seeding.
+"""
+import os
+import time
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+
+def create_database():
+    """Create and migrate a throwaway test database."""
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def seed(employees, logs_per_employee=1, batch_size=5000, log_interval=timedelta(hours=1)):
+    """
+    Create `employees` employees, each with `logs_per_employee` status logs.
+
+    Logs are back to back, `log_interval` apart, ending now. The newest log
+    of every employee is left open; the rest are closed. Returns the list of
+    created statuses.
+    """
+    from django.contrib.auth.models import User
+    from employees.models import Employee, Status, StatusLog
+
+    statuses = [
+        Status.objects.get_or_create(name='Ready', defaults={'color': '#22c55e'})[0],
+        Status.objects.get_or_create(
+            name='Repair', defaults={'color': '#3b82f6', 'has_end_time': True}
+        )[0],
+    ]
+    user = User.objects.get_or_create(username='bench')[0]
+
+    first_id = Employee.objects.count()
+    Employee.objects.bulk_create(
+        [
+            Employee(name=f'Employee {first_id + i:06d}', email=f'employee{first_id + i}@example.com')
+            for i in range(employees)
+        ],
+        batch_size=batch_size,
+    )
+    now = timezone.now()
+    employee_ids = list(Employee.objects.order_by('-id').values_list('id', flat=True)[:employees])
+
+    logs = []
+    for employee_id in employee_ids:
+        for n in range(logs_per_employee):
+            is_open = n == logs_per_employee - 1
+            status = statuses[n % 2]
+            start = now - log_interval * (logs_per_employee - n)
+            logs.append(StatusLog(
+                employee_id=employee_id,
+                status=status,
+                start_time=start,
+                end_time=None if is_open else start + log_interval,
+                planned_end_time=start + log_interval / 2 if status.has_end_time else None,
+                notes='benchmark',
+                created_by=user,
+            ))
+        if len(logs) >= batch_size:
+            StatusLog.objects.bulk_create(logs, batch_size=batch_size)
+            logs = []
+    StatusLog.objects.bulk_create(logs, batch_size=batch_size)
+    return statuses
+
+
+def best_of(func, repeat=3):
+    """Run `func` `repeat` times and return (best elapsed seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
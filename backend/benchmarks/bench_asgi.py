@@ -0,0 +1,149 @@
+"""
+Concurrent-client throughput: WSGI (gunicorn) vs. ASGI (uvicorn) deployments.
+
+Seeds a SQLite file, starts each server on it with the same number of worker
+processes and drives the board endpoint with N concurrent clients for
+`--duration` seconds per level, reporting requests/sec, median and p99
+latency and failed requests. The last scenario also holds `--idle` open
+connections that never finish their request (slow clients): a sync worker
+is tied up by each of them, an event loop is not.
+
+Requires the servers: pip install gunicorn uvicorn
+
+Usage: python -m benchmarks.bench_asgi [--employees 200] [--workers 2]
+       [--concurrency 1,10,100] [--idle 50] [--duration 5]
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks._server import (
+    SERVERS, free_port, prepare_database, server_env, start_server, stop_server,
+)
+
+REQUEST_TIMEOUT = 10
+
+
+def seed_database(path, employees):
+    """Migrate and seed the SQLite file at `path`; returns an access token."""
+    prepare_database(path)
+    from benchmarks._setup import seed
+
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    seed(employees)
+    return str(AccessToken.for_user(User.objects.get(username='bench')))
+
+
+async def fetch(port, request):
+    """Send one request on a new connection; returns the status code."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def client(port, request, until, latencies, errors):
+    while time.monotonic() < until:
+        started = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(fetch(port, request), REQUEST_TIMEOUT)
+        except (OSError, IndexError, ValueError, asyncio.TimeoutError):
+            status = None
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(status)
+
+
+async def hold_idle(port, count):
+    """Open `count` connections that send an incomplete request and stay open."""
+    writers = []
+    for _ in range(count):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            break
+        writer.write(b'GET /api/employees/ HTTP/1.1\r\n')
+        writers.append(writer)
+    return writers
+
+
+async def run_load(port, request, concurrency, idle, duration):
+    """Returns (requests/sec, latencies, errors)."""
+    idle_writers = await hold_idle(port, idle)
+    latencies, errors = [], []
+    started = time.monotonic()
+    until = started + duration
+    await asyncio.gather(*(
+        client(port, request, until, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.monotonic() - started
+    for writer in idle_writers:
+        writer.close()
+    return len(latencies) / elapsed, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', default='1,10,100')
+    parser.add_argument('--idle', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--path', default='/api/employees/')
+    args = parser.parse_args()
+
+    scenarios = [(int(c), 0) for c in args.concurrency.split(',')]
+    if args.idle:
+        scenarios.append((10, args.idle))
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'bench.sqlite3')
+        token = seed_database(database, args.employees)
+        request = (
+            f'GET {args.path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+            f'Authorization: Bearer {token}\r\nConnection: close\r\n\r\n'
+        ).encode()
+        env = server_env(database, THROTTLE_RATE_BOARD='1000000/s')
+
+        print(f'{args.employees} employees, {args.workers} workers per server, GET {args.path}')
+        print(f'{"server":<6} {"clients":>7} {"idle":>5} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"failed":>7}')
+        for kind in ('wsgi', 'asgi'):
+            package = SERVERS[kind][0]
+            if importlib.util.find_spec(package) is None:
+                print(f'{kind:<6} skipped: {package} is not installed')
+                continue
+            port = free_port()
+            process = start_server(kind, port, args.workers, env)
+            try:
+                for concurrency, idle in scenarios:
+                    throughput, latencies, errors = asyncio.run(
+                        run_load(port, request, concurrency, idle, args.duration)
+                    )
+                    if latencies:
+                        latencies.sort()
+                        p50 = statistics.median(latencies) * 1000
+                        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                    else:
+                        p50 = p99 = float('nan')
+                    print(
+                        f'{kind:<6} {concurrency:>7} {idle:>5} {throughput:>9.1f} '
+                        f'{p50:>8.1f} {p99:>8.1f} {len(errors):>7}'
+                    )
+            finally:
+                stop_server(process)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Throughput and memory of the check_status_logs integrity scan.
+
+Seeds `--employees` employees with `--logs` back-to-back logs each (a million
+by default), corrupts `--corrupt` of them (overlaps, second open logs and
+stale overdue durations), then times a check-only scan per page size and a
+repairing scan. With `--memory`, peak Python memory of each check is
+measured with tracemalloc (in a separate, slower pass): it should stay flat
+as the number of logs grows.
+
+Usage: python -m benchmarks.bench_check_logs [--employees 2000] [--logs 500]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks._setup import create_database, seed
+
+from django.db.models import F
+
+from employees import log_integrity
+from employees.expressions import SecondsBetween
+from employees.models import StatusLog
+
+
+def corrupt(fraction, rng):
+    """Break about `fraction` of the closed logs; returns the number per kind of damage."""
+    # seed() leaves overdue durations at 0: make them right first
+    StatusLog.objects.filter(end_time__gt=F('planned_end_time')).update(
+        overdue_duration=SecondsBetween('end_time', 'planned_end_time')
+    )
+    ids = list(StatusLog.objects.filter(end_time__isnull=False).values_list('id', flat=True))
+    broken = rng.sample(ids, int(len(ids) * fraction))
+    third = len(broken) // 3
+    overlap, reopen, overdue = broken[:third], broken[third:2 * third], broken[2 * third:]
+    StatusLog.objects.filter(pk__in=overlap).update(end_time=F('end_time') + timedelta(minutes=10))
+    StatusLog.objects.filter(pk__in=reopen).update(end_time=None)
+    StatusLog.objects.filter(pk__in=overdue).update(overdue_duration=F('overdue_duration') + 60)
+    return {'overlap': len(overlap), 'open': len(reopen), 'overdue': len(overdue)}
+
+
+def scan(page_size, repair=False, batch_size=1000):
+    """One pass; returns (seconds, scanner, repaired logs)."""
+    started = time.perf_counter()
+    scanner = log_integrity.LogScanner()
+    pending = []
+    repaired = 0
+    for rows in log_integrity.pages(page_size):
+        repairs = scanner.feed(rows)[1]
+        if repair:
+            pending.extend(repairs)
+            if len(pending) >= batch_size:
+                repaired += log_integrity.repair(pending)
+                pending = []
+    if pending:
+        repaired += log_integrity.repair(pending)
+    return time.perf_counter() - started, scanner, repaired
+
+
+def peak_memory(page_size):
+    """Peak bytes allocated by Python during a check-only pass."""
+    tracemalloc.start()
+    scan(page_size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--logs', type=int, default=500)
+    parser.add_argument('--corrupt', type=float, default=0.01, help='Fraction of closed logs to break')
+    parser.add_argument('--page-sizes', default='1000,10000,50000')
+    parser.add_argument('--memory', action='store_true', help='Also measure peak memory per page size')
+    args = parser.parse_args()
+
+    create_database()
+    seed(args.employees, logs_per_employee=args.logs)
+    damage = corrupt(args.corrupt, random.Random(0))
+    total = StatusLog.objects.count()
+    print(f'{args.employees:,} employees, {total:,} logs; broken: {damage}')
+
+    for page_size in map(int, args.page_sizes.split(',')):
+        elapsed, scanner, _ = scan(page_size)
+        line = (
+            f'check  page {page_size:>6,}  {elapsed:7.2f} s  {total / elapsed:>10,.0f} logs/sec  '
+            f'issues {sum(scanner.counts.values()):,}'
+        )
+        if args.memory:
+            line += f'  peak {peak_memory(page_size) / 2**20:6.1f} MiB'
+        print(line)
+
+    elapsed, scanner, repaired = scan(10000, repair=True)
+    print(f'repair page 10,000  {elapsed:7.2f} s  {total / elapsed:>10,.0f} logs/sec  repaired {repaired:,}')
+    remaining = scan(10000)[1].counts
+    print(f'after repair: {remaining}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Latency of the status headcount time series.
+
+Seeds `--employees` employees with back-to-back logs covering `--days` days
+(one every `--interval-hours`), then times a headcount over the whole range
+at 15-minute resolution, split into the interval fetch and the NumPy sweep.
+
+Usage: python -m benchmarks.bench_headcount [--employees 5000] [--days 30]
+"""
+import argparse
+from datetime import timedelta
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.utils import timezone
+
+from employees import headcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--interval-hours', type=float, default=8)
+    parser.add_argument('--bucket', default='15m', choices=list(headcount.BUCKET_SECONDS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    create_database()
+    interval = timedelta(hours=args.interval_hours)
+    logs = int(timedelta(days=args.days) / interval)
+    seed(args.employees, logs_per_employee=logs, log_interval=interval)
+
+    now = timezone.now()
+    start, end = now - timedelta(days=args.days), now
+    buckets = headcount.number_of_buckets(start, end, args.bucket)
+    bucket_seconds = headcount.BUCKET_SECONDS[args.bucket]
+    print(f'{args.employees:,} employees, {args.employees * logs:,} logs, {buckets:,} buckets')
+
+    fetch_seconds, rows = best_of(lambda: headcount.interval_columns(start, end, now), args.repeat)
+    sweep_seconds, _ = best_of(
+        lambda: headcount.accumulate(rows, bucket_seconds, buckets), args.repeat
+    )
+    total_seconds, data = best_of(lambda: headcount.headcount(start, end, args.bucket, now), args.repeat)
+    print(f'fetch  {fetch_seconds * 1000:8.1f} ms  ({len(rows):,} intervals)')
+    print(f'sweep  {sweep_seconds * 1000:8.1f} ms')
+    print(f'total  {total_seconds * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Bytes on the wire for the employee board and history responses.
+
+Compares JSON and MessagePack bodies for the full and compact board and for a
+history page, uncompressed and with gzip/brotli as negotiated by
+CompressionMiddleware, plus the cost of compressing vs. a cache hit.
+
+Usage: python -m benchmarks.bench_payload [--employees 5000]
+"""
+import argparse
+import time
+
+from benchmarks._setup import create_database, seed
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from employees.middleware import brotli, compress_body
+
+FORMATS = (
+    ('json', 'application/json'),
+    ('msgpack', 'application/msgpack'),
+)
+
+ENCODINGS = ('identity', 'gzip', 'br')
+
+
+def fetch(client, path, accept, encoding):
+    response = client.get(path, HTTP_ACCEPT=accept, HTTP_ACCEPT_ENCODING=encoding)
+    assert response.status_code == 200, response.status_code
+    return response.content
+
+
+def report(label, sizes):
+    baseline = sizes['identity']
+    cells = [f'{label:<34}']
+    for encoding in ENCODINGS:
+        size = sizes.get(encoding)
+        if size is None:
+            cells.append(f'{encoding:>8} {"n/a":>20}')
+        else:
+            cells.append(f'{encoding:>8} {size:>9,} B ({100 * (1 - size / baseline):4.1f}%)')
+    print('  '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    create_database()
+    seed(args.employees, logs_per_employee=3)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username='bench'))
+    employee_id = User.objects.get(username='bench').statuslog_set.values_list(
+        'employee_id', flat=True
+    ).first()
+
+    paths = (
+        ('board', '/api/employees/'),
+        ('board ?view=compact', '/api/employees/?view=compact'),
+        ('history page', f'/api/employees/{employee_id}/history/'),
+    )
+
+    rest_framework = dict(settings.REST_FRAMEWORK, PAGE_SIZE=args.page_size)
+    with override_settings(REST_FRAMEWORK=rest_framework, COMPRESSION_MIN_SIZE=0):
+        print(f'{args.employees:,} employees, page size {args.page_size} (reduction vs identity)')
+        for label, path in paths:
+            for name, accept in FORMATS:
+                sizes = {}
+                for encoding in ENCODINGS:
+                    if encoding == 'br' and brotli is None:
+                        continue
+                    sizes[encoding] = len(fetch(client, path, accept, encoding))
+                report(f'{label} [{name}]', sizes)
+
+        body = fetch(client, '/api/employees/?view=compact', 'application/json', 'identity')
+        for encoding in ENCODINGS[1:]:
+            if encoding == 'br' and brotli is None:
+                continue
+            start = time.perf_counter()
+            compress_body(body, encoding)
+            compress_ms = (time.perf_counter() - start) * 1000
+            cache.clear()
+            fetch(client, '/api/employees/?view=compact', 'application/json', encoding)
+            start = time.perf_counter()
+            fetch(client, '/api/employees/?view=compact', 'application/json', encoding)
+            hit_ms = (time.perf_counter() - start) * 1000
+            print(
+                f'compact board {encoding:<5} compress {compress_ms:7.2f} ms/body, '
+                f'full request on cache hit {hit_ms:7.2f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
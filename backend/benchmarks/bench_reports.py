@@ -0,0 +1,60 @@
+"""
+Excel report generation: single process vs. time range shards over a pool.
+
+Seeds `--employees` employees with `--logs` logs each (200,000 by default),
+then times the company-wide report built by reports.build_excel() and by
+report_shards.build_excel() with 1, 2, 4, ... workers up to the number of
+CPUs, and checks every sharded file has the same cells as the single
+process one. Workers are forked (Linux) so they see the throwaway database.
+
+Usage: python -m benchmarks.bench_reports [--employees 1000] [--logs 200]
+"""
+import argparse
+import io
+import os
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.utils import timezone
+
+from employees import report_shards, reports
+
+
+def cells(content):
+    """All cell values of a report workbook."""
+    from openpyxl import load_workbook
+
+    return list(load_workbook(io.BytesIO(content), read_only=True).active.values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--logs', type=int, default=200)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    create_database()
+    seed(args.employees, logs_per_employee=args.logs)
+    now = timezone.now()
+    rows = args.employees * args.logs
+    print(f'{rows:,} rows, {os.cpu_count()} CPUs')
+
+    single, content = best_of(lambda: reports.build_excel(reports.report_logs({}), now), args.repeat)
+    print(f'single process  {single:7.2f} s  {rows / single:9,.0f} rows/sec  {len(content) / 1e6:6.1f} MB')
+    expected = cells(content)
+
+    workers = 1
+    while workers <= args.max_workers:
+        seconds, content = best_of(lambda: report_shards.build_excel({}, workers, now), args.repeat)
+        print(
+            f'{workers:2} worker(s)     {seconds:7.2f} s  {rows / seconds:9,.0f} rows/sec  '
+            f'{len(content) / 1e6:6.1f} MB  x{single / seconds:.2f}  '
+            f'{"identical" if cells(content) == expected else "MISMATCH"}'
+        )
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
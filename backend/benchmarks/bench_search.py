@@ -0,0 +1,89 @@
+"""
+Notes search over a long history: FTS5 index vs. LIKE scans.
+
+Seeds `--employees` employees with `--logs` logs each (a million by
+default) and gives every log notes drawn from a vocabulary, so some words
+are common and some rare. Times a page of ``/api/employees/notes/`` matches
+(newest first) through SQLiteFTS5Backend and ScanBackend for each word, then
+the cost of the sync triggers on inserts.
+
+Usage: python -m benchmarks.bench_search [--employees 2000] [--logs 500]
+"""
+import argparse
+import random
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.db import connection
+
+from employees import search
+from employees.models import StatusLog
+
+# Word -> share of logs mentioning it
+VOCABULARY = {
+    'waiting': 0.2,
+    'engine': 0.05,
+    'gearbox': 0.005,
+    'windscreen': 0.0005,
+    'catalytic': 0.00005,
+}
+FILLER = ['checked', 'ok', 'left', 'bay', 'parts', 'ordered', 'customer', 'called']
+
+
+def write_notes(rng, batch_size=10000):
+    """Set random notes on every log (through the sync triggers)."""
+    ids = list(StatusLog.objects.values_list('id', flat=True))
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), batch_size):
+            rows = []
+            for pk in ids[start:start + batch_size]:
+                words = rng.sample(FILLER, 3)
+                words += [word for word, share in VOCABULARY.items() if rng.random() < share]
+                rng.shuffle(words)
+                rows.append((' '.join(words).capitalize(), pk))
+            cursor.executemany('UPDATE employees_statuslog SET notes = %s WHERE id = %s', rows)
+
+
+def time_inserts(count, repeat=3):
+    """Seconds to bulk insert `count` logs with notes."""
+    template = StatusLog.objects.first()
+
+    def insert():
+        StatusLog.objects.bulk_create([
+            StatusLog(employee_id=template.employee_id, status_id=template.status_id, notes='Engine checked')
+            for _ in range(count)
+        ])
+    return best_of(insert, repeat)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--logs', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    create_database()
+    seed(args.employees, logs_per_employee=args.logs)
+    write_notes(random.Random(0))
+    total = StatusLog.objects.count()
+    print(f'{total:,} logs')
+
+    fts, scan = search.SQLiteFTS5Backend(), search.ScanBackend()
+    for word, share in VOCABULARY.items():
+        fts_seconds, fts_ids = best_of(lambda: fts.log_ids(word, args.page_size), args.repeat)
+        scan_seconds, scan_ids = best_of(lambda: scan.log_ids(word, args.page_size), args.repeat)
+        print(
+            f'{word:<11} ~{share * total:>9,.0f} matches  fts {fts_seconds * 1000:8.2f} ms  '
+            f'scan {scan_seconds * 1000:9.2f} ms  {"identical" if fts_ids == scan_ids else "MISMATCH"}'
+        )
+
+    indexed = time_inserts(10000)
+    search.drop_sqlite_indexes(connection)
+    plain = time_inserts(10000)
+    print(f'bulk insert of 10,000 logs: {indexed * 1000:.1f} ms with the index, {plain * 1000:.1f} ms without')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Rows/sec of the DRF serializers vs. the fast read path.
+
+Measures query + serialization + JSON rendering for EmployeeListSerializer
+(employee board) and StatusLogSerializer (history) at 1k, 10k and 100k rows,
+and checks that both paths render byte-identical output.
+
+Usage: python -m benchmarks.bench_serializers [--sizes 1000,10000,100000]
+"""
+import argparse
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.db.models import Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from employees import fastpath
+from employees.models import Employee, StatusLog
+from employees.renderers import FastJSONRenderer
+from employees.serializers import EmployeeListSerializer, StatusLogSerializer
+
+
+def employee_board_drf(now):
+    queryset = Employee.objects.filter(is_active=True).prefetch_related(
+        Prefetch(
+            'status_logs',
+            queryset=StatusLog.objects.filter(end_time__isnull=True).select_related('status'),
+            to_attr='open_status_logs',
+        )
+    )
+    data = EmployeeListSerializer(queryset, many=True, context={'now': now}).data
+    return JSONRenderer().render(data)
+
+
+def employee_board_fast(now):
+    rows = fastpath.employee_list_queryset(Employee.objects.filter(is_active=True))
+    return FastJSONRenderer().render(fastpath.serialize_employee_rows(rows, now))
+
+
+def status_logs_drf(now, limit):
+    queryset = StatusLog.objects.select_related('employee', 'status', 'created_by')[:limit]
+    data = StatusLogSerializer(queryset, many=True, context={'now': now}).data
+    return JSONRenderer().render(data)
+
+
+def status_logs_fast(now, limit):
+    queryset = StatusLog.objects.select_related('employee', 'status', 'created_by')[:limit]
+    rows = fastpath.status_log_queryset(queryset)
+    return FastJSONRenderer().render(fastpath.serialize_status_log_rows(rows, now))
+
+
+def report(label, rows, drf_seconds, fast_seconds, identical):
+    print(
+        f'{label:<22} {rows:>8,} rows  '
+        f'drf {rows / drf_seconds:>10,.0f} rows/s  '
+        f'fast {rows / fast_seconds:>10,.0f} rows/s  '
+        f'x{drf_seconds / fast_seconds:5.1f}  '
+        f'{"identical" if identical else "MISMATCH"}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    create_database()
+    seeded = 0
+    for size in sizes:
+        # Two logs per employee: one closed, one open
+        seed(size - seeded, logs_per_employee=2)
+        seeded = size
+        now = timezone.now()
+
+        drf_seconds, drf_body = best_of(lambda: employee_board_drf(now), args.repeat)
+        fast_seconds, fast_body = best_of(lambda: employee_board_fast(now), args.repeat)
+        report('EmployeeListSerializer', size, drf_seconds, fast_seconds, drf_body == fast_body)
+
+        drf_seconds, drf_body = best_of(lambda: status_logs_drf(now, size), args.repeat)
+        fast_seconds, fast_body = best_of(lambda: status_logs_fast(now, size), args.repeat)
+        report('StatusLogSerializer', size, drf_seconds, fast_seconds, drf_body == fast_body)
+
+
+if __name__ == '__main__':
+    main()
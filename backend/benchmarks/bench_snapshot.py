@@ -0,0 +1,99 @@
+"""
+Latency of point-in-time snapshots over a long history.
+
+Seeds `--employees` employees with `--logs` back-to-back logs each
+(`--interval-hours` apart, so the defaults cover about 2.7 years), then times
+the snapshot lookup plus serialization at random instants, through the DRF
+serializers and the fast read path. One instant is cross-checked against a
+full scan of StatusLog in Python.
+
+Usage: python -m benchmarks.bench_snapshot [--employees 2000] [--logs 500]
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.db import connection
+from django.utils import timezone
+
+from employees import fastpath, snapshot
+from employees.models import StatusLog
+from employees.renderers import FastJSONRenderer
+from employees.serializers import EmployeeListSerializer
+
+
+def board_at_drf(at):
+    employees = list(snapshot.employees_at(at))
+    active_logs = snapshot.logs_at(at, employees)
+    for employee in employees:
+        log = active_logs.get(employee.id)
+        employee.open_status_logs = [log] if log else []
+    data = EmployeeListSerializer(employees, many=True, context={'now': at}).data
+    return FastJSONRenderer().render(data)
+
+
+def board_at_fast(at):
+    rows = snapshot.employees_at(at).values_list(*fastpath.EMPLOYEE_COLUMNS, 'snapshot_log_id')
+    return FastJSONRenderer().render(fastpath.serialize_snapshot_rows(rows, at))
+
+
+def scan_at(at):
+    """The full-scan alternative: walk every log started by `at`."""
+    active = {}
+    for log in StatusLog.objects.filter(start_time__lte=at).order_by('start_time').iterator():
+        if log.end_time is None or log.end_time > at:
+            active[log.employee_id] = log.id
+        else:
+            active.pop(log.employee_id, None)
+    return active
+
+
+def print_query_plan(at):
+    sql, params = snapshot.employees_at(at).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        for row in cursor.fetchall():
+            print('   ', row[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--logs', type=int, default=500)
+    parser.add_argument('--interval-hours', type=float, default=48)
+    parser.add_argument('--instants', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    create_database()
+    interval = timedelta(hours=args.interval_hours)
+    seed(args.employees, logs_per_employee=args.logs, log_interval=interval)
+    now = timezone.now()
+    span = interval * args.logs
+    print(f'{args.employees:,} employees, {args.employees * args.logs:,} logs over {span.days} days')
+    print('Query plan:')
+    print_query_plan(now)
+
+    rng = random.Random(0)
+    for _ in range(args.instants):
+        at = now - span * rng.random()
+        drf_seconds, drf_body = best_of(lambda: board_at_drf(at), args.repeat)
+        fast_seconds, fast_body = best_of(lambda: board_at_fast(at), args.repeat)
+        print(
+            f'{at:%Y-%m-%d %H:%M}  drf {drf_seconds * 1000:8.1f} ms  '
+            f'fast {fast_seconds * 1000:8.1f} ms  {len(fast_body):>9,} bytes  '
+            f'{"identical" if drf_body == fast_body else "MISMATCH"}'
+        )
+
+    at = now - span / 2
+    scan_seconds, scanned = best_of(lambda: scan_at(at), 1)
+    employees = list(snapshot.employees_at(at))
+    active_logs = snapshot.logs_at(at, employees)
+    matches = scanned == {pk: log.id for pk, log in active_logs.items()}
+    print(f'Full scan: {scan_seconds * 1000:8.1f} ms  {"identical" if matches else "MISMATCH"}')
+
+
+if __name__ == '__main__':
+    main()
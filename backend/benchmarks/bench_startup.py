@@ -0,0 +1,118 @@
+"""
+Worker startup time and first-request latency.
+
+Imports ``config.wsgi`` in `--runs` fresh interpreters with
+``python -X importtime``, reporting the median import time, the slowest
+top-level packages and whether report-only dependencies (openpyxl, NumPy)
+or Celery were loaded. Then, in fresh processes with a seeded database,
+times the first board requests through the full middleware stack with and
+without ``warm_up()``.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--employees 500]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+HEAVY_MODULES = ('openpyxl', 'numpy', 'celery')
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def import_config_wsgi():
+    """Import config.wsgi in a fresh interpreter; returns (total us, self us per package, heavy loaded)."""
+    code = (
+        'import sys, config.wsgi; '
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True,
+    )
+    total = 0
+    by_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        by_package[module.split('.')[0]] += int(self_us)
+        if module == 'config.wsgi' and not indent:
+            total = int(cumulative_us)
+    return total, by_package, result.stdout.strip()
+
+
+def first_requests(warm, employees, requests):
+    """Child process: latency of the first `requests` board requests (ms)."""
+    import time
+
+    from benchmarks._setup import create_database, seed
+
+    create_database()
+    seed(employees)
+
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from employees.warmup import warm_up
+
+    # The worker starts here: its URLconf, views and board caches are cold
+    if warm:
+        warm_up()
+    token = AccessToken.for_user(User.objects.get(username='bench'))
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get('/api/employees/')
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+    print(' '.join(f'{ms:.2f}' for ms in latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--child', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        first_requests(args.child == 'warm', args.employees, args.requests)
+        return
+
+    totals = []
+    packages = defaultdict(list)
+    for _ in range(args.runs):
+        total, by_package, heavy = import_config_wsgi()
+        totals.append(total)
+        for package, us in by_package.items():
+            packages[package].append(us)
+    print(f'import config.wsgi: {statistics.median(totals) / 1000:.1f} ms (median of {args.runs})')
+    print(f'loaded at startup: {heavy or "none of " + ", ".join(HEAVY_MODULES)}')
+    slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:10]
+    for package, values in slowest:
+        print(f'    {package:<28} {statistics.median(values) / 1000:7.1f} ms')
+
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings'}
+    for mode in ('cold', 'warm'):
+        result = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_startup', '--child', mode,
+             '--employees', str(args.employees), '--requests', str(args.requests)],
+            capture_output=True, text=True, check=True, env=env,
+        )
+        latencies = [float(ms) for ms in result.stdout.split()]
+        print(
+            f'{mode:<5} first request {latencies[0]:8.1f} ms   '
+            f'steady state {statistics.median(latencies[1:]):6.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-request overhead of throttling.
+
+Times the throttle check alone for `--users` users taking turns: no throttle,
+DRF's UserRateThrottle (a timestamp list per key in the cache) and the token
+bucket. Then makes `--reads` status list reads in a row through the test
+client, plain and with a matching If-None-Match: past the board scope's
+burst plain reads get 429, while 304 answers are never charged.
+
+Usage: python -m benchmarks.bench_throttle [--users 1000] [--requests 100000]
+"""
+import argparse
+import logging
+from collections import Counter
+from types import SimpleNamespace
+
+from benchmarks._setup import best_of, create_database, seed
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.throttling import UserRateThrottle
+
+from employees.throttling import TokenBucketThrottle
+from employees.views import StatusViewSet
+
+
+class NoThrottle:
+    def allow_request(self, request, view):
+        return True
+
+
+class ManyUserRateThrottle(UserRateThrottle):
+    rate = '1000000/hour'
+
+
+def check_requests(throttle_class, requests, view):
+    """Run one throttle check per request; returns how many were allowed."""
+    allowed = 0
+    for request in requests:
+        allowed += throttle_class().allow_request(request, view)
+    return allowed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--employees', type=int, default=50)
+    parser.add_argument('--reads', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    factory = APIRequestFactory()
+    users = [SimpleNamespace(pk=pk, is_authenticated=True) for pk in range(args.users)]
+    requests = []
+    for i in range(args.requests):
+        request = factory.get('/api/statuses/')
+        request.user = users[i % args.users]
+        requests.append(request)
+    view = StatusViewSet()
+
+    print(f'{args.requests:,} checks over {args.users:,} users')
+    for name, throttle_class in (
+        ('none', NoThrottle),
+        ('UserRateThrottle', ManyUserRateThrottle),
+        ('TokenBucketThrottle', TokenBucketThrottle),
+    ):
+        cache.clear()
+        TokenBucketThrottle.buckets.clear()
+        seconds, _ = best_of(lambda: check_requests(throttle_class, requests, view), args.repeat)
+        print(f'{name:<20} {seconds / args.requests * 1e6:8.2f} us/request')
+
+    # 429 answers are expected below; don't log each one
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    create_database()
+    seed(args.employees)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username='bench'))
+    etag = client.get('/api/statuses/')['ETag']
+    for name, headers in (('200 OK', {}), ('304 Not Modified', {'if_none_match': etag})):
+        codes = Counter()
+
+        def reads():
+            TokenBucketThrottle.buckets.clear()
+            codes.clear()
+            for _ in range(args.reads):
+                codes[client.get('/api/statuses/', headers=headers).status_code] += 1
+
+        seconds, _ = best_of(reads, args.repeat)
+        answers = ', '.join(f'{count} x {code}' for code, count in sorted(codes.items()))
+        print(f'{name:<20} {seconds / args.reads * 1e3:8.3f} ms/read  ({answers})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""
+Load test replaying dashboard polling and dispatcher writes against a local server.
+
+Seeds a SQLite file, starts a server on it and runs, for `--duration`
+seconds:
+
+- `--dashboards` dashboards, each logged in as its own user, polling
+  ``/api/employees/`` and ``/api/statuses/`` every `--poll-interval` seconds
+  like the frontend. Like a browser cache they revalidate with the last ETag
+  (``--no-etags`` to always fetch full bodies).
+- `--dispatchers` dispatchers that, about every `--change-interval` seconds,
+  open the status dialog (``/api/statuses/``), change a random employee's
+  status and refetch the board, and about every `--report-interval` seconds
+  download the Excel report.
+
+Every client logs in through ``/api/auth/login/``, refreshes its tokens
+every `--refresh-interval` seconds and, like the frontend, refreshes and
+retries once on a 401. Per-user throttling stays on (only the per-IP login
+limit is lifted, since all clients share 127.0.0.1), so 429s show up as
+errors. The load generator runs on the same machine as the server.
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint, plus
+the exceptions the server logged (``--json`` for a machine-readable summary).
+
+Usage: python -m benchmarks.load_test [--dashboards 50] [--dispatchers 5]
+       [--duration 60] [--server wsgi|asgi|runserver] [--workers 2]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from benchmarks import _http
+from benchmarks._server import (
+    SERVERS, free_port, prepare_database, server_env, start_server, stop_server,
+)
+
+PASSWORD = 'load-test'
+
+REQUEST_TIMEOUT = 30
+
+# Last line of a traceback, e.g. "django.db.utils.OperationalError: database is locked"
+EXCEPTION_LINE = re.compile(r'^[\w.]+(Error|Exception): ')
+
+
+def seed_database(path, employees, dashboards, dispatchers):
+    """Seed employees and one user per simulated client; returns (usernames, status ids, employee ids)."""
+    prepare_database(path)
+    from benchmarks._setup import seed
+
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from employees.models import Employee
+
+    statuses = seed(employees)
+    # Hash once: every client user gets the same password
+    password = make_password(PASSWORD)
+    usernames = {
+        'dashboard': [f'dashboard-{n}' for n in range(dashboards)],
+        'dispatcher': [f'dispatcher-{n}' for n in range(dispatchers)],
+    }
+    User.objects.bulk_create([
+        User(username=username, password=password)
+        for names in usernames.values() for username in names
+    ])
+    employee_ids = list(Employee.objects.values_list('id', flat=True))
+    return usernames, [(s.id, s.has_end_time) for s in statuses], employee_ids
+
+
+class Stats:
+    """Latencies and status codes per endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, endpoint, status, seconds):
+        self.statuses[endpoint][status] += 1
+        if status is not None and status < 400:
+            self.latencies[endpoint].append(seconds)
+
+    def summary(self, elapsed):
+        """``{endpoint: {...}}`` with throughput, percentiles (ms) and errors."""
+        summary = {}
+        for endpoint in sorted(self.statuses):
+            statuses = self.statuses[endpoint]
+            total = sum(statuses.values())
+            errors = sum(n for status, n in statuses.items() if status is None or status >= 400)
+            latencies = sorted(self.latencies[endpoint])
+            summary[endpoint] = {
+                'requests': total,
+                'per_second': total / elapsed,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'not_modified': statuses.get(304, 0),
+                'errors': errors,
+                'error_rate': errors / total if total else 0.0,
+                'statuses': {str(status): n for status, n in sorted(statuses.items(), key=str)},
+            }
+        return summary
+
+
+def percentile(latencies, q):
+    """Nearest-rank percentile of sorted latencies, in milliseconds."""
+    if not latencies:
+        return None
+    rank = max(0, min(len(latencies) - 1, round(q / 100 * len(latencies)) - 1))
+    return latencies[rank] * 1000
+
+
+class Client:
+    """One simulated browser session: tokens, ETags and timed requests."""
+
+    def __init__(self, port, username, stats, use_etags):
+        self.port = port
+        self.username = username
+        self.stats = stats
+        self.use_etags = use_etags
+        self.access = None
+        self.refresh_token = None
+        self.etags = {}
+
+    async def call(self, endpoint, method, path, headers=None, body=None):
+        """Time one request under `endpoint`; returns the response or None."""
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                _http.request(self.port, method, path, headers, body), REQUEST_TIMEOUT
+            )
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+            self.stats.record(endpoint, None, time.perf_counter() - started)
+            return None
+        self.stats.record(endpoint, response.status, time.perf_counter() - started)
+        return response
+
+    async def login(self):
+        response = await self.call(
+            'login', 'POST', '/api/auth/login/',
+            body={'username': self.username, 'password': PASSWORD},
+        )
+        if response is not None and response.status == 200:
+            tokens = response.json()
+            self.access, self.refresh_token = tokens['access'], tokens['refresh']
+            return True
+        return False
+
+    async def refresh(self):
+        """Rotate the tokens, or log in again when that fails."""
+        response = await self.call(
+            'refresh', 'POST', '/api/auth/refresh/', body={'refresh': self.refresh_token}
+        )
+        if response is None or response.status != 200:
+            return await self.login()
+        tokens = response.json()
+        self.access = tokens['access']
+        self.refresh_token = tokens.get('refresh', self.refresh_token)
+        return True
+
+    async def api(self, endpoint, method, path, body=None):
+        """An authenticated request; on a 401, refresh and retry once."""
+        for attempt in range(2):
+            headers = {'Authorization': f'Bearer {self.access}'}
+            if method == 'GET' and self.use_etags and path in self.etags:
+                headers['If-None-Match'] = self.etags[path]
+            response = await self.call(endpoint, method, path, headers, body)
+            if response is None or response.status != 401 or attempt:
+                break
+            if not await self.refresh():
+                break
+        if response is not None and response.status == 200 and 'etag' in response.headers:
+            self.etags[path] = response.headers['etag']
+        return response
+
+
+async def keep_tokens_fresh(client, interval):
+    while True:
+        await asyncio.sleep(interval)
+        await client.refresh()
+
+
+async def dashboard(client, poll_interval, refresh_interval):
+    # Dashboards open at random moments, not all at once
+    await asyncio.sleep(random.uniform(0, poll_interval))
+    if not await client.login():
+        return
+    refresher = asyncio.create_task(keep_tokens_fresh(client, refresh_interval))
+    try:
+        while True:
+            await client.api('employees', 'GET', '/api/employees/')
+            await client.api('statuses', 'GET', '/api/statuses/')
+            await asyncio.sleep(poll_interval)
+    finally:
+        refresher.cancel()
+
+
+async def dispatcher(client, statuses, employee_ids, change_interval, report_interval, refresh_interval):
+    await asyncio.sleep(random.uniform(0, change_interval))
+    if not await client.login():
+        return
+    refresher = asyncio.create_task(keep_tokens_fresh(client, refresh_interval))
+    next_report = time.monotonic() + random.uniform(0, report_interval)
+    try:
+        while True:
+            await client.api('statuses', 'GET', '/api/statuses/')
+            status_id, has_end_time = random.choice(statuses)
+            payload = {'status_id': status_id, 'notes': 'load test'}
+            if has_end_time:
+                payload['planned_end_time'] = time.strftime(
+                    '%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + random.randint(600, 7200))
+                )
+            employee_id = random.choice(employee_ids)
+            await client.api(
+                'change_status', 'POST', f'/api/employees/{employee_id}/change_status/', payload
+            )
+            await client.api('employees', 'GET', '/api/employees/')
+
+            if time.monotonic() >= next_report:
+                await client.api('report', 'GET', '/api/reports/excel/')
+                next_report = time.monotonic() + report_interval
+            # Exponential gaps: dispatchers act at random, about change_interval apart
+            await asyncio.sleep(random.expovariate(1 / change_interval))
+    finally:
+        refresher.cancel()
+
+
+async def run(args, port, usernames, statuses, employee_ids):
+    stats = Stats()
+    tasks = [
+        dashboard(
+            Client(port, username, stats, not args.no_etags),
+            args.poll_interval, args.refresh_interval,
+        )
+        for username in usernames['dashboard']
+    ] + [
+        dispatcher(
+            Client(port, username, stats, not args.no_etags), statuses, employee_ids,
+            args.change_interval, args.report_interval, args.refresh_interval,
+        )
+        for username in usernames['dispatcher']
+    ]
+    tasks = [asyncio.create_task(task) for task in tasks]
+    started = time.monotonic()
+    await asyncio.sleep(args.duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats, time.monotonic() - started
+
+
+def server_errors(log_path):
+    """Count the exceptions (last line of each traceback) in the server log."""
+    with open(log_path, errors='replace') as log_file:
+        return Counter(
+            line.rstrip() for line in log_file
+            if EXCEPTION_LINE.match(line) or '[ERROR]' in line
+        )
+
+
+def print_summary(summary):
+    print(
+        f'{"endpoint":<14} {"requests":>8} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} '
+        f'{"p99 ms":>8} {"304s":>6} {"errors":>7}  statuses'
+    )
+
+    def ms(value):
+        return f'{value:8.1f}' if value is not None else f'{"-":>8}'
+
+    for endpoint, row in summary.items():
+        statuses = ' '.join(f'{status}:{n}' for status, n in row['statuses'].items())
+        print(
+            f'{endpoint:<14} {row["requests"]:>8} {row["per_second"]:>8.1f} {ms(row["p50_ms"])} '
+            f'{ms(row["p95_ms"])} {ms(row["p99_ms"])} {row["not_modified"]:>6} '
+            f'{row["error_rate"]:>6.1%}  {statuses}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dashboards', type=int, default=50)
+    parser.add_argument('--dispatchers', type=int, default=5)
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--server', choices=list(SERVERS), default=None,
+                        help='default: wsgi (gunicorn) when installed, else runserver')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--poll-interval', type=float, default=5)
+    parser.add_argument('--change-interval', type=float, default=10)
+    parser.add_argument('--report-interval', type=float, default=60)
+    parser.add_argument('--refresh-interval', type=float, default=120)
+    parser.add_argument('--no-etags', action='store_true')
+    parser.add_argument('--seed', type=int, default=None, help='random seed')
+    parser.add_argument('--json', action='store_true', help='print a JSON summary')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    server = args.server
+    if server is None:
+        server = 'wsgi' if importlib.util.find_spec('gunicorn') else 'runserver'
+    if importlib.util.find_spec(SERVERS[server][0]) is None:
+        parser.error(f'--server {server} needs {SERVERS[server][0]} (pip install {SERVERS[server][0]})')
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'load.sqlite3')
+        usernames, statuses, employee_ids = seed_database(
+            database, args.employees, args.dashboards, args.dispatchers
+        )
+        port = free_port()
+        log_path = os.path.join(directory, 'server.log')
+        with open(log_path, 'w') as log_file:
+            # All simulated clients log in from 127.0.0.1: lift the per-IP login limit only
+            process = start_server(
+                server, port, args.workers,
+                server_env(database, THROTTLE_RATE_AUTH='1000000/s'), log_file,
+            )
+            try:
+                stats, elapsed = asyncio.run(run(args, port, usernames, statuses, employee_ids))
+            finally:
+                stop_server(process)
+        errors = server_errors(log_path)
+
+    summary = stats.summary(elapsed)
+    if args.json:
+        print(json.dumps({
+            'server': server,
+            'workers': args.workers,
+            'dashboards': args.dashboards,
+            'dispatchers': args.dispatchers,
+            'duration': elapsed,
+            'endpoints': summary,
+            'server_errors': dict(errors),
+        }, indent=2))
+        return
+    label = server if server == 'runserver' else f'{server} ({args.workers} workers)'
+    print(
+        f'{label}, {args.dashboards} dashboards, '
+        f'{args.dispatchers} dispatchers, {args.employees} employees, {elapsed:.0f} s'
+    )
+    print_summary(summary)
+    if errors:
+        print('server errors:')
+        for line, count in errors.most_common():
+            print(f'{count:>8}  {line}')
+
+
+if __name__ == '__main__':
+    main()
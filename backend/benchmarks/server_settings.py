@@ -0,0 +1,19 @@
+"""
+Settings for servers started by benchmarks: config.settings on a seeded SQLite file.
+"""
+import os
+
+from config.settings import *  # noqa: F401,F403
+from config.settings import DATABASES
+
+DATABASES['default']['NAME'] = os.environ['BENCH_DATABASE']
+
+# Log server errors (500s) even with DEBUG off, so load tests can report them
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'stderr': {'class': 'logging.StreamHandler'}},
+    'loggers': {
+        'django.request': {'handlers': ['stderr'], 'level': 'ERROR', 'propagate': False},
+    },
+}
@@ -0,0 +1,16 @@
+"""
+ASGI config for Employee Status Tracking System.
+
+Serves the board, history and snapshot reads with async views, so one worker
+process can hold many concurrent (e.g. slow or long-polling) connections.
+The board list is served from the in-memory live board. Run with an ASGI
+server, e.g. ``uvicorn config.asgi:application``.
+"""
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+os.environ.setdefault('LIVE_BOARD', 'True')
+
+application = get_asgi_application()
@@ -3,6 +3,8 @@ Celery configuration for Employee Status Tracking System.
 """
 import os
 from celery import Celery
+from celery.schedules import crontab
+from kombu import Exchange, Queue
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -15,6 +17,95 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+# Queues, each consumed by its own worker pool (see DEPLOYMENT.md) so that a
+# long report or archival run can't hold up alerts. Per queue: worker
+# concurrency, prefetch multiplier and the soft/hard time limits (seconds)
+# of its tasks. Long tasks prefetch one at a time so they don't sit behind
+# each other in a busy process while another process is idle.
+QUEUES = {
+    'alerts': {'concurrency': 2, 'prefetch_multiplier': 4, 'soft_time_limit': 30, 'time_limit': 60},
+    'reports': {'concurrency': 2, 'prefetch_multiplier': 1, 'soft_time_limit': 600, 'time_limit': 900},
+    'archival': {'concurrency': 1, 'prefetch_multiplier': 1, 'soft_time_limit': 1800, 'time_limit': 2100},
+    'housekeeping': {'concurrency': 1, 'prefetch_multiplier': 4, 'soft_time_limit': 120, 'time_limit': 180},
+}
+
+TASK_QUEUES = {
+    'employees.tasks.drain_outbox': 'alerts',
+    'employees.tasks.check_overdue_statuses': 'alerts',
+    'employees.tasks.generate_daily_report': 'alerts',
+    'employees.tasks.prewarm_monthly_reports': 'reports',
+    'employees.tasks.cleanup_old_logs': 'archival',
+    'employees.tasks.compact_status_journal': 'archival',
+    'employees.tasks.recompute_derived_fields': 'archival',
+    'employees.tasks.purge_outbox': 'housekeeping',
+    'celery.backend_cleanup': 'housekeeping',
+}
+
+app.conf.task_default_queue = 'housekeeping'
+app.conf.task_routes = {task: {'queue': queue} for task, queue in TASK_QUEUES.items()}
+app.conf.task_annotations = {
+    task: {
+        'soft_time_limit': QUEUES[queue]['soft_time_limit'],
+        'time_limit': QUEUES[queue]['time_limit'],
+    }
+    for task, queue in TASK_QUEUES.items()
+}
+
+
+def task_queues(names):
+    """Queue declarations for the queues in `names`."""
+    return [Queue(name, Exchange(name), routing_key=name) for name in names]
+
+
+# A worker consumes every queue, unless started with CELERY_WORKER_QUEUE=<queue>:
+# then it consumes only that queue, with its concurrency and prefetch
+# (command line options still win)
+WORKER_QUEUE = os.getenv('CELERY_WORKER_QUEUE')
+app.conf.task_queues = task_queues([WORKER_QUEUE] if WORKER_QUEUE else QUEUES)
+if WORKER_QUEUE:
+    app.conf.worker_concurrency = QUEUES[WORKER_QUEUE]['concurrency']
+    app.conf.worker_prefetch_multiplier = QUEUES[WORKER_QUEUE]['prefetch_multiplier']
+
+# Periodic tasks. Defined here rather than in settings so that web workers,
+# which load the settings but never schedule tasks, don't import Celery.
+app.conf.beat_schedule = {
+    'drain-outbox': {
+        'task': 'employees.tasks.drain_outbox',
+        'schedule': 5.0,
+        # A backlog of drains is pointless: the next one picks up everything
+        'options': {'expires': 5.0},
+    },
+    'check-overdue-statuses': {
+        'task': 'employees.tasks.check_overdue_statuses',
+        'schedule': crontab(minute=0),
+        'options': {'expires': 30 * 60},
+    },
+    'generate-daily-report': {
+        'task': 'employees.tasks.generate_daily_report',
+        'schedule': crontab(hour=7, minute=0),
+    },
+    'prewarm-monthly-reports': {
+        'task': 'employees.tasks.prewarm_monthly_reports',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    'compact-status-journal': {
+        'task': 'employees.tasks.compact_status_journal',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'purge-outbox': {
+        'task': 'employees.tasks.purge_outbox',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'cleanup-old-logs': {
+        'task': 'employees.tasks.cleanup_old_logs',
+        'schedule': crontab(hour=4, minute=0, day_of_week='sunday'),
+    },
+    'recompute-derived-fields': {
+        'task': 'employees.tasks.recompute_derived_fields',
+        'schedule': crontab(hour=5, minute=0, day_of_week='sunday'),
+    },
+}
+
 
 @app.task(bind=True)
 def debug_task(self):
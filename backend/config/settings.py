@@ -40,6 +40,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'employees.middleware.CompressionMiddleware',  # Must wrap middleware that edits bodies
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,6 +78,22 @@ DATABASES = {
     }
 }
 
+# Cache (set REDIS_CACHE_URL to share it between processes)
+if os.getenv('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'status-tracking',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,23 +130,108 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'employees.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'employees.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'employees.throttling.TokenBucketThrottle',
     ],
+    # Token bucket per scope: burst of N, refilled at N per period
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '20/hour',
-        'user': '1000/hour'
+        'board': os.getenv('THROTTLE_RATE_BOARD', '120/min'),
+        'writes': os.getenv('THROTTLE_RATE_WRITES', '30/min'),
+        'reports': os.getenv('THROTTLE_RATE_REPORTS', '10/min'),
+        'auth': os.getenv('THROTTLE_RATE_AUTH', '10/min'),
     },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
 }
 
+# Throttle buckets kept per worker process (least recently used are dropped)
+THROTTLE_MAX_KEYS = int(os.getenv('THROTTLE_MAX_KEYS', '10000'))
+
+# Serve list/history endpoints from values_list() rows instead of ModelSerializers
+FAST_READ_PATH = os.getenv('FAST_READ_PATH', 'True') == 'True'
+
+# Serve the board list and delta sync from an in-memory board per process
+# (employees.live_board; enabled by gunicorn.conf.py and config/asgi.py)
+LIVE_BOARD = os.getenv('LIVE_BOARD', 'False') == 'True'
+# Seconds between checks of the journal for changes made by other processes
+LIVE_BOARD_CHECK_SECONDS = float(os.getenv('LIVE_BOARD_CHECK_SECONDS', '1'))
+# Seconds between full reloads that detect and log drift from the database
+LIVE_BOARD_RECONCILE_SECONDS = float(os.getenv('LIVE_BOARD_RECONCILE_SECONDS', '300'))
+
+# Serve the board, history and snapshot reads with async views (set by config/asgi.py)
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Seconds a JWT request's user stays cached per token (0 = always query it).
+# Off by default without a shared cache: invalidating a deactivated user
+# would otherwise only reach the process that saved it
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', '60' if os.getenv('REDIS_CACHE_URL') else '0'))
+# Serve safe-method requests from token claims only (no user lookup at all)
+JWT_CLAIMS_ONLY_READS = os.getenv('JWT_CLAIMS_ONLY_READS', 'False') == 'True'
+
+# Full-text search backend (dotted path; empty = chosen by database vendor,
+# see employees.search)
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', '')
+
+# Most employees per bulk create/update/deactivate request
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '1000'))
+
+# Largest headcount time series (/api/reports/headcount/) served per request
+HEADCOUNT_MAX_BUCKETS = int(os.getenv('HEADCOUNT_MAX_BUCKETS', '10000'))
+
+# Report artifact cache (employees.report_cache): generated files on local disk.
+# Outside MEDIA_ROOT, which the web server serves publicly: reports hold
+# employee names and notes, and are only for authenticated users.
+REPORT_CACHE_DIR = os.getenv('REPORT_CACHE_DIR', str(BASE_DIR / 'var' / 'report_cache'))
+REPORT_CACHE_MAX_BYTES = int(os.getenv('REPORT_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+# Complete months whose standard report is rebuilt nightly
+REPORT_PREWARM_MONTHS = int(os.getenv('REPORT_PREWARM_MONTHS', '3'))
+# Excel reports of at least REPORT_SHARD_MIN_ROWS rows built by the
+# prewarm_monthly_reports task are rendered in time range shards by
+# REPORT_WORKERS processes (employees.report_shards; 1: off). Requests always
+# build reports in their own process.
+REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', '1'))
+REPORT_SHARD_MIN_ROWS = int(os.getenv('REPORT_SHARD_MIN_ROWS', '50000'))
+
+# Cursor pages of employee history (?cursor=) that hold only closed logs:
+# seconds clients may keep them and the server caches their rows
+HISTORY_PAGE_MAX_AGE = int(os.getenv('HISTORY_PAGE_MAX_AGE', str(24 * 3600)))
+HISTORY_PAGE_CACHE_SECONDS = int(os.getenv('HISTORY_PAGE_CACHE_SECONDS', str(24 * 3600)))
+
+# Response compression (employees.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_ALIAS = 'default'
+COMPRESSION_CACHE_TIMEOUT = 60
+
+# Status change journal (delta sync for polling clients)
+STATUS_JOURNAL_RETENTION_DAYS = int(os.getenv('STATUS_JOURNAL_RETENTION_DAYS', '7'))
+STATUS_JOURNAL_LOOKBACK = 100
+STATUS_JOURNAL_SETTLE_SECONDS = 10
+
+# Transactional outbox (employees.outbox)
+OUTBOX_BATCH_SIZE = 100
+# Seconds a claimed batch is hidden from other consumers (longer than a drain runs)
+OUTBOX_CLAIM_SECONDS = 300
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETRY_BASE_SECONDS = 5
+OUTBOX_RETRY_MAX_SECONDS = 3600
+OUTBOX_RETENTION_DAYS = 7
+
+# Email a status closed more than this many seconds overdue (unset = off)
+OVERDUE_CLOSE_ALERT_SECONDS = (
+    int(os.getenv('OVERDUE_CLOSE_ALERT_SECONDS')) if os.getenv('OVERDUE_CLOSE_ALERT_SECONDS') else None
+)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -156,3 +258,8 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# The beat schedule is defined in config/celery.py
+
+# Email
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@localhost')
@@ -2,10 +2,94 @@
 Django Admin customization for Employee Status Tracking System.
 """
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils import timezone
-from django.db.models import Q
-from .models import Employee, Status, StatusLog
+from django.db import connection, transaction
+from django.db.models import (
+    Case, DateTimeField, F, IntegerField, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce
+from . import journal, search
+from .expressions import SecondsBetween
+from .models import Employee, Status, StatusLog, StatusChangeJournal
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids a full COUNT(*) on large tables.
+    
+    Unfiltered changelists use the database's row estimate; filtered ones
+    count at most ``max_count`` rows, so the last pages beyond the cap are
+    simply not linked.
+    """
+    max_count = 100000
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model)
+            if estimate is not None and estimate > self.max_count:
+                return estimate
+        return queryset[:self.max_count].count()
+
+
+def estimate_row_count(model):
+    """Return the planner's row estimate for `model`'s table, or None."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s',
+                [table]
+            )
+        elif connection.vendor == 'sqlite':
+            # Rowids are dense for append-mostly tables; MAX() is an index seek
+            cursor.execute(f'SELECT MAX(_rowid_) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EmployeeAutocompleteFilter(admin.SimpleListFilter):
+    """
+    Employee filter backed by the admin autocomplete view.
+    
+    Unlike the default related-field filter it never loads the employee
+    table: only the selected employee is looked up.
+    """
+    title = 'employee'
+    parameter_name = 'employee'
+    template = 'admin/employees/autocomplete_filter.html'
+    
+    def lookups(self, request, model_admin):
+        value = self.value()
+        if not value or not value.isdigit():
+            return []
+        employee = Employee.objects.filter(pk=value).only('name').first()
+        return [(value, employee.name if employee else value)]
+    
+    def has_output(self):
+        return True
+    
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            return queryset.filter(employee_id=value)
+        return queryset
+    
+    def autocomplete_url(self):
+        """URL of the admin autocomplete endpoint for StatusLog.employee."""
+        return reverse('admin:autocomplete')
 
 
 class StatusLogInline(admin.TabularInline):
@@ -35,17 +119,70 @@ class EmployeeAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        """Search names and emails through the full-text index (also used by autocomplete)."""
+        if not search_term.strip():
+            return queryset, False
+        return search.backend().filter_employees(queryset, search_term), False
+    
+    def get_queryset(self, request):
+        """Annotate the current status name/color in SQL (no query per row)."""
+        open_logs = StatusLog.objects.filter(
+            employee=OuterRef('pk'),
+            end_time__isnull=True
+        ).order_by('-start_time')
+        return super().get_queryset(request).annotate(
+            current_status_name=Subquery(open_logs.values('status__name')[:1]),
+            current_status_color=Subquery(open_logs.values('status__color')[:1]),
+        )
+    
     def current_status_display(self, obj):
         """Display current status with color."""
-        current_log = obj.get_current_status_log()
-        if current_log:
+        if obj.current_status_name:
             return format_html(
                 '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>',
-                current_log.status.color,
-                current_log.status.name
+                obj.current_status_color,
+                obj.current_status_name
             )
         return format_html('<span style="color: gray;">No Active Status</span>')
     current_status_display.short_description = 'Current Status'
+    current_status_display.admin_order_field = 'current_status_name'
+    
+    def save_model(self, request, obj, form, change):
+        """Save the employee and journal the change for delta sync clients."""
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if not change:
+                kind = StatusChangeJournal.KIND_EMPLOYEE_CREATE
+            elif obj.is_active:
+                kind = StatusChangeJournal.KIND_EMPLOYEE_UPDATE
+            else:
+                kind = StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE
+            journal.record(kind, obj.id)
+    
+    def save_formset(self, request, form, formset, change):
+        """Save inline status logs and journal edits for delta sync clients."""
+        with transaction.atomic():
+            super().save_formset(request, form, formset, change)
+            if formset.new_objects or formset.changed_objects:
+                journal.record(StatusChangeJournal.KIND_LOG_UPDATE, form.instance.id)
+            for log in formset.deleted_objects:
+                journal.record(StatusChangeJournal.KIND_LOG_DELETE, form.instance.id, old_log_id=log.id)
+    
+    def delete_model(self, request, obj):
+        """Delete the employee and journal it for delta sync clients."""
+        with transaction.atomic():
+            journal.record(StatusChangeJournal.KIND_EMPLOYEE_DELETE, obj.id)
+            super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        """Delete employees and journal them for delta sync clients."""
+        with transaction.atomic():
+            journal.record_many(
+                StatusChangeJournal.KIND_EMPLOYEE_DELETE,
+                list(queryset.values_list('id', flat=True))
+            )
+            super().delete_queryset(request, queryset)
     
     actions = ['export_to_excel']
     
@@ -65,8 +202,7 @@ class EmployeeAdmin(admin.ModelAdmin):
         
         # Data
         for emp in queryset:
-            current_log = emp.get_current_status_log()
-            current_status = current_log.status.name if current_log else 'N/A'
+            current_status = emp.current_status_name or 'N/A'
             ws.append([emp.name, emp.email or 'N/A', current_status, 'Yes' if emp.is_active else 'No'])
         
         response = HttpResponse(
@@ -117,10 +253,11 @@ class IsOverdueFilter(admin.SimpleListFilter):
     
     def queryset(self, request, queryset):
         if self.value() == 'yes':
+            # Served by the partial index on open logs' planned_end_time
             return queryset.filter(
-                planned_end_time__isnull=False,
-                end_time__isnull=True
-            ).filter(planned_end_time__lt=timezone.now())
+                end_time__isnull=True,
+                planned_end_time__lt=timezone.now()
+            )
         elif self.value() == 'no':
             return queryset.filter(
                 Q(planned_end_time__isnull=True) |
@@ -140,11 +277,15 @@ class StatusLogAdmin(admin.ModelAdmin):
         IsOverdueFilter,
         'status',
         'start_time',
-        'employee',
+        EmployeeAutocompleteFilter,
     ]
+    list_select_related = ['employee', 'status', 'created_by']
     search_fields = ['employee__name', 'status__name', 'notes']
     readonly_fields = ['start_time', 'overdue_duration', 'created_by']
-    date_hierarchy = 'start_time'
+    autocomplete_fields = ['employee']
+    # No date_hierarchy: it scans the whole table for distinct dates
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Status Information', {
@@ -158,35 +299,96 @@ class StatusLogAdmin(admin.ModelAdmin):
         }),
     )
     
+    class Media:
+        css = {
+            'all': ['admin/css/vendor/select2/select2.css', 'admin/css/autocomplete.css'],
+        }
+        js = [
+            'admin/js/vendor/jquery/jquery.js',
+            'admin/js/vendor/select2/select2.full.js',
+            'admin/js/jquery.init.js',
+            'admin/js/autocomplete.js',
+            'employees/admin/autocomplete_filter.js',
+        ]
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Search notes and employees through the full-text index, and status names."""
+        if not search_term.strip():
+            return queryset, False
+        backend = search.backend()
+        employees = backend.filter_employees(Employee.objects.all(), search_term)
+        statuses = Status.objects.filter(name__icontains=search_term.strip())
+        return (
+            backend.filter_logs(queryset, search_term)
+            | queryset.filter(employee__in=employees)
+            | queryset.filter(status__in=statuses)
+        ), False
+    
+    def get_queryset(self, request):
+        """Compute durations and live overdue time in SQL."""
+        now = Value(timezone.now(), output_field=DateTimeField())
+        return super().get_queryset(request).annotate(
+            duration_seconds=SecondsBetween(Coalesce('end_time', now), F('start_time')),
+            active_overdue_seconds=Case(
+                When(
+                    end_time__isnull=True,
+                    planned_end_time__lt=now,
+                    then=SecondsBetween(now, F('planned_end_time')),
+                ),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+        )
+    
     def duration_display(self, obj):
         """Display duration in hours."""
-        if obj.end_time:
-            duration = (obj.end_time - obj.start_time).total_seconds()
-        else:
-            duration = (timezone.now() - obj.start_time).total_seconds()
-        hours = duration / 3600
+        hours = obj.duration_seconds / 3600
         return f"{hours:.2f}h"
     duration_display.short_description = 'Duration'
+    duration_display.admin_order_field = 'duration_seconds'
     
     def overdue_display(self, obj):
         """Display overdue duration with color."""
         if obj.overdue_duration > 0:
             hours = obj.overdue_duration / 3600
             return format_html(
-                '<span style="color: red; font-weight: bold;">{:.2f}h</span>',
-                hours
+                '<span style="color: red; font-weight: bold;">{}h</span>',
+                f'{hours:.2f}'
             )
-        elif obj.is_overdue():
+        elif obj.active_overdue_seconds > 0:
             # Currently overdue but not yet closed
-            overdue_seconds = obj.get_overdue_seconds()
-            hours = overdue_seconds / 3600
+            hours = obj.active_overdue_seconds / 3600
             return format_html(
-                '<span style="color: red; font-weight: bold;">{:.2f}h (Active)</span>',
-                hours
+                '<span style="color: red; font-weight: bold;">{}h (Active)</span>',
+                f'{hours:.2f}'
             )
         return format_html('<span style="color: green;">-</span>')
     overdue_display.short_description = 'Overdue'
     
+    def save_model(self, request, obj, form, change):
+        """Save the status log and journal the change for delta sync clients."""
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change:
+                journal.record(StatusChangeJournal.KIND_LOG_UPDATE, obj.employee_id, old_log_id=obj.id)
+            else:
+                journal.record(StatusChangeJournal.KIND_STATUS_CHANGE, obj.employee_id, new_log_id=obj.id)
+    
+    def delete_model(self, request, obj):
+        """Delete the status log and journal it for delta sync clients."""
+        with transaction.atomic():
+            journal.record(StatusChangeJournal.KIND_LOG_DELETE, obj.employee_id, old_log_id=obj.id)
+            super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        """Delete status logs and journal the affected employees."""
+        with transaction.atomic():
+            journal.record_many(
+                StatusChangeJournal.KIND_LOG_DELETE,
+                list(queryset.order_by().values_list('employee_id', flat=True).distinct())
+            )
+            super().delete_queryset(request, queryset)
+    
     actions = ['export_to_excel']
     
     def export_to_excel(self, request, queryset):
@@ -204,11 +406,8 @@ class StatusLogAdmin(admin.ModelAdmin):
         ws.append(headers)
         
         # Data
-        for log in queryset:
-            if log.end_time:
-                duration = (log.end_time - log.start_time).total_seconds() / 3600
-            else:
-                duration = (timezone.now() - log.start_time).total_seconds() / 3600
+        for log in queryset.select_related('employee', 'status'):
+            duration = log.duration_seconds / 3600
             
             overdue = log.overdue_duration / 3600 if log.overdue_duration > 0 else 0
             
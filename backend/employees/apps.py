@@ -5,3 +5,24 @@ class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
     verbose_name = 'Employee Management'
+    
+    def ready(self):
+        # Refuse databases the SQL expressions (employees.expressions) can't run on
+        from .expressions import check_database_backends
+        check_database_backends()
+        
+        # Register outbox handlers
+        from . import handlers  # noqa: F401
+        
+        # Drop cached JWT users when users change
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_migrate, post_save
+        from .authentication import invalidate_on_save
+        
+        user_model = get_user_model()
+        post_save.connect(invalidate_on_save, sender=user_model, dispatch_uid='jwt-user-cache-save')
+        post_delete.connect(invalidate_on_save, sender=user_model, dispatch_uid='jwt-user-cache-delete')
+        
+        # Recreate search index triggers dropped when a migration rebuilt a table
+        from .search import ensure_index
+        post_migrate.connect(ensure_index, sender=self, dispatch_uid='search-index')
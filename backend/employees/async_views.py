@@ -0,0 +1,219 @@
+"""
+Async read endpoints for ASGI deployments.
+
+``AsyncEmployeeViewSet`` serves the board list (from the live board when it
+is on), employee history and board snapshot with the async ORM, so a worker waiting on the database keeps
+serving other connections instead of blocking a thread per request. The
+rest of DRF's pipeline is reused as is: authentication, permissions and
+throttling run in ``initial()``, responses go through the same renderers,
+pagination envelope and ETag handling as the sync views.
+
+Other methods (create, updates) and the browsable API are delegated to the
+sync view in a thread. Routes are only registered when ASYNC_READ_VIEWS is
+on (see config/asgi.py): under WSGI, Django would run every async view in
+its own event loop.
+"""
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from . import fastpath, live_board, snapshot
+from .models import StatusLog
+from .views import EmployeeViewSet
+
+# Renderers that only serialize data (the browsable API queries the database)
+ASYNC_RENDER_FORMATS = ('json', 'msgpack')
+
+
+async def fetch(queryset):
+    """Evaluate `queryset` with the async ORM."""
+    return [row async for row in queryset]
+
+
+async def serialize_employee_rows(rows, now, fields=None):
+    """Async ``fastpath.serialize_employee_rows()`` for a list of rows."""
+    current = {}
+    if fastpath.needs_current_status(fields):
+        log_rows = await fetch(fastpath.current_status_queryset([row[0] for row in rows]))
+        current = fastpath.current_status_from_rows(log_rows, now)
+    return fastpath.employee_rows_data(rows, current, fields)
+
+
+class AsyncReadMixin:
+    """
+    Serve the actions in `async_actions` with async handlers.
+
+    `async_actions` maps an action name to the name of its coroutine
+    handler. Views built with ``as_async_view()`` are coroutine functions;
+    requests for other actions run the regular sync dispatch in a thread.
+    """
+    async_actions = {}
+    async_dispatch = False
+
+    @classmethod
+    def as_async_view(cls, actions, **initkwargs):
+        """Like ``as_view()``, but returns a coroutine function."""
+        sync_view = cls.as_view(actions, async_dispatch=True, **initkwargs)
+
+        async def view(request, *args, **kwargs):
+            return await sync_view(request, *args, **kwargs)
+
+        # Keeps cls, initkwargs, actions and csrf_exempt from the sync view
+        return update_wrapper(view, sync_view)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """``dispatch()`` awaiting the async handler of the action."""
+        method = request.method.lower()
+        handler_name = self.async_actions.get(self.action_map.get(method))
+        if handler_name is None:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication may look the user up in the cache or database
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.accepted_renderer.format in ASYNC_RENDER_FORMATS:
+                response = await getattr(self, handler_name)(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(getattr(self, method))(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        renderer = getattr(request, 'accepted_renderer', None)
+        if renderer is not None and renderer.format in ASYNC_RENDER_FORMATS:
+            self.response = self.finalize_response(request, response, *args, **kwargs)
+        else:
+            self.response = await sync_to_async(self.finalize_response)(
+                request, response, *args, **kwargs
+            )
+        return self.response
+
+    async def aget_object(self, queryset=None):
+        """Async ``get_object()``: 404 unless the URL lookup matches."""
+        if queryset is None:
+            queryset = self.get_queryset()
+        queryset = self.filter_queryset(queryset)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async ``paginate_queryset()`` for page number pagination.
+
+        The count and the page are fetched with the async ORM; the Django
+        paginator then only does arithmetic, and ``get_paginated_response()``
+        works as usual.
+        """
+        pagination = self.paginator
+        if pagination is None:
+            return None
+        request = self.request
+        pagination.request = request
+        page_size = pagination.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = pagination.django_paginator_class(queryset, page_size)
+        # Preset the cached count so that the paginator never queries it
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        page.object_list = await fetch(page.object_list)
+        pagination.page = page
+        return page.object_list
+
+
+class AsyncEmployeeViewSet(AsyncReadMixin, EmployeeViewSet):
+    """EmployeeViewSet with async board, history and snapshot reads."""
+    async_actions = {
+        'list': 'alist',
+        'history': 'ahistory',
+        'snapshot': 'asnapshot',
+    }
+
+    async def alist(self, request, *args, **kwargs):
+        """Async ``list()`` for the live board and fast read paths (the compact board runs sync)."""
+        if self.is_compact():
+            return await sync_to_async(self.list)(request, *args, **kwargs)
+        if live_board.is_enabled() and not request.query_params.get('search'):
+            # Loading or checking the board queries the database, and holds
+            # its lock meanwhile: take the copy in a thread, serialize here
+            board_state = await sync_to_async(lambda: live_board.board.current().snapshot())()
+            return self.live_list(board_state)
+        if not fastpath.is_enabled():
+            return await sync_to_async(self.list)(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = fastpath.employee_list_queryset(queryset)
+        now = timezone.now()
+        fields = self.get_requested_fields()
+
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(await serialize_employee_rows(page, now, fields))
+        return Response(await serialize_employee_rows(await fetch(rows), now, fields))
+
+    async def ahistory(self, request, pk=None):
+        """Async ``history()`` for the fast read path (cursor pages run sync)."""
+        if not fastpath.is_enabled() or 'cursor' in request.query_params:
+            return await sync_to_async(self.history)(request, pk=pk)
+
+        # Only the primary key is needed, not the prefetched open logs
+        employee = await self.aget_object(self.get_queryset().prefetch_related(None))
+        logs = StatusLog.objects.filter(employee=employee).select_related('status', 'created_by')
+        rows = fastpath.status_log_queryset(logs)
+
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fastpath.serialize_status_log_rows(page))
+        return Response(fastpath.serialize_status_log_rows(await fetch(rows)))
+
+    async def asnapshot(self, request):
+        """Async ``snapshot()`` for the fast read path."""
+        if not fastpath.is_enabled():
+            return await sync_to_async(self.snapshot)(request)
+
+        at, error_response = self.get_snapshot_time(request)
+        if error_response:
+            return error_response
+
+        rows = snapshot.employees_at(at).values_list(*fastpath.EMPLOYEE_COLUMNS, 'snapshot_log_id')
+        page = await self.apaginate_queryset(rows)
+        rows = page if page is not None else await fetch(rows)
+        log_rows = await fetch(fastpath.snapshot_status_queryset(rows, at))
+        data = fastpath.employee_rows_data(rows, fastpath.current_status_from_rows(log_rows, at))
+
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response({'results': data})
+        response.data['at'] = serializers.DateTimeField().to_representation(at)
+        return response
@@ -1,7 +1,7 @@
 """
 Custom authentication views with user data.
 """
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
@@ -26,3 +26,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 class CustomTokenObtainPairView(TokenObtainPairView):
     """Custom token view that includes user data."""
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = 'auth'
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """Token refresh view throttled like login."""
+    throttle_scope = 'auth'
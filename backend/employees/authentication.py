@@ -0,0 +1,113 @@
+"""
+JWT authentication with a short-lived cache of the resolved user.
+
+``CachedJWTAuthentication`` validates the token on every request as usual,
+but keeps the User loaded for a token id in the cache for JWT_USER_CACHE_TTL
+seconds instead of querying it each time. Only CACHED_USER_FIELDS are stored
+(never the password hash); a cached user is rebuilt with the other fields
+deferred, so saving it can't overwrite them. Entries are bound to a per-user
+generation key that is dropped whenever the user is saved (deactivation,
+password change) or deleted, so a stale user is never served; an evicted
+generation key only causes a cache miss. Invalidation only reaches other
+processes through a shared cache, so the TTL defaults to 0 (no caching)
+unless REDIS_CACHE_URL is set.
+
+With JWT_CLAIMS_ONLY_READS, safe-method requests skip the user lookup
+entirely and get a TokenUser built from the validated claims. Deactivation
+then takes effect for those reads only when the access token expires.
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+CACHE_PREFIX = 'jwt-user'
+
+# User fields authentication and permission checks need
+CACHED_USER_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def generation_key(user_id):
+    """Cache key holding the current generation of a user's entries."""
+    return f'{CACHE_PREFIX}:gen:{user_id}'
+
+
+def entry_key(user_id, validated_token):
+    """Cache key of the user resolved for one token."""
+    token_id = validated_token.get(api_settings.JTI_CLAIM)
+    if token_id is None:
+        token_id = hashlib.blake2b(bytes(str(validated_token), 'utf-8'), digest_size=16).hexdigest()
+    return f'{CACHE_PREFIX}:{user_id}:{token_id}'
+
+
+def invalidate_user(user_id):
+    """Drop every cached entry of a user (by dropping their generation)."""
+    cache.delete(generation_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication caching the resolved user per token id."""
+
+    safe_method = False
+
+    def authenticate(self, request):
+        self.safe_method = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.safe_method and settings.JWT_CLAIMS_ONLY_READS:
+            return self.get_token_user(validated_token)
+
+        ttl = self.get_cache_timeout(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if ttl <= 0 or user_id is None:
+            return super().get_user(validated_token)
+
+        gen_key = generation_key(user_id)
+        key = entry_key(user_id, validated_token)
+        cached = cache.get_many([gen_key, key])
+        generation = cached.get(gen_key)
+        entry = cached.get(key)
+        if generation is not None and entry is not None and entry[0] == generation:
+            return self.user_model.from_db(None, list(entry[1]), list(entry[1].values()))
+
+        # Take the generation before loading the user: an invalidation
+        # racing with the load drops it, orphaning the entry set below
+        if generation is None:
+            cache.add(gen_key, uuid.uuid4().hex, None)
+            generation = cache.get(gen_key)
+        user = super().get_user(validated_token)
+        if generation is not None:
+            # In model field order, as from_db() expects with deferred fields
+            fields = {
+                field.attname: getattr(user, field.attname)
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in CACHED_USER_FIELDS
+            }
+            cache.set(key, (generation, fields), ttl)
+        return user
+
+    def get_token_user(self, validated_token):
+        """A stateless user backed by the token claims (no database access)."""
+        return JWTStatelessUserAuthentication.get_user(self, validated_token)
+
+    def get_cache_timeout(self, validated_token):
+        """Cache for JWT_USER_CACHE_TTL seconds, but never past the token expiry."""
+        expires_in = int(validated_token.get('exp', 0) - time.time())
+        return min(settings.JWT_USER_CACHE_TTL, expires_in)
+
+
+def invalidate_on_save(sender, instance, update_fields=None, **kwargs):
+    """post_save/post_delete receiver for the user model."""
+    # Recording a login changes nothing the cached user is checked for
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user(instance.pk)
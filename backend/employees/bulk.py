@@ -0,0 +1,171 @@
+"""
+Bulk employee management.
+
+Each operation validates the whole batch in one pass (email uniqueness with
+a single query against the table plus a check within the batch), writes the
+valid items with set-based statements and returns one result per item, in
+request order:
+
+    {'index': 0, 'id': 12, 'status': 'created'}
+    {'index': 1, 'status': 'error', 'errors': {'email': ['...']}}
+
+Invalid items don't prevent the valid ones from being written.
+"""
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Value, When
+from django.utils import timezone
+
+from . import journal
+from .expressions import SecondsBetween
+from .models import Employee, StatusChangeJournal, StatusLog
+from .serializers import BulkEmployeeSerializer
+
+CREATED = 'created'
+UPDATED = 'updated'
+DEACTIVATED = 'deactivated'
+UNCHANGED = 'unchanged'
+ERROR = 'error'
+
+
+def error(index, errors):
+    return {'index': index, 'status': ERROR, 'errors': errors}
+
+
+def validate_items(items, partial, results):
+    """Validate the item fields; returns ``[(index, validated data)]``."""
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BulkEmployeeSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = error(index, serializer.errors)
+    return valid
+
+
+def check_emails(valid, results):
+    """
+    Reject items whose email is taken by another employee or an earlier item.
+
+    Returns the remaining ``[(index, data)]``.
+    """
+    emails = [data['email'] for _, data in valid if data.get('email')]
+    owners = dict(Employee.objects.filter(email__in=emails).values_list('email', 'id'))
+    seen = set()
+    remaining = []
+    for index, data in valid:
+        email = data.get('email')
+        if email:
+            owner = owners.get(email)
+            if owner is not None and owner != data.get('id'):
+                results[index] = error(index, {'email': ['An employee with this email already exists.']})
+                continue
+            if email in seen:
+                results[index] = error(index, {'email': ['Duplicate email in this request.']})
+                continue
+            seen.add(email)
+        remaining.append((index, data))
+    return remaining
+
+
+def create_employees(items):
+    """Create employees from ``[{name, email}]``."""
+    results = [None] * len(items)
+    valid = validate_items(items, partial=False, results=results)
+    with transaction.atomic():
+        valid = check_emails(valid, results)
+        employees = Employee.objects.bulk_create(
+            [Employee(name=data['name'], email=data.get('email')) for _, data in valid]
+        )
+        journal.record_many(StatusChangeJournal.KIND_EMPLOYEE_CREATE, [e.id for e in employees])
+    for (index, _), employee in zip(valid, employees):
+        results[index] = {'index': index, 'id': employee.id, 'status': CREATED}
+    return results
+
+
+def update_employees(items):
+    """Update the name and/or email of ``[{id, name?, email?}]``."""
+    results = [None] * len(items)
+    valid = []
+    for index, data in validate_items(items, partial=True, results=results):
+        if 'id' not in data:
+            results[index] = error(index, {'id': ['This field is required.']})
+        else:
+            valid.append((index, data))
+
+    with transaction.atomic():
+        ids = [data['id'] for _, data in valid]
+        employees = Employee.objects.select_for_update().in_bulk(ids)
+        found = []
+        seen_ids = set()
+        for index, data in valid:
+            if data['id'] not in employees:
+                results[index] = error(index, {'id': ['Employee not found.']})
+            elif data['id'] in seen_ids:
+                results[index] = error(index, {'id': ['Duplicate id in this request.']})
+            else:
+                seen_ids.add(data['id'])
+                found.append((index, data))
+        found = check_emails(found, results)
+
+        now = timezone.now()
+        fields = {'updated_at'}
+        changed = []
+        for index, data in found:
+            employee = employees[data['id']]
+            for field in ('name', 'email'):
+                if field in data:
+                    setattr(employee, field, data[field])
+                    fields.add(field)
+            # bulk_update() doesn't apply auto_now
+            employee.updated_at = now
+            changed.append(employee)
+            results[index] = {'index': index, 'id': employee.id, 'status': UPDATED}
+        Employee.objects.bulk_update(changed, sorted(fields))
+        journal.record_many(StatusChangeJournal.KIND_EMPLOYEE_UPDATE, [e.id for e in changed])
+    return results
+
+
+def deactivate_employees(ids, now=None):
+    """
+    Deactivate employees by id and close their open status logs.
+
+    Closed logs get ``overdue_duration`` as ``calculate_and_save_overdue_duration()``
+    would compute it. Both writes are single UPDATE statements.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        active = dict(
+            Employee.objects.select_for_update()
+            .filter(pk__in=ids)
+            .values_list('id', 'is_active')
+        )
+        to_deactivate = sorted(pk for pk, is_active in active.items() if is_active)
+
+        Employee.objects.filter(pk__in=to_deactivate).update(
+            is_active=False, deleted_at=now, updated_at=now
+        )
+        closed = StatusLog.objects.filter(employee_id__in=to_deactivate, end_time__isnull=True).update(
+            end_time=now,
+            updated_at=now,
+            overdue_duration=Case(
+                When(
+                    planned_end_time__lt=now,
+                    then=SecondsBetween(Value(now, output_field=DateTimeField()), F('planned_end_time')),
+                ),
+                default=Value(0),
+            ),
+        )
+        journal.record_many(StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE, to_deactivate)
+
+    results = []
+    seen = set()
+    for index, pk in enumerate(ids):
+        if pk not in active:
+            results.append(error(index, {'id': ['Employee not found.']}))
+        elif pk in seen or not active[pk]:
+            results.append({'index': index, 'id': pk, 'status': UNCHANGED})
+        else:
+            results.append({'index': index, 'id': pk, 'status': DEACTIVATED})
+        seen.add(pk)
+    return results, closed
@@ -0,0 +1,60 @@
+"""
+Conditional GET for API views.
+
+Successful GET/HEAD responses get an ETag computed from the rendered body,
+unless the view already set one.
+A request whose If-None-Match matches it is answered 304 Not Modified with
+no body, and the throttle tokens it took are given back: a poll that finds
+nothing new costs the client nothing against its rate limit.
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+# Headers a 304 repeats from the response it stands for (RFC 9110 15.4.5)
+NOT_MODIFIED_HEADERS = ('Cache-Control', 'Content-Location', 'Date', 'ETag', 'Expires', 'Vary')
+
+
+def body_etag(content):
+    """Strong ETag of a response body."""
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def etag_matches(etag, if_none_match):
+    """Weak comparison of `etag` against an If-None-Match header value."""
+    etags = parse_etags(if_none_match)
+    if etags == ['*']:
+        return True
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in etags}
+
+
+class ConditionalGetMixin:
+    """Add an ETag to GET responses and answer matching requests with 304."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method not in ('GET', 'HEAD')
+            or response.status_code != status.HTTP_200_OK
+            or not isinstance(response, Response)
+        ):
+            return response
+
+        # Views that can tell their ETag without rendering (the live board) set it
+        if not response.has_header('ETag'):
+            response.render()
+            response['ETag'] = body_etag(response.content)
+        if_none_match = request.headers.get('If-None-Match')
+        if not if_none_match or not etag_matches(response['ETag'], if_none_match):
+            return response
+
+        for throttle in getattr(request, 'throttle_charges', ()):
+            throttle.refund()
+        not_modified = HttpResponseNotModified()
+        for header in NOT_MODIFIED_HEADERS:
+            if header in response:
+                not_modified[header] = response[header]
+        return not_modified
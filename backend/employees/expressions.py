@@ -0,0 +1,123 @@
+"""
+Database expressions for Employee Status Tracking System.
+
+They have SQL for SQLite, PostgreSQL and MySQL/MariaDB only: the app
+refuses to start on another database (check_database_backends()), rather
+than failing on the first query that uses them.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import NotSupportedError, connections
+from django.db.models import BigIntegerField, Func
+
+SUPPORTED_VENDORS = ('sqlite', 'postgresql', 'mysql')
+
+
+def check_database_backends():
+    """Raise ImproperlyConfigured if a configured database has no SQL for these expressions."""
+    unsupported = {
+        alias: connections[alias].vendor for alias in connections
+        if connections[alias].vendor not in SUPPORTED_VENDORS
+    }
+    if unsupported:
+        raise ImproperlyConfigured(
+            'Employee status queries need SQLite, PostgreSQL or MySQL/MariaDB; unsupported '
+            + ', '.join(f'{alias!r} ({vendor})' for alias, vendor in unsupported.items())
+            + ' in DATABASES.'
+        )
+
+
+def unsupported(expression, connection):
+    """The error for `expression` compiled for a database without SQL for it."""
+    return NotSupportedError(
+        f'{type(expression).__name__} has no SQL for the {connection.vendor} backend '
+        f'(supported: {", ".join(SUPPORTED_VENDORS)}).'
+    )
+
+
+class SecondsBetween(Func):
+    """
+    Whole seconds from `start` to `end`, like ``int((end - start).total_seconds())``.
+
+    Truncates toward zero, matching the Python calculations in StatusLog, so
+    values computed in SQL agree with the model methods to the second.
+    """
+    arity = 2
+    output_field = BigIntegerField()
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise unsupported(self, connection)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Django stores datetimes as 'YYYY-MM-DD HH:MM:SS[.ffffff]' (UTC).
+        # strftime('%s') gives whole epoch seconds; the microseconds are
+        # taken from the text so no precision is lost to julianday().
+        # ('%%' is unescaped to '%' by Django's SQLite cursor wrapper.)
+        micros = (
+            "(CAST(strftime('%%s', {operand}) AS INTEGER) * 1000000"
+            " + CAST(substr({operand} || '.000000', 21, 6) AS INTEGER))"
+        )
+        template = '(({} - {}) / 1000000)'.format(
+            micros.replace('{operand}', '{end}'),
+            micros.replace('{operand}', '{start}'),
+        )
+        return self._as_sql_with_parts(compiler, connection, template, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        template = 'TRUNC(EXTRACT(EPOCH FROM ({end} - {start})))::bigint'
+        return self._as_sql_with_parts(compiler, connection, template, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        template = 'TIMESTAMPDIFF(SECOND, {start}, {end})'
+        return self._as_sql_with_parts(compiler, connection, template, **extra_context)
+
+    def _as_sql_with_parts(self, compiler, connection, template, **extra_context):
+        compiled = {
+            'end': compiler.compile(self.source_expressions[0]),
+            'start': compiler.compile(self.source_expressions[1]),
+        }
+        # Operands may appear several times and in any order in the template
+        sql_parts = []
+        params = []
+        for part in re.split(r'(\{end\}|\{start\})', template):
+            if part in ('{end}', '{start}'):
+                part_sql, part_params = compiled[part[1:-1]]
+                sql_parts.append(part_sql)
+                params.extend(part_params)
+            else:
+                sql_parts.append(part)
+        return ''.join(sql_parts), params
+
+
+class EpochSeconds(Func):
+    """
+    Whole Unix epoch seconds of a datetime, rounded down.
+
+    Cheaper than SecondsBetween when many rows are compared to one instant:
+    fetch the epoch once per value and subtract in Python.
+    """
+    arity = 1
+    output_field = BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise unsupported(self, connection)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # unixepoch() is much faster than strftime() but needs SQLite 3.38
+        if connection.Database.sqlite_version_info >= (3, 38):
+            template = 'unixepoch(%(expressions)s)'
+        else:
+            template = "CAST(strftime('%%%%s', %(expressions)s) AS INTEGER)"
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        template = 'FLOOR(EXTRACT(EPOCH FROM %(expressions)s))::bigint'
+        return super().as_sql(compiler, connection, template=template, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        template = 'FLOOR(UNIX_TIMESTAMP(%(expressions)s))'
+        return super().as_sql(compiler, connection, template=template, **extra_context)
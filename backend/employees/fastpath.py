@@ -0,0 +1,224 @@
+"""
+Fast read path for high-volume list endpoints.
+
+Builds the same payloads as EmployeeListSerializer and StatusLogSerializer
+from ``values_list()`` tuples, using field mappers compiled once per request
+instead of per-row ModelSerializer/SerializerMethodField dispatch. Output is
+kept identical to the serializers (see ``FastPathEquivalenceTest``).
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from . import snapshot
+from .models import StatusLog
+
+# Columns fetched for an open log, in tuple order
+CURRENT_STATUS_COLUMNS = (
+    'employee_id', 'id', 'status__name', 'status__color', 'start_time',
+    'planned_end_time', 'notes',
+)
+
+EMPLOYEE_COLUMNS = ('id', 'name', 'email', 'is_active')
+
+EMPLOYEE_FIELDS = ['id', 'name', 'email', 'current_status', 'is_active']
+
+STATUS_LOG_COLUMNS = (
+    'id', 'employee__name', 'status__name', 'status__color', 'start_time',
+    'end_time', 'planned_end_time', 'overdue_duration', 'notes',
+    'created_by__username',
+)
+
+STATUS_LOG_FIELDS = [
+    'id', 'employee_name', 'status_name', 'status_color',
+    'start_time', 'end_time', 'planned_end_time', 'overdue_duration',
+    'duration_seconds', 'notes', 'created_by_username',
+]
+
+
+def is_enabled():
+    """Whether views should use the fast read path."""
+    return getattr(settings, 'FAST_READ_PATH', False)
+
+
+def datetime_formatter():
+    """
+    Return a function formatting datetimes exactly like DRF's DateTimeField.
+
+    The current timezone is resolved once instead of once per value.
+    """
+    if not settings.USE_TZ:
+        def format_datetime(value):
+            return value.isoformat() if value else None
+        return format_datetime
+
+    tz = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if not value:
+            return None
+        representation = value.astimezone(tz).isoformat()
+        if representation.endswith('+00:00'):
+            representation = representation[:-6] + 'Z'
+        return representation
+    return format_datetime
+
+
+def current_status_rows(employee_ids, now):
+    """
+    Map employee id -> current status dict (CurrentStatusSerializer layout).
+
+    Like Employee.get_current_status_log(), the newest open log wins if an
+    employee has more than one.
+    """
+    return current_status_from_rows(current_status_queryset(employee_ids), now)
+
+
+def current_status_queryset(employee_ids):
+    """CURRENT_STATUS_COLUMNS tuples of the open logs of `employee_ids`, newest first."""
+    return (
+        StatusLog.objects
+        .filter(employee_id__in=employee_ids, end_time__isnull=True)
+        .order_by('-start_time')
+        .values_list(*CURRENT_STATUS_COLUMNS)
+    )
+
+
+def current_status_from_rows(rows, now):
+    """
+    Map employee id -> status dict for CURRENT_STATUS_COLUMNS tuples.
+
+    Logs are treated as open at `now`; the first row of an employee wins.
+    """
+    format_datetime = datetime_formatter()
+    current = {}
+    for employee_id, log_id, name, color, start, planned, notes in rows:
+        if employee_id in current:
+            continue
+        if planned is None:
+            remaining = None
+            overdue = False
+            overdue_seconds = 0
+        else:
+            remaining = int((planned - now).total_seconds())
+            overdue = now > planned
+            overdue_seconds = abs(remaining) if overdue else 0
+        current[employee_id] = {
+            'id': log_id,
+            'status_name': name,
+            'status_color': color,
+            'start_time': format_datetime(start),
+            'planned_end_time': format_datetime(planned),
+            'elapsed_seconds': int((now - start).total_seconds()),
+            'remaining_seconds': remaining,
+            'is_overdue': overdue,
+            'overdue_seconds': overdue_seconds,
+            'notes': notes,
+        }
+    return current
+
+
+def compile_employee_mappers(fields=None):
+    """
+    Compile (field name, mapper) pairs for an employee row.
+
+    Mappers take ``(row, current)`` where ``row`` is an EMPLOYEE_COLUMNS tuple
+    and ``current`` the employee's current status dict (or None). Field order
+    follows EmployeeListSerializer; unknown names are ignored.
+    """
+    mappers = {
+        'id': lambda row, current: row[0],
+        'name': lambda row, current: row[1],
+        'email': lambda row, current: row[2],
+        'current_status': lambda row, current: current,
+        'is_active': lambda row, current: row[3],
+    }
+    selected = EMPLOYEE_FIELDS if fields is None else [f for f in EMPLOYEE_FIELDS if f in fields]
+    return [(name, mappers[name]) for name in selected]
+
+
+def employee_list_queryset(queryset):
+    """Turn an Employee queryset into EMPLOYEE_COLUMNS tuples."""
+    return queryset.values_list(*EMPLOYEE_COLUMNS)
+
+
+def serialize_employee_rows(rows, now=None, fields=None):
+    """Serialize EMPLOYEE_COLUMNS tuples like EmployeeListSerializer(many=True)."""
+    now = now or timezone.now()
+    rows = list(rows)
+    if needs_current_status(fields):
+        current = current_status_rows([row[0] for row in rows], now)
+    else:
+        current = {}
+    return employee_rows_data(rows, current, fields)
+
+
+def needs_current_status(fields):
+    """Whether rows with the `fields` selection include ``current_status``."""
+    return fields is None or 'current_status' in fields
+
+
+def employee_rows_data(rows, current, fields=None):
+    """
+    Build EmployeeListSerializer rows from EMPLOYEE_COLUMNS tuples.
+
+    `current` maps employee id -> current status dict (see
+    ``current_status_from_rows()``). No queries are made.
+    """
+    mappers = compile_employee_mappers(fields)
+    return [
+        {name: mapper(row, current.get(row[0])) for name, mapper in mappers}
+        for row in rows
+    ]
+
+
+def serialize_snapshot_rows(rows, at):
+    """
+    Serialize ``snapshot.employees_at()`` rows as of `at`.
+
+    Rows are EMPLOYEE_COLUMNS tuples followed by ``snapshot_log_id``; output
+    matches EmployeeListSerializer with the active logs computed against `at`.
+    """
+    rows = list(rows)
+    current = current_status_from_rows(snapshot_status_queryset(rows, at), at)
+    return employee_rows_data(rows, current)
+
+
+def snapshot_status_queryset(rows, at):
+    """CURRENT_STATUS_COLUMNS tuples of the logs active at `at` for snapshot rows."""
+    log_ids = [row[-1] for row in rows if row[-1] is not None]
+    return snapshot.active_logs_at(at, log_ids).values_list(*CURRENT_STATUS_COLUMNS)
+
+
+def status_log_queryset(queryset):
+    """Turn a StatusLog queryset into STATUS_LOG_COLUMNS tuples."""
+    return queryset.values_list(*STATUS_LOG_COLUMNS)
+
+
+def serialize_status_log_rows(rows, now=None):
+    """Serialize STATUS_LOG_COLUMNS tuples like StatusLogSerializer(many=True)."""
+    now = now or timezone.now()
+    format_datetime = datetime_formatter()
+    keys = STATUS_LOG_FIELDS
+
+    data = []
+    append = data.append
+    for (log_id, employee_name, status_name, status_color, start, end,
+         planned, overdue_duration, notes, username) in rows:
+        row = dict(zip(keys, (
+            log_id,
+            employee_name,
+            status_name,
+            status_color,
+            format_datetime(start),
+            format_datetime(end),
+            format_datetime(planned),
+            overdue_duration,
+            int(((end or now) - start).total_seconds()),
+            notes,
+            username,
+        )))
+        # The serializer skips created_by.username when created_by is NULL
+        if username is None:
+            del row['created_by_username']
+        append(row)
+    return data
@@ -0,0 +1,46 @@
+"""
+Outbox handlers for Employee Status Tracking System.
+
+Handlers run in the ``drain_outbox`` Celery task, never in the request that
+emitted the event. Delivery is at least once, so every handler must be safe
+to run twice for the same event.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils import timezone
+
+from .models import StatusLog
+from .outbox import TOPIC_STATUS_CHANGED, handler
+
+
+@handler(TOPIC_STATUS_CHANGED)
+def alert_on_overdue_close(event):
+    """
+    Email the admin when a status is closed more than
+    OVERDUE_CLOSE_ALERT_SECONDS after its planned end (disabled when unset).
+    """
+    threshold = settings.OVERDUE_CLOSE_ALERT_SECONDS
+    old_log_id = event.payload.get('old_log_id')
+    if threshold is None or old_log_id is None:
+        return
+
+    log = StatusLog.objects.select_related('employee', 'status').filter(id=old_log_id).first()
+    # Idempotency: a redelivered event must not alert twice for the same log
+    if log is None or log.overdue_duration <= threshold or log.overdue_alert_sent_at:
+        return
+
+    send_mail(
+        subject=f'Overdue status closed: {log.employee.name}',
+        message=(
+            f"Employee: {log.employee.name}\n"
+            f"Status: {log.status.name}\n"
+            f"Planned End: {log.planned_end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Ended: {log.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Overdue: {log.overdue_duration / 3600:.2f} hours\n"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[settings.ADMIN_EMAIL],
+        fail_silently=False,
+    )
+    # Only once sent: a failed send is retried with the event
+    StatusLog.objects.filter(id=log.id).update(overdue_alert_sent_at=timezone.now())
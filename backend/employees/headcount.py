@@ -0,0 +1,148 @@
+"""
+Status headcount time series.
+
+Counts, at the start of every bucket of a range, how many employees were in
+each status and how many of them were overdue (the same instant semantics as
+``snapshot``). The overlapping StatusLog intervals are fetched once as
+integer second offsets and accumulated with a difference array per status,
+so the cost grows with the number of logs, not logs x buckets. Times are
+resolved to the second.
+
+NumPy is imported by the functions that use it, so that importing the API
+views doesn't load it in every web worker.
+"""
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import DateTimeField, Q, Value
+from django.db.models.functions import Coalesce
+
+from .expressions import EpochSeconds
+from .models import Status, StatusLog
+
+BUCKET_SECONDS = {
+    '15m': 15 * 60,
+    '1h': 60 * 60,
+    '1d': 24 * 60 * 60,
+}
+
+# Epoch for a missing planned end / deletion time: never reached
+NEVER = 2 ** 62
+
+
+def interval_columns(start, end, now):
+    """
+    Fetch the logs overlapping [`start`, `end`) as an int64 array.
+
+    Columns: status id, start, end, planned end, employee deletion time, all
+    in whole seconds from `start`. Open logs end at `now`.
+    """
+    import numpy as np
+
+    queryset = (
+        StatusLog.objects
+        .filter(start_time__lt=end)
+        .filter(Q(end_time__isnull=True) | Q(end_time__gt=start))
+        .filter(
+            Q(employee__deleted_at__isnull=True, employee__is_active=True)
+            | Q(employee__deleted_at__gt=start)
+        )
+        .order_by()
+        .annotate(
+            start_epoch=EpochSeconds('start_time'),
+            end_epoch=EpochSeconds(Coalesce('end_time', Value(now, output_field=DateTimeField()))),
+            planned_epoch=Coalesce(EpochSeconds('planned_end_time'), Value(NEVER)),
+            deleted_epoch=Coalesce(EpochSeconds('employee__deleted_at'), Value(NEVER)),
+        )
+        .values_list('status_id', 'start_epoch', 'end_epoch', 'planned_epoch', 'deleted_epoch')
+    )
+    # Plain integer rows straight from the cursor: no per-row model or
+    # converter overhead (statuslog_interval_idx covers the log columns)
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 5)
+    # Epoch seconds -> seconds from `start` (NEVER stays out of reach)
+    columns[:, 1:] -= int(start.timestamp())
+    return columns
+
+
+def number_of_buckets(start, end, bucket):
+    """Number of `bucket` sized buckets needed to cover [`start`, `end`)."""
+    seconds = BUCKET_SECONDS[bucket]
+    return max(0, -(-int((end - start).total_seconds()) // seconds))
+
+
+def first_bucket_from(offsets, bucket, buckets):
+    """
+    Index of the first bucket starting at or after each offset.
+
+    Bucket k starts at ``k * bucket`` seconds; results are clipped to
+    [0, `buckets`].
+    """
+    return (-(-offsets // bucket)).clip(0, buckets)
+
+
+def accumulate(rows, bucket, buckets):
+    """
+    Sweep the interval rows into per-bucket counts.
+
+    Returns ``(status_ids, counts, overdue)``: the status ids in row order, a
+    (statuses x buckets) count matrix and the overdue count per bucket.
+    """
+    import numpy as np
+
+    status_ids, status_rows = np.unique(rows[:, 0], return_inverse=True)
+    status_rows = status_rows.reshape(-1)
+    ends = np.minimum(rows[:, 2], rows[:, 4])
+
+    # A log counts at the bucket starts in [start, end): +1 at the first, -1
+    # one past the last; a cumulative sum turns the edges into counts
+    first = first_bucket_from(rows[:, 1], bucket, buckets)
+    last = np.maximum(first, first_bucket_from(ends, bucket, buckets))
+    edges = np.zeros((len(status_ids), buckets + 1), dtype=np.int64)
+    np.add.at(edges, (status_rows, first), 1)
+    np.add.at(edges, (status_rows, last), -1)
+    counts = np.cumsum(edges[:, :-1], axis=1)
+
+    # ... and is overdue at those strictly after its planned end
+    overdue_first = np.maximum(first, first_bucket_from(rows[:, 3] + 1, bucket, buckets))
+    overdue_last = np.maximum(overdue_first, last)
+    overdue_edges = np.zeros(buckets + 1, dtype=np.int64)
+    np.add.at(overdue_edges, overdue_first, 1)
+    np.add.at(overdue_edges, overdue_last, -1)
+    overdue = np.cumsum(overdue_edges[:-1])
+
+    return status_ids.tolist(), counts, overdue
+
+
+def headcount(start, end, bucket, now):
+    """
+    Headcount per status and overdue count at each bucket start in [`start`, `end`).
+
+    `bucket` is a BUCKET_SECONDS key. Returns a dict with the bucket starts,
+    one entry per status (active statuses plus any seen in the range) with
+    its counts, and the overdue counts.
+    """
+    bucket_seconds = BUCKET_SECONDS[bucket]
+    buckets = number_of_buckets(start, end, bucket)
+    rows = interval_columns(start, end, now)
+    status_ids, counts, overdue = accumulate(rows, bucket_seconds, buckets)
+    by_status = dict(zip(status_ids, counts.tolist()))
+
+    statuses = Status.objects.filter(Q(is_active=True) | Q(pk__in=status_ids))
+    step = timedelta(seconds=bucket_seconds)
+    return {
+        'buckets': [start + k * step for k in range(buckets)],
+        'statuses': [
+            {
+                'id': s.id,
+                'name': s.name,
+                'color': s.color,
+                'counts': by_status.get(s.id, [0] * buckets),
+            }
+            for s in statuses
+        ],
+        'overdue': overdue.tolist(),
+    }
+
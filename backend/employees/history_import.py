@@ -0,0 +1,321 @@
+"""
+Bulk import of historical status logs.
+
+Rows are read as a stream from CSV (with a header) or NDJSON, one status log
+per row:
+
+    employee_email, employee_name, status, start_time, end_time,
+    planned_end_time, notes
+
+Employees are matched by email, or by name when the row has no email.
+``status`` is a Status name. Times are ISO 8601; naive values are in
+TIME_ZONE. A row without ``end_time`` is an open log.
+
+Rows are imported in chunks, one transaction each. A chunk is validated
+against itself and against the logs already in the database (including
+previous chunks): an employee's logs may not overlap, which also allows at
+most one open log per employee. ``overdue_duration`` is computed as by
+``StatusLog.calculate_and_save_overdue_duration()``.
+"""
+import csv
+import io
+import json
+import sys
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import dateparse, timezone
+
+from . import journal
+from .models import Employee, Status, StatusChangeJournal, StatusLog
+
+FIELDS = (
+    'employee_email',
+    'employee_name',
+    'status',
+    'start_time',
+    'end_time',
+    'planned_end_time',
+    'notes',
+)
+
+
+class InvalidRow(ValueError):
+    """A row that can't be imported."""
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line number, raw row dict)`` from a text stream ('csv' or 'ndjson')."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = exc
+        yield line_number, row
+
+
+def parse_time(raw, field, required=False):
+    value = (raw.get(field) or '').strip()
+    if not value:
+        if required:
+            raise InvalidRow(f'{field} is required')
+        return None
+    try:
+        parsed = dateparse.parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise InvalidRow(f'{field}: invalid datetime {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_row(raw):
+    """Validate the fields of one raw row; returns a dict of typed values."""
+    if isinstance(raw, Exception):
+        raise InvalidRow(f'invalid JSON: {raw}')
+    if not isinstance(raw, dict):
+        raise InvalidRow('expected a JSON object')
+    raw = {key: ('' if value is None else str(value)) for key, value in raw.items()}
+
+    row = {
+        'employee_email': raw.get('employee_email', '').strip().lower(),
+        'employee_name': raw.get('employee_name', '').strip(),
+        'status': raw.get('status', '').strip(),
+        'start_time': parse_time(raw, 'start_time', required=True),
+        'end_time': parse_time(raw, 'end_time'),
+        'planned_end_time': parse_time(raw, 'planned_end_time'),
+        'notes': raw.get('notes', ''),
+    }
+    if not row['employee_email'] and not row['employee_name']:
+        raise InvalidRow('employee_email or employee_name is required')
+    if not row['status']:
+        raise InvalidRow('status is required')
+    if row['end_time'] is not None and row['end_time'] < row['start_time']:
+        raise InvalidRow('end_time is before start_time')
+    return row
+
+
+def overdue_duration(row):
+    """Seconds the log ran past its planned end (0 for open or on-time logs)."""
+    if row['planned_end_time'] and row['end_time'] and row['end_time'] > row['planned_end_time']:
+        return int((row['end_time'] - row['planned_end_time']).total_seconds())
+    return 0
+
+
+def overlaps(start, end, other_start, other_end):
+    """Whether [start, end) and [other_start, other_end) intersect (None = open)."""
+    return (end is None or other_start < end) and (other_end is None or start < other_end)
+
+
+class HistoryImporter:
+    """
+    Import chunks of parsed rows.
+
+    With `create_employees`, employees that don't exist are created (a name
+    is then required). Invalid rows raise InvalidRow for the whole chunk
+    unless `skip_invalid`, in which case they are returned as errors and
+    the rest of the chunk is imported.
+    """
+
+    def __init__(self, create_employees=False, skip_invalid=False, batch_size=1000):
+        self.create_employees = create_employees
+        self.skip_invalid = skip_invalid
+        self.batch_size = batch_size
+        self.statuses = {status.name: status.id for status in Status.objects.all()}
+        self.employees = {}
+
+    def import_chunk(self, rows, before_commit=None):
+        """
+        Import ``[(line number, raw row)]`` in one transaction.
+
+        Returns ``(logs, errors)``: the created StatusLogs and a list of
+        ``(line number, message)``. `before_commit` is called with the logs
+        just before the transaction commits.
+        """
+        errors = []
+        self.created_keys = []
+        try:
+            with transaction.atomic():
+                return self._import_chunk(rows, errors, before_commit)
+        except Exception:
+            # Employees created by the rolled back transaction don't exist
+            for key in self.created_keys:
+                self.employees.pop(key, None)
+            raise
+
+    def _import_chunk(self, rows, errors, before_commit):
+        """Validate and insert a chunk inside the open transaction."""
+        parsed = []
+        for line_number, raw in rows:
+            try:
+                row = parse_row(raw)
+                row['status_id'] = self.statuses.get(row['status'])
+                if row['status_id'] is None:
+                    raise InvalidRow(f'unknown status {row["status"]!r}')
+            except InvalidRow as exc:
+                errors.append((line_number, str(exc)))
+                continue
+            parsed.append((line_number, row))
+
+        parsed = self.resolve_employees(parsed, errors)
+        accepted = self.check_intervals(parsed, errors)
+        if errors and not self.skip_invalid:
+            line_number, message = min(errors)
+            raise InvalidRow(f'line {line_number}: {message}')
+
+        logs = StatusLog.objects.bulk_create(
+            [
+                StatusLog(
+                    employee_id=row['employee_id'],
+                    status_id=row['status_id'],
+                    start_time=row['start_time'],
+                    end_time=row['end_time'],
+                    planned_end_time=row['planned_end_time'],
+                    overdue_duration=overdue_duration(row),
+                    notes=row['notes'],
+                )
+                for row in accepted
+            ],
+            batch_size=self.batch_size,
+        )
+        # An imported open log is the employee's current status
+        journal.record_many(
+            StatusChangeJournal.KIND_STATUS_CHANGE,
+            sorted({row['employee_id'] for row in accepted if row['end_time'] is None}),
+            batch_size=self.batch_size,
+        )
+        if before_commit is not None:
+            before_commit(logs)
+        return logs, sorted(errors)
+
+    def employee_key(self, row):
+        if row['employee_email']:
+            return 'email', row['employee_email']
+        return 'name', row['employee_name']
+
+    def resolve_employees(self, parsed, errors):
+        """Set ``employee_id`` on each row, creating employees if allowed."""
+        missing = {self.employee_key(row) for _, row in parsed} - self.employees.keys()
+        emails = [value for kind, value in missing if kind == 'email']
+        names = [value for kind, value in missing if kind == 'name']
+        matches = (
+            Employee.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=emails)
+            .values_list('id', 'email_lower')
+        )
+        for pk, email in matches:
+            self.employees['email', email] = pk
+        by_name = defaultdict(list)
+        for pk, name in Employee.objects.filter(name__in=names).values_list('id', 'name'):
+            by_name[name].append(pk)
+        for name, pks in by_name.items():
+            # Several employees with the name: the row must give an email
+            self.employees['name', name] = pks[0] if len(pks) == 1 else None
+
+        to_create = {}
+        resolved = []
+        for line_number, row in parsed:
+            key = self.employee_key(row)
+            if key in self.employees:
+                if self.employees[key] is None:
+                    errors.append((line_number, f'several employees are named {key[1]!r}'))
+                    continue
+            elif not self.create_employees:
+                errors.append((line_number, f'unknown employee {key[1]!r}'))
+                continue
+            elif not row['employee_name']:
+                errors.append((line_number, 'employee_name is required to create an employee'))
+                continue
+            else:
+                to_create.setdefault(key, Employee(
+                    name=row['employee_name'],
+                    email=row['employee_email'] or None,
+                ))
+            resolved.append((line_number, row, key))
+
+        created = Employee.objects.bulk_create(to_create.values(), batch_size=self.batch_size)
+        self.created_keys = list(to_create)
+        for key, employee in zip(to_create, created):
+            self.employees[key] = employee.pk
+        journal.record_many(
+            StatusChangeJournal.KIND_EMPLOYEE_CREATE,
+            [employee.pk for employee in created],
+            batch_size=self.batch_size,
+        )
+
+        for line_number, row, key in resolved:
+            row['employee_id'] = self.employees[key]
+        return [(line_number, row) for line_number, row, _ in resolved]
+
+    def check_intervals(self, parsed, errors):
+        """
+        Reject rows overlapping an existing log or an earlier row of the chunk.
+
+        Returns the accepted rows.
+        """
+        if not parsed:
+            return []
+        by_employee = defaultdict(list)
+        for line_number, row in parsed:
+            by_employee[row['employee_id']].append((line_number, row))
+
+        # Existing logs that can overlap any row of the chunk
+        first_start = min(row['start_time'] for _, row in parsed)
+        ends = [row['end_time'] for _, row in parsed]
+        existing_filter = Q(employee_id__in=by_employee.keys())
+        existing_filter &= Q(end_time__isnull=True) | Q(end_time__gt=first_start)
+        if None not in ends:
+            existing_filter &= Q(start_time__lt=max(ends))
+        existing = defaultdict(list)
+        for employee_id, start, end in (
+            StatusLog.objects.filter(existing_filter)
+            .order_by('employee_id', 'start_time')
+            .values_list('employee_id', 'start_time', 'end_time')
+        ):
+            existing[employee_id].append((start, end))
+
+        accepted = []
+        for employee_id, rows in by_employee.items():
+            logs = existing[employee_id]
+            starts = [start for start, _ in logs]
+            last = None
+            for line_number, row in sorted(rows, key=lambda item: (item[1]['start_time'], item[0])):
+                start, end = row['start_time'], row['end_time']
+                # Existing logs don't overlap each other, so only the last one
+                # starting before this row ends can reach into it
+                index = bisect_left(starts, end) if end is not None else len(starts)
+                if index and overlaps(start, end, *logs[index - 1]):
+                    other_start, other_end = logs[index - 1]
+                    if end is None and other_end is None:
+                        message = 'the employee already has an open log'
+                    else:
+                        message = f'overlaps the existing log starting {other_start.isoformat()}'
+                    errors.append((line_number, message))
+                    continue
+                # Accepted rows are sorted and disjoint: only the last can overlap
+                if last is not None and overlaps(start, end, last[1]['start_time'], last[1]['end_time']):
+                    errors.append((line_number, f'overlaps the log on line {last[0]}'))
+                    continue
+                last = (line_number, row)
+                accepted.append(row)
+        return accepted
+
+
+def open_input(path):
+    """Open `path` ('-' for stdin) as text and guess its format from the extension."""
+    fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline=''), fmt
+    return open(path, encoding='utf-8', newline=''), fmt
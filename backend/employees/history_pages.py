@@ -0,0 +1,116 @@
+"""
+Cursor pages of an employee's status history.
+
+Pages are cut from the oldest log up: every page but the newest holds
+exactly ``page_size`` logs, and the newest ("head") page holds the rest,
+between ``page_size`` and ``2 * page_size - 1`` logs (or all of them), so
+new logs only ever grow the head. A cursor names the log just newer than
+its page, so the older pages keep the same cursor and content while the
+head grows. Pages of closed logs are cacheable: the server keeps their
+serialized rows under a version of the rows they cover, and clients may
+keep them for HISTORY_PAGE_MAX_AGE.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Status
+
+NEWEST_FIRST = ('-start_time', '-id')
+
+
+def encode_cursor(key):
+    """Opaque cursor for a ``(start_time, id)`` log key."""
+    start_time, pk = key
+    return base64.urlsafe_b64encode(f'{start_time.isoformat()}|{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """The ``(start_time, id)`` key of a cursor; raises ValueError if it is malformed."""
+    try:
+        start_time, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        start_time = parse_datetime(start_time)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f'Invalid cursor {cursor!r}') from e
+    if start_time is None or start_time.tzinfo is None:
+        raise ValueError(f'Invalid cursor {cursor!r}')
+    return start_time, pk
+
+
+def older_than(logs, key):
+    """The logs after `key` in newest-first order."""
+    start_time, pk = key
+    return logs.filter(Q(start_time__lt=start_time) | Q(start_time=start_time, pk__lt=pk))
+
+
+def head_size(total, page_size):
+    """Number of logs on the head page of a history of `total` logs."""
+    if total < 2 * page_size:
+        return total
+    return page_size + total % page_size
+
+
+def head_page(logs, page_size):
+    """
+    The newest page of `logs`.
+
+    Returns ``(page, next_key)``: a newest-first slice of `logs` and the key
+    of its oldest log, or None if there are no older pages.
+    """
+    total = logs.count()
+    size = head_size(total, page_size)
+    ordered = logs.order_by(*NEWEST_FIRST)
+    next_key = None
+    if size < total:
+        next_key = ordered.values_list('start_time', 'id')[size - 1]
+    return ordered[:size], next_key
+
+
+def older_page(logs, key, page_size, employee):
+    """
+    The page of `logs` after the log with `key`.
+
+    Returns ``(page, next_key, version)``. The version changes when a log on
+    the page is added, removed or saved, or the employee or a status is
+    changed; it is None when the page has an open log and must not be
+    cached. (Renamed users, shown as ``created_by_username``, don't change
+    it.)
+    """
+    ordered = older_than(logs, key).order_by(*NEWEST_FIRST)
+    rows = list(ordered.values_list('start_time', 'id', 'updated_at', 'end_time')[:page_size + 1])
+    next_key = rows[page_size - 1][:2] if len(rows) > page_size else None
+    rows = rows[:page_size]
+
+    version = None
+    if all(end_time is not None for *_, end_time in rows):
+        statuses_changed = Status.objects.aggregate(at=Max('updated_at'))['at']
+        payload = repr((rows, employee.updated_at, statuses_changed)).encode()
+        version = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return ordered[:len(rows)], next_key, version
+
+
+def cache_key(employee_id, key, page_size, version):
+    """Server cache key of a history page."""
+    return f'history-page:{employee_id}:{encode_cursor(key)}:{page_size}:{version}'
+
+
+def cached(employee_id, key, page_size, version, serialize):
+    """
+    Serialized rows of a page: from the server cache, else ``serialize()``.
+
+    Returns ``(data, hit)``.
+    """
+    if version is None:
+        return serialize(), False
+    cache_name = cache_key(employee_id, key, page_size, version)
+    data = cache.get(cache_name)
+    if data is not None:
+        return data, True
+    data = serialize()
+    cache.set(cache_name, data, settings.HISTORY_PAGE_CACHE_SECONDS)
+    return data, False
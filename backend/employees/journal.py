@@ -0,0 +1,99 @@
+"""
+Status change journal helpers.
+
+Writers call ``record()``/``record_many()`` inside the transaction that
+changes the board (which also updates this process's live board when it
+commits); readers use ``changes_since()`` to find which employees changed
+after a given sequence number.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from . import live_board
+from .models import StatusChangeJournal
+
+
+def record(kind, employee_id, old_log_id=None, new_log_id=None):
+    """Append one journal entry. Call inside the writing transaction."""
+    live_board.changed([employee_id])
+    return StatusChangeJournal.objects.create(
+        kind=kind,
+        employee_id=employee_id,
+        old_log_id=old_log_id,
+        new_log_id=new_log_id,
+    )
+
+
+def record_many(kind, employee_ids, batch_size=1000):
+    """Append one entry of `kind` per employee id with a single bulk insert."""
+    employee_ids = list(employee_ids)
+    live_board.changed(employee_ids)
+    StatusChangeJournal.objects.bulk_create(
+        [StatusChangeJournal(kind=kind, employee_id=pk) for pk in employee_ids],
+        batch_size=batch_size,
+    )
+
+
+def latest_seq():
+    """Return the newest sequence number (0 for an empty journal)."""
+    return StatusChangeJournal.objects.aggregate(seq=Max('seq'))['seq'] or 0
+
+
+def changes_since(since):
+    """
+    Return ``(version, employee_ids)`` for entries after `since`.
+
+    ``employee_ids`` is None when the client must resync: entries after
+    `since` were compacted away, or `since` is ahead of the journal (e.g. the
+    database was restored).
+
+    Sequence numbers are allocated at insert time, so a slow transaction can
+    commit an entry below a version a client has already seen. Entries from
+    the last STATUS_JOURNAL_SETTLE_SECONDS within STATUS_JOURNAL_LOOKBACK
+    sequence numbers before `since` are therefore included again.
+    """
+    bounds = StatusChangeJournal.objects.aggregate(first=Min('seq'), last=Max('seq'))
+    version = bounds['last'] or 0
+
+    if since > version:
+        return version, None
+    # Compaction always keeps the newest entry, so a gap before the oldest
+    # surviving entry means the client missed pruned changes
+    if bounds['first'] is not None and bounds['first'] > since + 1:
+        return version, None
+
+    settled_before = timezone.now() - timedelta(seconds=settings.STATUS_JOURNAL_SETTLE_SECONDS)
+    recent = Q(seq__gt=since - settings.STATUS_JOURNAL_LOOKBACK, created_at__gte=settled_before)
+    employee_ids = set(
+        StatusChangeJournal.objects
+        .filter(Q(seq__gt=since) | recent, seq__lte=version)
+        .values_list('employee_id', flat=True)
+        .distinct()
+    )
+    return version, employee_ids
+
+
+def compact(before, batch_size=5000):
+    """
+    Delete entries created before `before`, always keeping the newest entry.
+
+    Deletes in batches to keep transactions short. Returns the number of
+    deleted rows.
+    """
+    newest = latest_seq()
+    deleted = 0
+    while True:
+        seqs = list(
+            StatusChangeJournal.objects
+            .filter(created_at__lt=before, seq__lt=newest)
+            .order_by('seq')
+            .values_list('seq', flat=True)[:batch_size]
+        )
+        if not seqs:
+            return deleted
+        deleted += StatusChangeJournal.objects.filter(
+            seq__gte=seqs[0], seq__lte=seqs[-1]
+        ).delete()[0]
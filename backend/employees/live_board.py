@@ -0,0 +1,326 @@
+"""
+In-memory live board.
+
+Each process keeps the board (every active employee with their open log) in
+column arrays indexed by slot, with a dict from employee id to slot; freed
+slots are reused. The board is loaded once and then kept current by:
+
+- change events: writers journal every board change (``journal.record()``)
+  and the journaled employees are re-read here when the transaction commits;
+- a version check, at most every LIVE_BOARD_CHECK_SECONDS, of the newest
+  journal entry (changes made by other processes) and the latest status
+  change;
+- a reconciliation every LIVE_BOARD_RECONCILE_SECONDS that reloads the whole
+  board and logs the employees whose rows had drifted from the database.
+
+Rows come out in the fast path layout. A digest of the content (the XOR of
+per-row hashes, kept up to date row by row) identifies the board state, so
+ETags are computed without rendering. Employees are in the order of the
+database read path (name, then id, in the database's collation): the order
+is read from the database whenever employees join, leave or are renamed,
+so reads never sort names in Python.
+"""
+import hashlib
+import logging
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from . import fastpath, journal
+from .conditional import body_etag
+from .models import Employee, Status, StatusLog
+
+logger = logging.getLogger(__name__)
+
+# log id / status id of an employee without an open log
+NO_LOG = 0
+
+
+def row_hash(employee_id, row):
+    """Stable 64-bit hash of a board row (the same in every process)."""
+    digest = hashlib.blake2b(repr((employee_id, row)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def read_rows(employee_ids=None):
+    """
+    Board rows from the database, for all or only `employee_ids`.
+
+    Maps employee id -> ``(name, email, log id, status id, start, planned
+    end, notes)``; employees without an open log have NO_LOG ids. Like
+    ``Employee.get_current_status_log()``, the newest open log wins.
+    """
+    employees = Employee.objects.filter(is_active=True).order_by()
+    logs = StatusLog.objects.filter(end_time__isnull=True, employee__is_active=True)
+    if employee_ids is not None:
+        employees = employees.filter(pk__in=employee_ids)
+        logs = logs.filter(employee_id__in=employee_ids)
+
+    rows = {
+        pk: (name, email, NO_LOG, NO_LOG, None, None, '')
+        for pk, name, email in employees.values_list('id', 'name', 'email')
+    }
+    logs = logs.order_by('start_time').values_list(
+        'employee_id', 'id', 'status_id', 'start_time', 'planned_end_time', 'notes'
+    )
+    for employee_id, *log in logs:
+        if employee_id in rows:
+            rows[employee_id] = rows[employee_id][:2] + tuple(log)
+    return rows
+
+
+def read_order():
+    """Ids of the active employees in board order, as the database sorts them."""
+    return list(Employee.objects.filter(is_active=True).order_by('name', 'id').values_list('id', flat=True))
+
+
+def read_statuses():
+    """``({status id: (name, color)}, latest status change)`` from the database."""
+    statuses = {pk: (name, color) for pk, name, color in Status.objects.values_list('id', 'name', 'color')}
+    return statuses, Status.objects.aggregate(at=Max('updated_at'))['at']
+
+
+class LiveBoard:
+    """The board of one process. All methods are thread-safe."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next ``current()`` loads the board again."""
+        with self.lock:
+            self.loaded = False
+            self.slots = {}
+            self.free = []
+            self.ids = array('q')
+            self.log_ids = array('q')
+            self.status_ids = array('q')
+            self.hashes = array('Q')
+            self.names = []
+            self.emails = []
+            self.starts = []
+            self.planned = []
+            self.notes = []
+            self.digest = 0
+            self.order = None
+            self.statuses = {}
+            self.statuses_changed = None
+            self.seq = 0
+            self.checked_at = 0.0
+            self.reconciled_at = 0.0
+
+    def __len__(self):
+        return len(self.slots)
+
+    # Row storage
+
+    def row(self, slot):
+        return (
+            self.names[slot], self.emails[slot], self.log_ids[slot], self.status_ids[slot],
+            self.starts[slot], self.planned[slot], self.notes[slot],
+        )
+
+    def put(self, employee_id, row):
+        """Insert or replace an employee's row; returns whether the board changed."""
+        new_hash = row_hash(employee_id, row)
+        slot = self.slots.get(employee_id)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.ids)
+                for column in (self.ids, self.log_ids, self.status_ids, self.hashes):
+                    column.append(0)
+                for column in (self.names, self.emails, self.starts, self.planned, self.notes):
+                    column.append(None)
+            self.slots[employee_id] = slot
+            self.ids[slot] = employee_id
+            self.order = None
+        elif self.hashes[slot] == new_hash:
+            return False
+        else:
+            self.digest ^= self.hashes[slot]
+            if self.names[slot] != row[0]:
+                self.order = None
+
+        (self.names[slot], self.emails[slot], self.log_ids[slot], self.status_ids[slot],
+         self.starts[slot], self.planned[slot], self.notes[slot]) = row
+        self.hashes[slot] = new_hash
+        self.digest ^= new_hash
+        return True
+
+    def remove(self, employee_id):
+        """Drop an employee from the board; returns whether it was on it."""
+        slot = self.slots.pop(employee_id, None)
+        if slot is None:
+            return False
+        self.digest ^= self.hashes[slot]
+        self.ids[slot] = self.log_ids[slot] = self.status_ids[slot] = self.hashes[slot] = 0
+        self.names[slot] = self.emails[slot] = self.starts[slot] = self.planned[slot] = self.notes[slot] = None
+        self.free.append(slot)
+        self.order = None
+        return True
+
+    def apply(self, rows, employee_ids):
+        """Store `rows` (see ``read_rows()``) and drop the other `employee_ids`."""
+        changed = 0
+        for employee_id in employee_ids:
+            if employee_id in rows:
+                changed += self.put(employee_id, rows[employee_id])
+            else:
+                changed += self.remove(employee_id)
+        if any(row[3] not in self.statuses for row in rows.values() if row[3] != NO_LOG):
+            self.statuses, self.statuses_changed = read_statuses()
+        if self.order is None:
+            self.order = self.read_order()
+        return changed
+
+    def read_order(self):
+        """Slots in board order (employees the database no longer lists go last)."""
+        rank = {pk: position for position, pk in enumerate(read_order())}
+        return sorted(self.slots.values(), key=lambda slot: (rank.get(self.ids[slot], len(rank)), self.ids[slot]))
+
+    def ordered_slots(self):
+        if self.order is None:
+            self.order = self.read_order()
+        return self.order
+
+    # Keeping current
+
+    def load(self):
+        """Load the whole board from the database."""
+        with self.lock:
+            # Read the journal version first: later changes are caught up on
+            seq = journal.latest_seq()
+            statuses, statuses_changed = read_statuses()
+            rows = read_rows()
+            self.reset()
+            self.statuses, self.statuses_changed = statuses, statuses_changed
+            self.apply(rows, rows)
+            self.seq = seq
+            self.loaded = True
+            self.checked_at = self.reconciled_at = time.monotonic()
+
+    def refresh(self, employee_ids):
+        """Re-read `employee_ids` from the database (a change event)."""
+        with self.lock:
+            if self.loaded:
+                self.apply(read_rows(employee_ids), employee_ids)
+
+    def check_version(self):
+        """Catch up on journaled changes and status edits made since the last check."""
+        with self.lock:
+            self.checked_at = time.monotonic()
+            if Status.objects.aggregate(at=Max('updated_at'))['at'] != self.statuses_changed:
+                self.statuses, self.statuses_changed = read_statuses()
+            if journal.latest_seq() == self.seq:
+                return
+            version, employee_ids = journal.changes_since(self.seq)
+            if employee_ids is None:
+                self.load()
+                return
+            self.apply(read_rows(employee_ids), employee_ids)
+            self.seq = version
+
+    def sync(self, seq):
+        """Make sure the board includes the changes up to journal version `seq`."""
+        with self.lock:
+            if self.seq < seq:
+                self.check_version()
+
+    def reconcile(self):
+        """
+        Reload the board from the database after a version check.
+
+        Rows that still differ had drifted (a write that wasn't journaled);
+        they are logged. Returns the ids of the drifted employees.
+        """
+        with self.lock:
+            self.check_version()
+            rows = read_rows()
+            drifted = {pk for pk, slot in self.slots.items() if rows.get(pk) != self.row(slot)}
+            drifted.update(set(rows) - set(self.slots))
+            if drifted:
+                logger.warning(
+                    'Live board drifted from the database for %d employees: %s',
+                    len(drifted), sorted(drifted)[:20],
+                )
+                self.apply(rows, set(rows) | set(self.slots))
+            self.reconciled_at = time.monotonic()
+            return drifted
+
+    def current(self):
+        """The board, loaded, version-checked or reconciled as they fall due."""
+        now = time.monotonic()
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            elif now - self.reconciled_at >= settings.LIVE_BOARD_RECONCILE_SECONDS:
+                self.reconcile()
+            elif now - self.checked_at >= settings.LIVE_BOARD_CHECK_SECONDS:
+                self.check_version()
+        return self
+
+    # Reading
+
+    def snapshot(self, employee_ids=None):
+        """
+        A consistent copy of the board (or of `employee_ids` on it).
+
+        Returns ``(version, rows, logs)``: a digest of the board state, the
+        EMPLOYEE_COLUMNS tuples in board order and a dict of employee id ->
+        open log as CURRENT_STATUS_COLUMNS tuples.
+        """
+        with self.lock:
+            if employee_ids is None:
+                slots = self.ordered_slots()
+            else:
+                employee_ids = set(employee_ids)
+                slots = [slot for slot in self.ordered_slots() if self.ids[slot] in employee_ids]
+            rows = [(self.ids[slot], self.names[slot], self.emails[slot], True) for slot in slots]
+            logs = {}
+            for slot in slots:
+                if self.log_ids[slot] != NO_LOG:
+                    name, color = self.statuses[self.status_ids[slot]]
+                    logs[self.ids[slot]] = (
+                        self.ids[slot], self.log_ids[slot], name, color,
+                        self.starts[slot], self.planned[slot], self.notes[slot],
+                    )
+            version = f'{self.digest:016x}-{row_hash(0, sorted(self.statuses.items())):016x}'
+            return version, rows, logs
+
+
+board = LiveBoard()
+
+
+def is_enabled():
+    """Whether views should serve the board from memory."""
+    return getattr(settings, 'LIVE_BOARD', False)
+
+
+def changed(employee_ids):
+    """Re-read `employee_ids` once the current transaction commits (if the board is in use)."""
+    if is_enabled() and board.loaded:
+        employee_ids = list(employee_ids)
+        transaction.on_commit(lambda: board.refresh(employee_ids))
+
+
+def serialize(rows, logs, now, fields=None):
+    """Serialize snapshot rows like EmployeeListSerializer(many=True) as of `now`."""
+    current = {}
+    if fastpath.needs_current_status(fields):
+        current = fastpath.current_status_from_rows(
+            [logs[row[0]] for row in rows if row[0] in logs], now
+        )
+    return fastpath.employee_rows_data(rows, current, fields)
+
+
+def etag(version, now, request):
+    """ETag of a board response: the board state, the second, the URL and the media type."""
+    key = f'{version}|{now.isoformat()}|{request.build_absolute_uri()}|{request.accepted_media_type}'
+    return body_etag(key.encode())
@@ -0,0 +1,148 @@
+"""
+Integrity checks of status log intervals.
+
+An employee's logs should form a sequence of disjoint intervals with at most
+one open log, the newest, and each closed log's ``overdue_duration`` should
+be what ``StatusLog.calculate_and_save_overdue_duration()`` computes. Races
+in ``change_status`` and end times edited in the admin break this, which
+skews statistics and reports.
+
+Logs are read in one pass in the order of the ``(employee, -start_time)``
+index, newest first, a keyset page per query, and each is checked against
+the log just after it only, so memory stays bounded however many logs there
+are:
+
+- ``overlap``: the log ends after the next one starts, or is still open;
+- ``multiple_open``: both are open;
+- ``gap``: the next log starts at least ``min_gap`` after this one ends
+  (reported only, there is nothing to fill it with);
+
+and then its ``overdue_duration`` is checked (``overdue_mismatch``).
+Overlaps are repaired the way ``change_status`` closes a log: the log ends
+when the next one starts, and its overdue duration is recomputed.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import journal
+from .history_import import overdue_duration
+from .models import StatusChangeJournal, StatusLog
+
+GAP = 'gap'
+OVERLAP = 'overlap'
+MULTIPLE_OPEN = 'multiple_open'
+OVERDUE_MISMATCH = 'overdue_mismatch'
+KINDS = (GAP, OVERLAP, MULTIPLE_OPEN, OVERDUE_MISMATCH)
+
+COLUMNS = ('employee_id', 'start_time', 'id', 'end_time', 'planned_end_time', 'overdue_duration', 'updated_at')
+
+
+def pages(page_size):
+    """
+    Yield lists of COLUMNS tuples of all logs, by employee and newest first.
+
+    Each page is read with range scans of the ``(employee, -start_time)``
+    index: the logs starting with the last one read, the rest of its
+    employee, then the next employees. An OR of the keyset conditions would
+    make SQLite sort all remaining logs for every page.
+    """
+    logs = StatusLog.objects.order_by('employee_id', '-start_time', 'id').values_list(*COLUMNS)
+    rows = list(logs[:page_size])
+    while rows:
+        yield rows
+        employee_id, start_time, pk = rows[-1][:3]
+        rows = []
+        for after in (
+            Q(employee_id=employee_id, start_time=start_time, id__gt=pk),
+            Q(employee_id=employee_id, start_time__lt=start_time),
+            Q(employee_id__gt=employee_id),
+        ):
+            if len(rows) < page_size:
+                rows += logs.filter(after)[:page_size - len(rows)]
+
+
+class LogScanner:
+    """
+    Check the log rows of ``pages()``, page by page.
+
+    ``feed()`` returns ``(issues, repairs)``. An issue is ``(kind, employee
+    id, log id, next log id or None, message)``; a repair is ``(log id,
+    employee id, updated_at as read, end_time, overdue_duration)`` for
+    ``repair()``.
+    """
+
+    def __init__(self, min_gap=timedelta(seconds=1)):
+        self.min_gap = min_gap
+        self.rows = 0
+        self.counts = dict.fromkeys(KINDS, 0)
+        # The last log read: the next log of the employee of the row after it
+        self.next_log = None
+
+    def feed(self, rows):
+        issues, repairs = [], []
+        for row in rows:
+            self.rows += 1
+            end = row[3]
+            if self.next_log is not None and self.next_log[0] == row[0]:
+                end = self.compare(row, self.next_log, issues)
+            self.settle(row, end, issues, repairs)
+            self.next_log = row
+        return issues, repairs
+
+    def issue(self, issues, kind, row, other_id, message):
+        self.counts[kind] += 1
+        issues.append((kind, row[0], row[2], other_id, message))
+
+    def compare(self, row, next_log, issues):
+        """Check a log against the employee's next log; returns its correct end."""
+        end = row[3]
+        start = next_log[1]
+        if end is None and next_log[3] is None:
+            self.issue(issues, MULTIPLE_OPEN, row, next_log[2], f'still open when open log {next_log[2]} started')
+            return start
+        if end is None:
+            self.issue(issues, OVERLAP, row, next_log[2], f'still open when log {next_log[2]} started')
+            return start
+        if end > start:
+            seconds = (end - start).total_seconds()
+            self.issue(issues, OVERLAP, row, next_log[2], f'overlaps log {next_log[2]} by {seconds:,.0f}s')
+            return start
+        if start - end >= self.min_gap:
+            seconds = (start - end).total_seconds()
+            self.issue(issues, GAP, row, next_log[2], f'{seconds:,.0f}s gap before log {next_log[2]}')
+        return end
+
+    def settle(self, row, new_end, issues, repairs):
+        """Check the overdue duration of a log and queue its repair."""
+        employee_id, _, pk, end, planned, overdue, updated_at = row
+        expected = overdue_duration({'end_time': new_end, 'planned_end_time': planned})
+        if new_end == end and overdue != expected:
+            self.issue(issues, OVERDUE_MISMATCH, row, None, f'overdue_duration is {overdue}s, expected {expected}s')
+        if new_end != end or overdue != expected:
+            repairs.append((pk, employee_id, updated_at, new_end, expected))
+
+
+def repair(repairs):
+    """
+    Apply `repairs` from ``LogScanner`` in one transaction.
+
+    Logs saved since they were read are left alone (the next scan checks
+    them again). The repaired employees are journaled like admin edits.
+    Returns the number of logs repaired.
+    """
+    now = timezone.now()
+    repaired = 0
+    employee_ids = set()
+    with transaction.atomic():
+        for pk, employee_id, updated_at, end_time, overdue in repairs:
+            # updated_at is set explicitly: .update() skips auto_now
+            if StatusLog.objects.filter(pk=pk, updated_at=updated_at).update(
+                end_time=end_time, overdue_duration=overdue, updated_at=now
+            ):
+                repaired += 1
+                employee_ids.add(employee_id)
+        journal.record_many(StatusChangeJournal.KIND_LOG_UPDATE, sorted(employee_ids))
+    return repaired
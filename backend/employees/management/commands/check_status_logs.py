@@ -0,0 +1,69 @@
+"""
+Management command to check (and optionally repair) status log intervals.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from employees import log_integrity
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Scan all status logs in one pass for overlaps, multiple open logs, gaps and '
+        'stale overdue durations. With --repair, overlapping logs are closed when the '
+        'next log starts and overdue durations are recomputed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help='Fix overlaps, open logs and overdue durations')
+        parser.add_argument('--page-size', type=int, default=10000, help='Logs read per query')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Repairs per transaction')
+        parser.add_argument('--min-gap', type=float, default=1.0, help='Shortest gap reported, in seconds')
+        parser.add_argument('--show', type=int, default=100, help='Most issues listed (all are counted)')
+
+    def handle(self, *args, **options):
+        if options['page_size'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--page-size and --batch-size must be positive')
+        scanner = log_integrity.LogScanner(min_gap=timedelta(seconds=options['min_gap']))
+        self.shown = 0
+        self.show = options['show']
+        pending = []
+        repaired = 0
+        started = last_progress = time.monotonic()
+
+        for rows in log_integrity.pages(options['page_size']):
+            issues, repairs = scanner.feed(rows)
+            self.list_issues(issues)
+            if options['repair']:
+                pending.extend(repairs)
+                while len(pending) >= options['batch_size']:
+                    repaired += log_integrity.repair(pending[:options['batch_size']])
+                    del pending[:options['batch_size']]
+            if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                self.stdout.write(self.progress(scanner, last_progress - started))
+        if pending:
+            repaired += log_integrity.repair(pending)
+
+        elapsed = time.monotonic() - started
+        found = sum(scanner.counts.values())
+        if self.shown < found:
+            self.stdout.write(f'... {found - self.shown:,} more issues not listed')
+        self.stdout.write(self.progress(scanner, elapsed))
+        summary = ', '.join(f'{count:,} {kind}' for kind, count in scanner.counts.items())
+        message = f'Found {found:,} issues ({summary})'
+        if options['repair']:
+            message += f', repaired {repaired:,} logs'
+        self.stdout.write(self.style.SUCCESS(message) if not found else self.style.WARNING(message))
+
+    def list_issues(self, issues):
+        for kind, employee_id, log_id, _, message in issues[:max(self.show - self.shown, 0)]:
+            self.stdout.write(f'{kind}: employee {employee_id}, log {log_id}: {message}')
+        self.shown = min(self.shown + len(issues), self.show)
+
+    def progress(self, scanner, elapsed):
+        return f'{scanner.rows:,} logs checked in {elapsed:.1f}s ({scanner.rows / elapsed if elapsed else 0:,.0f} logs/sec)'
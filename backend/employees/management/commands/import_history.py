@@ -0,0 +1,117 @@
+"""
+Management command to import historical status logs from CSV or NDJSON.
+"""
+import itertools
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from employees.history_import import FIELDS, HistoryImporter, InvalidRow, open_input, read_rows
+from employees.models import StatusLog
+
+
+class Command(BaseCommand):
+    help = (
+        'Import historical status logs from a CSV or NDJSON file '
+        f'(fields: {", ".join(FIELDS)}). Interrupted imports resume where they stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file (.csv, else NDJSON); '-' reads NDJSON from stdin")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Override the format guessed from the extension')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per transaction')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT')
+        parser.add_argument('--create-employees', action='store_true', help='Create employees that do not exist')
+        parser.add_argument('--skip-invalid', action='store_true', help='Report and skip invalid rows instead of stopping')
+        parser.add_argument('--progress-file', help='Where progress is kept (default: <path>.progress)')
+        parser.add_argument('--restart', action='store_true', help='Ignore saved progress and start from the first row')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        stream, fmt = open_input(path)
+        fmt = options['format'] or fmt
+        progress_path = None
+        if path != '-':
+            progress_path = options['progress_file'] or f'{path}.progress'
+        done = 0 if options['restart'] else self.load_progress(progress_path)
+
+        importer = HistoryImporter(
+            create_employees=options['create_employees'],
+            skip_invalid=options['skip_invalid'],
+            batch_size=options['batch_size'],
+        )
+        rows = read_rows(stream, fmt)
+        if done:
+            self.stdout.write(f'Resuming after {done:,} rows')
+            rows = itertools.islice(rows, done, None)
+
+        imported = skipped = 0
+        started = time.monotonic()
+        with stream:
+            while True:
+                chunk = list(itertools.islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+
+                def before_commit(logs):
+                    # Committed or not, a crash from here on is settled on
+                    # resume by looking for the chunk's first log
+                    self.save_progress(progress_path, done, pending=(done + len(chunk), logs))
+
+                try:
+                    logs, errors = importer.import_chunk(chunk, before_commit=before_commit)
+                except InvalidRow as exc:
+                    raise CommandError(f'{exc} (nothing from this chunk was imported; fix it and rerun to resume)')
+                done += len(chunk)
+                self.save_progress(progress_path, done)
+
+                imported += len(logs)
+                skipped += len(errors)
+                for line_number, message in errors:
+                    self.stderr.write(f'line {line_number}: {message}')
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'{done:,} rows read, {imported:,} imported, {skipped:,} skipped '
+                    f'({(imported + skipped) / elapsed:,.0f} rows/sec)'
+                )
+
+        if progress_path and os.path.exists(progress_path):
+            os.remove(progress_path)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported:,} status logs in {elapsed:.1f}s '
+            f'({imported / elapsed if elapsed else 0:,.0f} rows/sec), {skipped:,} rows skipped'
+        ))
+
+    def load_progress(self, progress_path):
+        """Number of input rows already imported by an earlier run."""
+        if not progress_path or not os.path.exists(progress_path):
+            return 0
+        with open(progress_path) as f:
+            progress = json.load(f)
+        pending = progress.get('pending')
+        if pending and StatusLog.objects.filter(**pending['first_log']).exists():
+            return pending['rows']
+        return progress['rows']
+
+    def save_progress(self, progress_path, rows, pending=None):
+        if not progress_path:
+            return
+        progress = {'rows': rows}
+        if pending is not None:
+            pending_rows, logs = pending
+            # Without logs to look for, redoing the chunk is harmless
+            if logs:
+                progress['pending'] = {
+                    'rows': pending_rows,
+                    'first_log': {
+                        'employee_id': logs[0].employee_id,
+                        'status_id': logs[0].status_id,
+                        'start_time': logs[0].start_time.isoformat(),
+                    },
+                }
+        tmp_path = f'{progress_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(progress, f)
+        os.replace(tmp_path, progress_path)
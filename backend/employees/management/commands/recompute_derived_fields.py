@@ -0,0 +1,52 @@
+"""
+Management command to recompute derived status log fields in bulk.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from employees import recompute
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute derived status log fields '
+        f'({", ".join(recompute.FIELDS)}) with set-based UPDATEs over id ranges. '
+        'Safe to run while the system is live.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--field', action='append', dest='fields', choices=list(recompute.FIELDS),
+                            help='Field to recompute (repeatable; default: all)')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Log ids per UPDATE/transaction')
+        parser.add_argument('--workers', type=int, default=1, help='Processes running chunks in parallel')
+        parser.add_argument('--first-id', type=int, help='Start at this log id')
+        parser.add_argument('--last-id', type=int, help='Stop at this log id')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would change')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--chunk-size and --workers must be positive')
+        started = time.monotonic()
+        done = [0]
+
+        def progress(low, high, changed):
+            done[0] += high - low + 1
+            elapsed = time.monotonic() - started
+            changes = ', '.join(f'{field} {count:,}' for field, count in changed.items())
+            self.stdout.write(
+                f'ids {low:,}-{high:,}: {changes} ({done[0] / elapsed if elapsed else 0:,.0f} ids/sec)'
+            )
+
+        totals = recompute.recompute(
+            fields=options['fields'],
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            dry_run=options['dry_run'],
+            first_id=options['first_id'],
+            last_id=options['last_id'],
+            progress=progress if options['verbosity'] > 1 else None,
+        )
+        elapsed = time.monotonic() - started
+        verb = 'Would change' if options['dry_run'] else 'Changed'
+        summary = ', '.join(f'{count:,} {field}' for field, count in totals.items())
+        self.stdout.write(self.style.SUCCESS(f'{verb} {summary} in {elapsed:.1f}s'))
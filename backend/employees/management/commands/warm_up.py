@@ -0,0 +1,15 @@
+"""
+Management command to warm up caches before serving traffic.
+"""
+from django.core.management.base import BaseCommand
+from employees.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Run the busiest read endpoints once to prime database and application caches'
+
+    def handle(self, *args, **kwargs):
+        for step, status_code, seconds in warm_up():
+            result = f' ({status_code})' if status_code else ''
+            self.stdout.write(f'{step}{result}: {seconds * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS('Warm-up complete.'))
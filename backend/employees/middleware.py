@@ -0,0 +1,126 @@
+"""
+Middleware for Employee Status Tracking System.
+"""
+import gzip
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+# API payloads only: HTML pages (admin, browsable API) carry CSRF tokens,
+# which compressing without padding would expose to BREACH, and their bodies
+# are too varied to be worth caching
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/msgpack',
+)
+
+
+def parse_accept_encoding(header):
+    """Return the set of codings the client accepts (q=0 entries excluded)."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        params = params.replace(' ', '')
+        if params.startswith('q=') and params[2:] in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+def compress_body(body, coding):
+    """Compress `body` with `coding` ('br' or 'gzip')."""
+    if coding == 'br':
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output deterministic, so cached bodies are reusable
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip compression of API responses.
+
+    Only bodies of at least COMPRESSION_MIN_SIZE bytes with a compressible
+    content type are compressed. Compressed bodies are cached under the
+    digest of the uncompressed payload, so the many dashboards polling the
+    same board version share one compression instead of paying it per request.
+
+    Under ASGI it runs as async middleware; compression and the cache lookup
+    run in a worker thread, only for responses that may be compressed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+        return await sync_to_async(self.process_response, thread_sensitive=False)(request, response)
+
+    def choose_coding(self, request):
+        """Pick the best coding the client accepts, or None."""
+        accepted = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def is_compressible(self, response):
+        """Whether `response` is eligible for compression (type, size, not encoded)."""
+        if response.streaming or response.has_header('Content-Encoding'):
+            return False
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = self.choose_coding(request)
+        if coding is None:
+            return response
+
+        body = response.content
+        cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+        key = f'compressed:{coding}:{hashlib.blake2b(body, digest_size=20).hexdigest()}'
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress_body(body, coding)
+            cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+
+        if len(compressed) >= len(body):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = coding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-18 22:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusChangeJournal',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('old_log_id', models.BigIntegerField(blank=True, null=True)),
+                ('new_log_id', models.BigIntegerField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('status_change', 'Status change'), ('employee_create', 'Employee created'), ('employee_update', 'Employee updated'), ('employee_deactivate', 'Employee deactivated'), ('employee_delete', 'Employee deleted'), ('log_update', 'Status log edited'), ('log_delete', 'Status log deleted')], max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('employee', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='employees.employee')),
+            ],
+            options={
+                'verbose_name': 'Status Change Journal Entry',
+                'verbose_name_plural': 'Status Change Journal',
+                'ordering': ['seq'],
+            },
+        ),
+    ]
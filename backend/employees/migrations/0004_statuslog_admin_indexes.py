@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 22:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_outbox_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statuslog',
+            index=models.Index(fields=['-start_time', '-id'], name='statuslog_start_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statuslog',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['planned_end_time'], name='statuslog_open_planned_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 22:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_statuslog_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='statuslog',
+            name='start_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
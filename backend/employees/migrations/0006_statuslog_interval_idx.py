@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_statuslog_start_time_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statuslog',
+            index=models.Index(fields=['start_time', 'end_time', 'status', 'planned_end_time', 'employee'], name='statuslog_interval_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-18 23:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_statuslog_interval_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='status',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='statuslog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RemoveIndex(
+            model_name='statuslog',
+            name='statuslog_interval_idx',
+        ),
+        migrations.AddIndex(
+            model_name='statuslog',
+            index=models.Index(fields=['start_time', 'end_time', 'status', 'planned_end_time', 'employee', 'updated_at'], name='statuslog_interval_idx'),
+        ),
+    ]
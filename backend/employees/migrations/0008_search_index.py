@@ -0,0 +1,103 @@
+"""
+Full-text search indexes (employees.search).
+
+SQLite: FTS5 tables over employee name/email and status log notes, with
+the tables themselves as content and triggers keeping them in sync.
+PostgreSQL: GIN indexes on the to_tsvector('simple', ...) expressions
+searched by employees.search.PostgreSQLBackend. Other databases get no
+index (employees.search.ScanBackend).
+
+The DDL is written out here rather than taken from employees.search, so
+that later changes to that module don't change what this migration does.
+"""
+from django.db import migrations
+
+SQLITE_FTS_TABLES = {
+    'employees_employee_fts': (
+        "CREATE VIRTUAL TABLE employees_employee_fts USING fts5("
+        "name, email, content='employees_employee', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ),
+    'employees_statuslog_fts': (
+        "CREATE VIRTUAL TABLE employees_statuslog_fts USING fts5("
+        "notes, content='employees_statuslog', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ),
+}
+
+SQLITE_TRIGGERS = {
+    'employees_employee_fts_insert': (
+        'CREATE TRIGGER employees_employee_fts_insert AFTER INSERT ON employees_employee BEGIN '
+        'INSERT INTO employees_employee_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END'
+    ),
+    'employees_employee_fts_delete': (
+        'CREATE TRIGGER employees_employee_fts_delete AFTER DELETE ON employees_employee BEGIN '
+        "INSERT INTO employees_employee_fts(employees_employee_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); END"
+    ),
+    'employees_employee_fts_update': (
+        'CREATE TRIGGER employees_employee_fts_update AFTER UPDATE ON employees_employee '
+        'WHEN old.name IS NOT new.name OR old.email IS NOT new.email BEGIN '
+        "INSERT INTO employees_employee_fts(employees_employee_fts, rowid, name, email) "
+        "VALUES ('delete', old.id, old.name, old.email); "
+        'INSERT INTO employees_employee_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END'
+    ),
+    'employees_statuslog_fts_insert': (
+        'CREATE TRIGGER employees_statuslog_fts_insert AFTER INSERT ON employees_statuslog BEGIN '
+        'INSERT INTO employees_statuslog_fts(rowid, notes) VALUES (new.id, new.notes); END'
+    ),
+    'employees_statuslog_fts_delete': (
+        'CREATE TRIGGER employees_statuslog_fts_delete AFTER DELETE ON employees_statuslog BEGIN '
+        "INSERT INTO employees_statuslog_fts(employees_statuslog_fts, rowid, notes) "
+        "VALUES ('delete', old.id, old.notes); END"
+    ),
+    'employees_statuslog_fts_update': (
+        'CREATE TRIGGER employees_statuslog_fts_update AFTER UPDATE ON employees_statuslog '
+        'WHEN old.notes IS NOT new.notes BEGIN '
+        "INSERT INTO employees_statuslog_fts(employees_statuslog_fts, rowid, notes) "
+        "VALUES ('delete', old.id, old.notes); "
+        'INSERT INTO employees_statuslog_fts(rowid, notes) VALUES (new.id, new.notes); END'
+    ),
+}
+
+POSTGRESQL_INDEXES = [
+    ('employee_search_idx', 'employees_employee', "coalesce(name, '') || ' ' || coalesce(email, '')"),
+    ('statuslog_notes_search_idx', 'employees_statuslog', 'notes'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in [*SQLITE_FTS_TABLES.values(), *SQLITE_TRIGGERS.values()]:
+            schema_editor.execute(sql)
+        for fts_table in SQLITE_FTS_TABLES:
+            schema_editor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    elif vendor == 'postgresql':
+        for name, table, document in POSTGRESQL_INDEXES:
+            schema_editor.execute(
+                f"CREATE INDEX {name} ON {table} USING gin (to_tsvector('simple', {document}))"
+            )
+
+
+def drop_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        for name in SQLITE_FTS_TABLES:
+            schema_editor.execute(f'DROP TABLE IF EXISTS {name}')
+    elif vendor == 'postgresql':
+        for name, _, _ in POSTGRESQL_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
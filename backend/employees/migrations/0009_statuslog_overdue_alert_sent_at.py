@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statuslog',
+            name='overdue_alert_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the overdue close alert was emailed (sent once per log)', null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 01:39
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0009_statuslog_overdue_alert_sent_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='employee',
+            options={'ordering': ['name', 'id'], 'verbose_name': 'Employee', 'verbose_name_plural': 'Employees'},
+        ),
+    ]
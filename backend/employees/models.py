@@ -15,10 +15,12 @@ class Employee(models.Model):
     email = models.EmailField(unique=True, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
-        ordering = ['name']
+        # Ties by id, so that pages are stable (and match the live board)
+        ordering = ['name', 'id']
         verbose_name = 'Employee'
         verbose_name_plural = 'Employees'
     
@@ -27,6 +29,9 @@ class Employee(models.Model):
     
     def get_current_status_log(self):
         """Get the current active status log for this employee."""
+        # Use the open log loaded by EmployeeViewSet's Prefetch when available
+        if hasattr(self, 'open_status_logs'):
+            return self.open_status_logs[0] if self.open_status_logs else None
         return self.status_logs.filter(end_time__isnull=True).first()
     
     def soft_delete(self):
@@ -54,6 +59,7 @@ class Status(models.Model):
     )
     display_order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['display_order', 'name']
@@ -78,7 +84,9 @@ class StatusLog(models.Model):
         on_delete=models.PROTECT,
         related_name='status_logs'
     )
-    start_time = models.DateTimeField(auto_now_add=True)
+    # Defaults to the creation time like auto_now_add, but can be set
+    # explicitly when loading historical logs
+    start_time = models.DateTimeField(default=timezone.now, editable=False)
     end_time = models.DateTimeField(null=True, blank=True)
     planned_end_time = models.DateTimeField(null=True, blank=True)
     overdue_duration = models.IntegerField(
@@ -92,6 +100,14 @@ class StatusLog(models.Model):
         null=True,
         blank=True
     )
+    # Part of the report cache data version: bulk UPDATEs must set it too
+    updated_at = models.DateTimeField(auto_now=True)
+    overdue_alert_sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='When the overdue close alert was emailed (sent once per log)'
+    )
     
     class Meta:
         ordering = ['-start_time']
@@ -101,17 +117,31 @@ class StatusLog(models.Model):
             models.Index(fields=['employee', '-start_time']),
             models.Index(fields=['end_time']),
             models.Index(fields=['planned_end_time']),
+            # Admin changelist order (-start_time, -pk)
+            models.Index(fields=['-start_time', '-id'], name='statuslog_start_time_idx'),
+            # Currently overdue lookups: open logs by planned end
+            models.Index(
+                fields=['planned_end_time'],
+                condition=models.Q(end_time__isnull=True),
+                name='statuslog_open_planned_idx',
+            ),
+            # Covers the interval scan of time series reports (headcount) and
+            # the report cache data version
+            models.Index(
+                fields=['start_time', 'end_time', 'status', 'planned_end_time', 'employee', 'updated_at'],
+                name='statuslog_interval_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.employee.name} - {self.status.name} ({self.start_time})"
     
-    def get_elapsed_seconds(self):
+    def get_elapsed_seconds(self, now=None):
         """Calculate elapsed time in seconds from start_time to now or end_time."""
-        end = self.end_time or timezone.now()
+        end = self.end_time or now or timezone.now()
         return int((end - self.start_time).total_seconds())
     
-    def get_remaining_seconds(self):
+    def get_remaining_seconds(self, now=None):
         """Calculate remaining time in seconds until planned_end_time."""
         if not self.planned_end_time:
             return None
@@ -119,21 +149,21 @@ class StatusLog(models.Model):
             # For ended logs, use end_time
             return int((self.planned_end_time - self.end_time).total_seconds())
         # For active logs, use current time
-        return int((self.planned_end_time - timezone.now()).total_seconds())
+        return int((self.planned_end_time - (now or timezone.now())).total_seconds())
     
-    def is_overdue(self):
+    def is_overdue(self, now=None):
         """Check if the status is overdue."""
         if not self.planned_end_time:
             return False
         if self.end_time:
             return self.end_time > self.planned_end_time
-        return timezone.now() > self.planned_end_time
+        return (now or timezone.now()) > self.planned_end_time
     
-    def get_overdue_seconds(self):
+    def get_overdue_seconds(self, now=None):
         """Calculate how many seconds overdue (negative of remaining_seconds if overdue)."""
-        if not self.is_overdue():
+        if not self.is_overdue(now):
             return 0
-        remaining = self.get_remaining_seconds()
+        remaining = self.get_remaining_seconds(now)
         return abs(remaining) if remaining is not None else 0
     
     def calculate_and_save_overdue_duration(self):
@@ -146,3 +176,90 @@ class StatusLog(models.Model):
                 self.overdue_duration = int((self.end_time - self.planned_end_time).total_seconds())
             else:
                 self.overdue_duration = 0
+
+
+class StatusChangeJournal(models.Model):
+    """
+    Append-only journal of changes to the employee board.
+    
+    Every write that can change what the board shows for an employee appends
+    a row in the same transaction. Polling clients remember the last ``seq``
+    they saw and ask only for employees changed since then.
+    """
+    KIND_STATUS_CHANGE = 'status_change'
+    KIND_EMPLOYEE_CREATE = 'employee_create'
+    KIND_EMPLOYEE_UPDATE = 'employee_update'
+    KIND_EMPLOYEE_DEACTIVATE = 'employee_deactivate'
+    KIND_EMPLOYEE_DELETE = 'employee_delete'
+    KIND_LOG_UPDATE = 'log_update'
+    KIND_LOG_DELETE = 'log_delete'
+    
+    KIND_CHOICES = [
+        (KIND_STATUS_CHANGE, 'Status change'),
+        (KIND_EMPLOYEE_CREATE, 'Employee created'),
+        (KIND_EMPLOYEE_UPDATE, 'Employee updated'),
+        (KIND_EMPLOYEE_DEACTIVATE, 'Employee deactivated'),
+        (KIND_EMPLOYEE_DELETE, 'Employee deleted'),
+        (KIND_LOG_UPDATE, 'Status log edited'),
+        (KIND_LOG_DELETE, 'Status log deleted'),
+    ]
+    
+    seq = models.BigAutoField(primary_key=True)
+    # No FK constraint: entries must outlive hard-deleted employees and logs
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    old_log_id = models.BigIntegerField(null=True, blank=True)
+    new_log_id = models.BigIntegerField(null=True, blank=True)
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['seq']
+        verbose_name = 'Status Change Journal Entry'
+        verbose_name_plural = 'Status Change Journal'
+    
+    def __str__(self):
+        return f"#{self.seq} {self.kind} (employee {self.employee_id})"
+
+
+class OutboxEvent(models.Model):
+    """
+    Transactional outbox for side effects of writes.
+    
+    Events are inserted in the same transaction as the change they describe
+    and delivered later by the ``drain_outbox`` Celery task, at least once.
+    ``completed_handlers`` lists handlers that already succeeded, so a retry
+    only re-runs the ones that failed.
+    """
+    topic = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    completed_handlers = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Set when delivery gave up after OUTBOX_MAX_ATTEMPTS'
+    )
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        indexes = [
+            models.Index(
+                fields=['available_at', 'id'],
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.topic}"
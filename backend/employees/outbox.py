@@ -0,0 +1,143 @@
+"""
+Transactional outbox: emit events with a write, deliver them asynchronously.
+
+Writers call ``emit()`` inside their transaction. The ``drain_outbox`` Celery
+task calls ``drain()``, which claims pending events in batches and runs every
+handler registered for the event's topic. A claim is a lease: the batch is
+hidden from other consumers for OUTBOX_CLAIM_SECONDS and the handlers run
+after the claim commits, outside any transaction, so slow side effects
+(SMTP, HTTP) never hold database locks. Events of a consumer that dies are
+delivered again when their lease runs out. Delivery is at least once, so
+handlers must be idempotent (the event id is a natural idempotency key).
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+TOPIC_STATUS_CHANGED = 'status.changed'
+
+_handlers = defaultdict(dict)
+
+
+def handler(topic, name=None):
+    """
+    Register a function as a handler for `topic`.
+
+    The handler is called with the OutboxEvent. `name` (default: the dotted
+    function path) identifies it in ``completed_handlers`` and must be stable.
+    """
+    def register(func):
+        _handlers[topic][name or f'{func.__module__}.{func.__qualname__}'] = func
+        return func
+    return register
+
+
+def get_handlers(topic):
+    """Return the ``{name: function}`` handlers registered for `topic`."""
+    return dict(_handlers.get(topic, {}))
+
+
+def emit(topic, payload):
+    """Add an event to the outbox. Call inside the writing transaction."""
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def retry_delay(attempts):
+    """Exponential backoff before the next delivery attempt."""
+    return timedelta(seconds=min(
+        settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.OUTBOX_RETRY_MAX_SECONDS,
+    ))
+
+
+def deliver(event):
+    """
+    Run the pending handlers of one event and record the outcome on it.
+
+    Returns True when every handler has succeeded.
+    """
+    completed = list(event.completed_handlers)
+    errors = []
+    for name, func in get_handlers(event.topic).items():
+        if name in completed:
+            continue
+        try:
+            # A failing handler's writes are rolled back
+            with transaction.atomic():
+                func(event)
+        except Exception as e:  # noqa: BLE001 - one handler must not block the others
+            logger.exception('Outbox handler %s failed for event %s', name, event.id)
+            errors.append(f'{name}: {e}')
+        else:
+            completed.append(name)
+
+    now = timezone.now()
+    event.completed_handlers = completed
+    event.attempts += 1
+    if errors:
+        event.last_error = '\n'.join(errors)
+        if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            event.failed_at = now
+        else:
+            event.available_at = now + retry_delay(event.attempts)
+    else:
+        event.last_error = ''
+        event.processed_at = now
+    event.save(update_fields=[
+        'completed_handlers', 'attempts', 'last_error', 'processed_at',
+        'failed_at', 'available_at',
+    ])
+    return not errors
+
+
+def drain(batch_size=None, max_batches=None):
+    """
+    Deliver pending events in batches of `batch_size`.
+
+    Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED (where the
+    database supports it) so several consumers can drain concurrently, and
+    leased for OUTBOX_CLAIM_SECONDS before its handlers run.
+    Returns ``(delivered, failed)`` counts.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    delivered = failed = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            now = timezone.now()
+            events = list(
+                OutboxEvent.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    processed_at__isnull=True,
+                    failed_at__isnull=True,
+                    available_at__lte=now,
+                )
+                .order_by('available_at', 'id')[:batch_size]
+            )
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).update(
+                available_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+            )
+        for event in events:
+            if deliver(event):
+                delivered += 1
+            else:
+                failed += 1
+        batches += 1
+        if len(events) < batch_size:
+            break
+
+    return delivered, failed
+
+
+def purge(before):
+    """Delete events processed before `before`. Returns the number deleted."""
+    return OutboxEvent.objects.filter(processed_at__lt=before).delete()[0]
@@ -0,0 +1,133 @@
+"""
+Bulk recompute of derived status log fields.
+
+A derived field is stored but computed from other columns of the same row,
+like ``overdue_duration`` (``StatusLog.calculate_and_save_overdue_duration()``,
+run only when a log is closed through the API). Admin edits, imports and
+rule changes leave such values stale; this recomputes them in SQL.
+
+Logs are processed in chunks of consecutive ids. Each chunk is one short
+transaction with one set-based UPDATE per field, touching only rows whose
+value differs, so it is safe while the system is live:
+
+- the new value is computed from the row as it is when the UPDATE runs, so
+  a concurrent write is never overwritten with values computed from an
+  older read;
+- ``updated_at`` is set on changed rows (the report cache keys on it) and
+  their employees are journaled, like admin edits, for delta sync clients
+  and live boards.
+
+Chunks can be spread over a process pool (``recompute(workers=N)``).
+PostgreSQL runs the UPDATEs in parallel. SQLite has a single writer and
+answers two writers upgrading their read locks at once with "database is
+locked", so there the pool is only used for dry runs.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.db import connection, connections, transaction
+from django.db.models import Case, F, IntegerField, Max, Min, Q, Value, When
+from django.utils import timezone
+
+from . import journal
+from .expressions import SecondsBetween
+from .models import StatusChangeJournal, StatusLog
+
+
+def overdue_duration():
+    """``overdue_duration`` as calculate_and_save_overdue_duration() sets it (0 when open or on time)."""
+    return Case(
+        When(end_time__gt=F('planned_end_time'), then=SecondsBetween(F('end_time'), F('planned_end_time'))),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+# Derived StatusLog fields: name -> function returning the expression computing it
+FIELDS = {
+    'overdue_duration': overdue_duration,
+}
+
+
+def chunks(chunk_size, first_id=None, last_id=None):
+    """``(low, high)`` id ranges (inclusive) of at most `chunk_size` ids covering the logs."""
+    bounds = StatusLog.objects.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    low = max(bounds['low'], first_id or bounds['low'])
+    high = min(bounds['high'], last_id or bounds['high'])
+    return [(start, min(start + chunk_size - 1, high)) for start in range(low, high + 1, chunk_size)]
+
+
+def recompute_chunk(low, high, fields, dry_run=False):
+    """
+    Recompute `fields` of the logs with ids from `low` to `high`.
+
+    Returns ``{field: rows changed}`` (rows that would change, with
+    `dry_run`).
+    """
+    changed = {}
+    logs = StatusLog.objects.filter(pk__gte=low, pk__lte=high)
+    with transaction.atomic():
+        now = timezone.now()
+        for field in fields:
+            value = FIELDS[field]()
+            stale = logs.filter(~Q(**{field: value}))
+            if dry_run:
+                changed[field] = stale.count()
+            else:
+                # Write first: on SQLite a transaction that reads before it
+                # writes can fail at once instead of waiting for the lock
+                changed[field] = stale.update(**{field: value}, updated_at=now)
+        if any(changed.values()) and not dry_run:
+            employee_ids = logs.filter(updated_at=now).values_list('employee_id', flat=True).distinct()
+            journal.record_many(StatusChangeJournal.KIND_LOG_UPDATE, sorted(employee_ids))
+    return changed
+
+
+def init_worker():
+    """Pool process initializer (processes may be spawned rather than forked)."""
+    import django
+
+    django.setup()
+
+
+def recompute(fields=None, chunk_size=10000, workers=1, dry_run=False, first_id=None, last_id=None, progress=None):
+    """
+    Recompute `fields` (default: all of FIELDS) of every log, chunk by chunk.
+
+    With `workers` > 1 chunks run in that many processes. `progress` is
+    called with ``(low, high, {field: rows changed})`` as chunks finish.
+    Returns the total ``{field: rows changed}``.
+    """
+    fields = list(fields or FIELDS)
+    unknown = set(fields) - FIELDS.keys()
+    if unknown:
+        raise ValueError(f'Unknown derived fields: {", ".join(sorted(unknown))}')
+
+    totals = dict.fromkeys(fields, 0)
+
+    def add(low, high, changed):
+        for field, count in changed.items():
+            totals[field] += count
+        if progress is not None:
+            progress(low, high, changed)
+
+    ranges = chunks(chunk_size, first_id, last_id)
+    if connection.vendor == 'sqlite' and not dry_run:
+        workers = 1
+    if workers <= 1 or len(ranges) <= 1:
+        for low, high in ranges:
+            add(low, high, recompute_chunk(low, high, fields, dry_run))
+        return totals
+
+    # Forked processes must open their own connections, not share the parent's
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), initializer=init_worker) as pool:
+        futures = {
+            pool.submit(recompute_chunk, low, high, fields, dry_run): (low, high)
+            for low, high in ranges
+        }
+        for future in as_completed(futures):
+            add(*futures[future], future.result())
+    return totals
+
@@ -0,0 +1,101 @@
+"""
+Renderers for Employee Status Tracking System API.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+
+from .reports import EXCEL_CONTENT_TYPE
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed.
+
+    Output is byte-identical to DRF's JSONRenderer for compact responses:
+    datetimes and other non-native types go through DRF's encoder and the
+    \\u2028/\\u2029 escaping is preserved. Indented output and anything orjson
+    refuses (e.g. integers wider than 64 bits) fall back to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, like JSONRenderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+
+    Datetimes and other non-native types are encoded the same way as in the
+    JSON responses (ISO 8601 strings), so clients decode identical structures.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = JSONRenderer.encoder_class
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into MessagePack, returning a bytestring."""
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
+
+
+class ExcelRenderer(BaseRenderer):
+    """
+    Renderer for spreadsheet downloads (``?format=xlsx``).
+
+    The view builds the workbook itself and responds with its bytes; any
+    other data (validation errors, authentication failures) is sent as JSON.
+    """
+    media_type = EXCEL_CONTENT_TYPE
+    format = 'xlsx'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Pass workbook bytes through; render anything else as JSON."""
+        if isinstance(data, bytes):
+            return data
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return JSONRenderer().render(data)
+
+
+def api_renderer_classes():
+    """Renderers for the employees API: the defaults plus MessagePack when installed."""
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES)
+    if msgpack is not None:
+        renderer_classes.append(MessagePackRenderer)
+    return renderer_classes
@@ -0,0 +1,189 @@
+"""
+Report artifact cache.
+
+Generated report files are stored on local disk under a key made of the
+normalized filters and a data version of the rows they cover, so a report
+is rebuilt only when its data changed. Reports that include open logs
+depend on the current time and are never cached. The directory is bounded
+by REPORT_CACHE_MAX_BYTES, evicting the least recently used files first.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from . import report_shards, reports
+from .models import Employee, Status
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of generated reports changes
+FORMAT_VERSION = 1
+
+HIT = 'hit'
+MISS = 'miss'
+BYPASS = 'bypass'
+
+
+def data_version(logs):
+    """
+    Data version of the rows a report covers, or None if it can't be cached.
+
+    New, changed and deleted logs change the row count, highest id or latest
+    ``updated_at``; renamed employees and statuses change their table's
+    latest ``updated_at``.
+    """
+    version = logs.order_by().aggregate(
+        rows=Count('id'),
+        last_id=Max('id'),
+        changed=Max('updated_at'),
+        open_rows=Count('id', filter=Q(end_time__isnull=True)),
+    )
+    if version.pop('open_rows'):
+        return None
+    version['employees_changed'] = Employee.objects.aggregate(at=Max('updated_at'))['at']
+    version['statuses_changed'] = Status.objects.aggregate(at=Max('updated_at'))['at']
+    return version
+
+
+def _key_default(value):
+    # The same instant must hash the same in any timezone
+    if isinstance(value, datetime):
+        return value.astimezone(dt_timezone.utc).isoformat()
+    return str(value)
+
+
+def cache_key(kind, filters, version):
+    """Stable hash of the report kind, normalized filters and data version."""
+    payload = json.dumps(
+        {'kind': kind, 'format': FORMAT_VERSION, 'filters': filters, 'version': version},
+        sort_keys=True,
+        default=_key_default,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_path(key, suffix):
+    """Location of the cached file for `key`."""
+    return os.path.join(settings.REPORT_CACHE_DIR, f'{key}{suffix}')
+
+
+def read(path):
+    """Return the cached file's bytes (marking it recently used), or None."""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return content
+
+
+def write(path, content):
+    """Store a file atomically, then enforce the size bound."""
+    os.makedirs(settings.REPORT_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.REPORT_CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    evict()
+
+
+def evict(max_bytes=None):
+    """
+    Delete least recently used files until the cache fits in `max_bytes`.
+
+    Returns the number of deleted files.
+    """
+    max_bytes = settings.REPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(settings.REPORT_CACHE_DIR)
+            if entry.is_file() and not entry.name.endswith('.tmp')
+        ]
+    except FileNotFoundError:
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # evicted concurrently
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def excel(filters, workers=1):
+    """
+    Return ``(content, state)`` for the Excel report of `filters`.
+
+    `filters` must be normalized (see ReportFilterSerializer); `state` is
+    HIT, MISS or BYPASS (not cacheable). A report built with `workers` > 1
+    may be rendered by a process pool (report_shards.build): background
+    jobs only.
+    """
+    logs = reports.report_logs(filters)
+    version = data_version(logs)
+    if version is None:
+        return report_shards.build(filters, logs, workers=workers), BYPASS
+
+    path = cache_path(cache_key('excel', filters, version), '.xlsx')
+    content = read(path)
+    if content is not None:
+        return content, HIT
+
+    content = report_shards.build(filters, logs, rows=version['rows'], workers=workers)
+    try:
+        write(path, content)
+    except OSError:
+        logger.exception('Could not store report %s', path)
+    return content, MISS
+
+
+def monthly_filters(year, month):
+    """Filters of the standard monthly report: every log started in the month."""
+    tz = timezone.get_current_timezone()
+    start = datetime(year, month, 1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return {
+        'employee_id': None,
+        'status_id': None,
+        'start_date': timezone.make_aware(start, tz),
+        'end_date': timezone.make_aware(datetime.combine(next_month - timedelta(days=1), time.max), tz),
+    }
+
+
+def prewarm_monthly(months, today=None, workers=1):
+    """
+    Build the standard reports of the last `months` complete months, over
+    `workers` processes (see excel()).
+
+    Returns ``{(year, month): state}``.
+    """
+    today = today or timezone.localdate()
+    first = today.replace(day=1)
+    states = {}
+    for _ in range(months):
+        first = (first - timedelta(days=1)).replace(day=1)
+        _, state = excel(monthly_filters(first.year, first.month), workers=workers)
+        states[(first.year, first.month)] = state
+    return states
@@ -0,0 +1,193 @@
+"""
+Sharded generation of large Excel reports.
+
+Building a report is CPU bound: loading the logs, formatting each row and
+serializing its cells to XML. Large reports are therefore split by start
+time into shards, newest first, rendered by a process pool:
+
+- the rows of each shard are counted up front, so every shard knows the
+  sheet row it starts at. The report is pinned to the logs that existed
+  then (ids up to the highest counted) and no shard writes more rows than
+  it counted, so logs saved while it renders can't shift its rows;
+- each worker queries its shard and writes the ``<row>`` elements of the
+  sheet, as openpyxl would, to a temporary file, and returns it with the
+  longest value of each column;
+- the parent saves a workbook with only the header row and the column
+  widths, then splices the shards into its sheet in order.
+
+The file has the same cells and column widths as reports.build_excel()
+writes. Only background jobs use the pool (the prewarm_monthly_reports task,
+REPORT_WORKERS processes): starting one closes the caller's database
+connections and forks it, which a request must not do. Reports of fewer
+than REPORT_SHARD_MIN_ROWS rows are never sharded.
+"""
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import billiard
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from . import reports
+
+# More shards than workers evens out time ranges busier than others
+SHARDS_PER_WORKER = 4
+
+SHEET = 'xl/worksheets/sheet1.xml'
+COLUMNS = 'ABCDEFGH'
+DIMENSION = re.compile(rb'<dimension ref="[^"]*"')
+
+# Characters XML can't carry (openpyxl refuses them)
+ILLEGAL_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def start_time_range(low, high):
+    """Filter for logs started from `low` (inclusive) to `high` (exclusive); None: unbounded."""
+    q = Q()
+    if low is not None:
+        q &= Q(start_time__gte=low)
+    if high is not None:
+        q &= Q(start_time__lt=high)
+    return q
+
+
+def shards(logs, count):
+    """
+    Split `logs` into up to `count` start time ranges of equal length.
+
+    Returns ``(low, high, rows)`` newest first, without empty ranges.
+    """
+    bounds = logs.order_by().aggregate(first=Min('start_time'), last=Max('start_time'))
+    if bounds['first'] is None:
+        return []
+    step = (bounds['last'] - bounds['first']) / count
+    cuts = sorted({bounds['first'] + step * i for i in range(1, count)}, reverse=True)
+    edges = [None, *cuts, None]
+    ranges = [(edges[i + 1], edges[i]) for i in range(len(edges) - 1)]
+    rows = logs.order_by().aggregate(**{
+        str(i): Count('id', filter=start_time_range(low, high)) for i, (low, high) in enumerate(ranges)
+    })
+    return [(low, high, rows[str(i)]) for i, (low, high) in enumerate(ranges) if rows[str(i)]]
+
+
+def cell_xml(ref, value):
+    """``<c>`` element of a cell, as openpyxl writes it."""
+    if not isinstance(value, str):
+        return f'<c r="{ref}" t="n"><v>{value:.16g}</v></c>'
+    if not value:
+        return f'<c r="{ref}" t="inlineStr" />'
+    text = escape(ILLEGAL_CHARACTERS.sub('', value))
+    space = ' xml:space="preserve"' if value.strip() and value.strip() != value else ''
+    return f'<c r="{ref}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def render_shard(filters, low, high, last_id, first_row, rows, now):
+    """
+    Write the sheet rows of the logs of `filters` started in ``[low, high)``.
+
+    Only logs with ids up to `last_id` are included, at most `rows` of
+    them, numbered from `first_row`. Returns ``(path, lengths)``: the
+    temporary file holding the ``<row>`` elements and the length of the
+    longest value of each column.
+    """
+    logs = reports.report_logs(filters).filter(start_time_range(low, high), pk__lte=last_id)[:rows]
+    lengths = [0] * len(COLUMNS)
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for row_num, log in enumerate(logs.iterator(chunk_size=2000), first_row):
+            cells = []
+            for column, value in enumerate(reports.report_row(log, now)):
+                lengths[column] = max(lengths[column], len(str(value)))
+                cells.append(cell_xml(f'{COLUMNS[column]}{row_num}', value))
+            f.write(f'<row r="{row_num}">{"".join(cells)}</row>')
+    return path, lengths
+
+
+def splice(template, paths, last_row, output):
+    """Write `template` to `output` with the rows in `paths` added to its sheet, in order."""
+    rows_size = sum(os.path.getsize(path) for path in paths)
+    with zipfile.ZipFile(BytesIO(template)) as source, zipfile.ZipFile(output, 'w') as target:
+        for item in source.infolist():
+            data = source.read(item)
+            if item.filename != SHEET:
+                target.writestr(item, data)
+                continue
+            head, tail = data.split(b'</sheetData>')
+            head = DIMENSION.sub(f'<dimension ref="A1:{COLUMNS[-1]}{last_row}"'.encode(), head, count=1)
+            with target.open(item, 'w', force_zip64=len(data) + rows_size > zipfile.ZIP64_LIMIT) as sheet:
+                sheet.write(head)
+                for path in paths:
+                    with open(path, 'rb') as rows:
+                        shutil.copyfileobj(rows, sheet, 1024 * 1024)
+                sheet.write(b'</sheetData>' + tail)
+
+
+def build_excel(filters, workers, now=None):
+    """
+    Render the report of `filters` in shards over `workers` processes.
+
+    With one worker the shards are rendered in this process. Returns the
+    workbook as bytes. More workers close this process's database
+    connections: not for use in a request or a transaction.
+    """
+    now = now or timezone.now()
+    logs = reports.report_logs(filters)
+    last_id = logs.order_by().aggregate(last_id=Max('id'))['last_id']
+    ranges = shards(logs.filter(pk__lte=last_id), workers * SHARDS_PER_WORKER) if last_id else []
+    jobs = []
+    first_row = 2
+    for low, high, rows in ranges:
+        jobs.append((filters, low, high, last_id, first_row, rows, now))
+        first_row += rows
+
+    results = []
+    try:
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                results.append(render_shard(*job))
+        else:
+            # Forked processes must open their own connections, not share the parent's
+            connections.close_all()
+            import django
+
+            # billiard (Celery's multiprocessing) also starts pools from the
+            # daemon processes of Celery's prefork workers
+            with billiard.Pool(min(workers, len(jobs)), initializer=django.setup) as pool:
+                # In shard order
+                results.extend(pool.starmap(render_shard, jobs))
+
+        wb = reports.new_workbook()
+        ws = wb.active
+        for column, header in enumerate(reports.HEADERS):
+            longest = max([len(header), *(lengths[column] for _, lengths in results)])
+            ws.column_dimensions[COLUMNS[column]].width = reports.column_width(longest)
+        template = BytesIO()
+        wb.save(template)
+
+        output = BytesIO()
+        splice(template.getvalue(), [path for path, _ in results], first_row - 1, output)
+        return output.getvalue()
+    finally:
+        for path, _ in results:
+            os.unlink(path)
+
+
+def build(filters, logs, rows=None, workers=1):
+    """
+    Workbook bytes of the report of `filters` (whose logs are `logs`).
+
+    Sharded over `workers` processes if more than one and the report has
+    at least REPORT_SHARD_MIN_ROWS `rows` (counted if not given).
+    """
+    if workers > 1:
+        rows = logs.count() if rows is None else rows
+        if rows >= settings.REPORT_SHARD_MIN_ROWS:
+            return build_excel(filters, workers)
+    return reports.build_excel(logs)
@@ -0,0 +1,121 @@
+"""
+Report generation for Employee Status Tracking System.
+"""
+from io import BytesIO
+
+from django.utils import timezone
+
+from .models import StatusLog
+
+EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+FILTER_FIELDS = ('employee_id', 'status_id', 'start_date', 'end_date')
+
+
+def report_logs(filters):
+    """
+    Status logs matching the report filters, newest first (ties by id, so
+    shards of a report come back in the same order).
+
+    `filters` maps FILTER_FIELDS to values (None or missing: no filter).
+    """
+    logs = StatusLog.objects.select_related('employee', 'status', 'created_by')
+
+    if filters.get('employee_id'):
+        logs = logs.filter(employee_id=filters['employee_id'])
+    if filters.get('status_id'):
+        logs = logs.filter(status_id=filters['status_id'])
+    if filters.get('start_date'):
+        logs = logs.filter(start_time__gte=filters['start_date'])
+    if filters.get('end_date'):
+        logs = logs.filter(start_time__lte=filters['end_date'])
+
+    return logs.order_by('-start_time', '-id')
+
+
+HEADERS = [
+    'Employee', 'Status', 'Start Time', 'End Time',
+    'Planned End', 'Duration (hours)', 'Overdue (hours)', 'Notes'
+]
+
+
+def report_row(log, now):
+    """The cell values of a log's report row."""
+    # Calculate duration
+    if log.end_time:
+        duration_hours = (log.end_time - log.start_time).total_seconds() / 3600
+    else:
+        duration_hours = (now - log.start_time).total_seconds() / 3600
+
+    # Overdue duration
+    overdue_hours = log.overdue_duration / 3600
+
+    return [
+        log.employee.name,
+        log.status.name,
+        log.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+        log.end_time.strftime('%Y-%m-%d %H:%M:%S') if log.end_time else 'Active',
+        log.planned_end_time.strftime('%Y-%m-%d %H:%M:%S') if log.planned_end_time else 'N/A',
+        round(duration_hours, 2),
+        round(overdue_hours, 2) if overdue_hours > 0 else 0,
+        log.notes,
+    ]
+
+
+def column_width(max_length):
+    """Width of a column whose longest value has `max_length` characters."""
+    return min(max_length + 2, 50)
+
+
+def new_workbook():
+    """A workbook with the report sheet and its header row."""
+    # Imported here: openpyxl is slow to import and only reports need it
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    # Create Excel workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Status Report"
+
+    # Style headers
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+
+    for col_num, header in enumerate(HEADERS, 1):
+        cell = ws.cell(row=1, column=col_num)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    return wb
+
+
+def build_excel(logs, now=None):
+    """Render status logs into an Excel workbook, returned as bytes."""
+    now = now or timezone.now()
+
+    wb = new_workbook()
+    ws = wb.active
+
+    # Add data rows
+    for row_num, log in enumerate(logs, 2):
+        for col_num, value in enumerate(report_row(log, now), 1):
+            ws.cell(row=row_num, column=col_num).value = value
+
+    # Auto-size columns
+    for column in ws.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+        ws.column_dimensions[column_letter].width = column_width(max_length)
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
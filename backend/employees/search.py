@@ -0,0 +1,242 @@
+"""
+Full-text search over employee names/emails and status log notes.
+
+A search term is split into words (letters and digits); a match must
+contain every word, each as the start of a word, so "eng fail" finds
+"Engine failure". Backends:
+
+- ``SQLiteFTS5Backend``: FTS5 tables with the content of the employee and
+  status log tables, kept in sync by triggers, so every write (saves, bulk
+  inserts, ``.update()``, deletes) updates the index in its own
+  transaction. Migrations that rebuild a table drop its triggers, so they
+  are recreated (and the index rebuilt) after every ``migrate``;
+- ``PostgreSQLBackend``: GIN indexes on ``to_tsvector('simple', ...)``
+  expressions, which PostgreSQL maintains itself;
+- ``ScanBackend``: ``icontains`` scans (any substring), for other databases.
+
+SEARCH_BACKEND names a backend class by dotted path; by default it follows
+the database vendor.
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import BaseFilterBackend
+
+from .models import StatusLog
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r'\w+')
+
+# Words of a search term used (the rest are ignored)
+MAX_WORDS = 8
+
+EMPLOYEE_FTS_TABLE = 'employees_employee_fts'
+STATUS_LOG_FTS_TABLE = 'employees_statuslog_fts'
+
+# FTS5 tables: (FTS table, content table, indexed columns)
+SQLITE_INDEXES = [
+    (EMPLOYEE_FTS_TABLE, 'employees_employee', ['name', 'email']),
+    (STATUS_LOG_FTS_TABLE, 'employees_statuslog', ['notes']),
+]
+SQLITE_TOKENIZE = "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+
+
+def words(term):
+    """The words of a search term, lowercased."""
+    return WORD.findall(term.lower())[:MAX_WORDS]
+
+
+class ScanBackend:
+    """Search with ``icontains`` filters: no index, a scan per search."""
+
+    def filter_employees(self, queryset, term):
+        """Employees of `queryset` matching `term`."""
+        terms = words(term)
+        if not terms:
+            return queryset.none()
+        for word in terms:
+            queryset = queryset.filter(Q(name__icontains=word) | Q(email__icontains=word))
+        return queryset
+
+    def filter_logs(self, queryset, term):
+        """Status logs of `queryset` whose notes match `term`."""
+        terms = words(term)
+        if not terms:
+            return queryset.none()
+        for word in terms:
+            queryset = queryset.filter(notes__icontains=word)
+        return queryset
+
+    def log_ids(self, term, limit, before=None):
+        """Ids of up to `limit` logs matching `term`, newest (highest id) first, below `before`."""
+        logs = self.filter_logs(StatusLog.objects.all(), term)
+        if before is not None:
+            logs = logs.filter(pk__lt=before)
+        return list(logs.order_by('-pk').values_list('pk', flat=True)[:limit])
+
+
+class SQLiteFTS5Backend(ScanBackend):
+    """Search the FTS5 tables (rowid = primary key of the indexed row)."""
+
+    def match(self, term):
+        """FTS5 query of `term`: every word as a prefix (words never need quoting)."""
+        return ' '.join(f'"{word}"*' for word in words(term))
+
+    def matching_ids(self, table, term):
+        return RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [self.match(term)])
+
+    def filter_employees(self, queryset, term):
+        if not words(term):
+            return queryset.none()
+        return queryset.filter(pk__in=self.matching_ids(EMPLOYEE_FTS_TABLE, term))
+
+    def filter_logs(self, queryset, term):
+        if not words(term):
+            return queryset.none()
+        return queryset.filter(pk__in=self.matching_ids(STATUS_LOG_FTS_TABLE, term))
+
+    def log_ids(self, term, limit, before=None):
+        if not words(term):
+            return []
+        # FTS5 walks its index in rowid order, so this stops after `limit` matches
+        sql = f'SELECT rowid FROM {STATUS_LOG_FTS_TABLE} WHERE {STATUS_LOG_FTS_TABLE} MATCH %s'
+        params = [self.match(term)]
+        if before is not None:
+            sql += ' AND rowid < %s'
+            params.append(before)
+        sql += ' ORDER BY rowid DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [pk for pk, in cursor.fetchall()]
+
+
+class PostgreSQLBackend(ScanBackend):
+    """Search the ``to_tsvector('simple', ...)`` GIN indexes (migration 0008)."""
+
+    EMPLOYEE_DOCUMENT = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, ''))"
+    STATUS_LOG_DOCUMENT = "to_tsvector('simple', notes)"
+
+    def match(self, term):
+        """tsquery of `term`: every word as a prefix."""
+        return ' & '.join(f'{word}:*' for word in words(term))
+
+    def matching_ids(self, table, document, term):
+        return RawSQL(
+            f"SELECT id FROM {table} WHERE {document} @@ to_tsquery('simple', %s)",
+            [self.match(term)],
+        )
+
+    def filter_employees(self, queryset, term):
+        if not words(term):
+            return queryset.none()
+        return queryset.filter(pk__in=self.matching_ids('employees_employee', self.EMPLOYEE_DOCUMENT, term))
+
+    def filter_logs(self, queryset, term):
+        if not words(term):
+            return queryset.none()
+        return queryset.filter(pk__in=self.matching_ids('employees_statuslog', self.STATUS_LOG_DOCUMENT, term))
+
+
+def sqlite_index_statements(fts_table, table, columns):
+    """``{name: SQL}`` creating the FTS table of `table` and its triggers."""
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)
+    insert = f'INSERT INTO {fts_table}(rowid, {names}) VALUES (new.id, {new});'
+    delete = f"INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    return {
+        fts_table: (
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+            f"{names}, content='{table}', content_rowid='id', {SQLITE_TOKENIZE})"
+        ),
+        f'{fts_table}_insert': f'CREATE TRIGGER {fts_table}_insert AFTER INSERT ON {table} BEGIN {insert} END',
+        f'{fts_table}_delete': f'CREATE TRIGGER {fts_table}_delete AFTER DELETE ON {table} BEGIN {delete} END',
+        f'{fts_table}_update': (
+            f'CREATE TRIGGER {fts_table}_update AFTER UPDATE ON {table} WHEN {changed} '
+            f'BEGIN {delete} {insert} END'
+        ),
+    }
+
+
+def install_sqlite_indexes(connection):
+    """
+    Create missing FTS5 tables and triggers on a SQLite `connection`.
+
+    An index with anything missing is rebuilt from its content table.
+    Returns the names of the rebuilt FTS tables.
+    """
+    rebuilt = []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {name for name, in cursor.fetchall()}
+        for fts_table, table, columns in SQLITE_INDEXES:
+            if table not in existing:
+                continue
+            statements = sqlite_index_statements(fts_table, table, columns)
+            missing = [name for name in statements if name not in existing]
+            if not missing:
+                continue
+            for name in missing:
+                cursor.execute(statements[name])
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            rebuilt.append(fts_table)
+    return rebuilt
+
+
+def drop_sqlite_indexes(connection):
+    """Drop the FTS5 tables and their triggers."""
+    with connection.cursor() as cursor:
+        for fts_table, table, columns in SQLITE_INDEXES:
+            for name in sqlite_index_statements(fts_table, table, columns):
+                kind = 'TABLE' if name == fts_table else 'TRIGGER'
+                cursor.execute(f'DROP {kind} IF EXISTS {name}')
+
+
+def ensure_index(sender, using, **kwargs):
+    """post_migrate: recreate triggers dropped by table rebuilds (SQLite)."""
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    # Not before the migration that adds the index (or after it was reverted)
+    if ('employees', '0008_search_index') not in MigrationRecorder(connection).applied_migrations():
+        return
+    for fts_table in install_sqlite_indexes(connection):
+        logger.warning('Rebuilt search index %s: the table or its triggers were missing', fts_table)
+
+
+VENDOR_BACKENDS = {
+    'sqlite': 'employees.search.SQLiteFTS5Backend',
+    'postgresql': 'employees.search.PostgreSQLBackend',
+}
+
+
+def backend():
+    """The configured search backend."""
+    path = settings.SEARCH_BACKEND or VENDOR_BACKENDS.get(connection.vendor, 'employees.search.ScanBackend')
+    return import_string(path)()
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Filter a view's employees by ``?search=`` through the search backend."""
+
+    search_param = 'search'
+
+    def get_search_term(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+        return backend().filter_employees(queryset, term)
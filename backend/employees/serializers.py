@@ -2,10 +2,29 @@
 Serializers for Employee Status Tracking System API.
 """
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601
 from django.utils import timezone
 from .models import Employee, Status, StatusLog
 
 
+class DynamicFieldsMixin:
+    """
+    Restrict serializer output to a subset of fields.
+
+    Pass ``fields`` (an iterable of field names) to the constructor; unknown
+    names are ignored so clients can't trigger errors with a typo.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            allowed = set(fields)
+            for field_name in set(self.fields) - allowed:
+                self.fields.pop(field_name)
+
+
 class StatusSerializer(serializers.ModelSerializer):
     """Serializer for Status model."""
     
@@ -33,24 +52,31 @@ class CurrentStatusSerializer(serializers.ModelSerializer):
             'is_overdue', 'overdue_seconds', 'notes'
         ]
     
+    def get_now(self):
+        """Reference time shared by all rows (taken from context when given)."""
+        now = self.context.get('now')
+        if now is None:
+            now = self.context['now'] = timezone.now()
+        return now
+    
     def get_elapsed_seconds(self, obj):
         """Get elapsed time in seconds."""
-        return obj.get_elapsed_seconds()
+        return obj.get_elapsed_seconds(self.get_now())
     
     def get_remaining_seconds(self, obj):
         """Get remaining time in seconds (can be negative if overdue)."""
-        return obj.get_remaining_seconds()
+        return obj.get_remaining_seconds(self.get_now())
     
     def get_is_overdue(self, obj):
         """Check if status is overdue."""
-        return obj.is_overdue()
+        return obj.is_overdue(self.get_now())
     
     def get_overdue_seconds(self, obj):
         """Get overdue duration in seconds."""
-        return obj.get_overdue_seconds()
+        return obj.get_overdue_seconds(self.get_now())
 
 
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for employee list with current status."""
     
     current_status = serializers.SerializerMethodField()
@@ -63,10 +89,44 @@ class EmployeeListSerializer(serializers.ModelSerializer):
         """Get current active status log."""
         current_log = obj.get_current_status_log()
         if current_log:
-            return CurrentStatusSerializer(current_log).data
+            return CurrentStatusSerializer(current_log, context=self.context).data
         return None
 
 
+COMPACT_DATETIME_FIELD = serializers.DateTimeField()
+
+
+class CompactEmployeeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Employee row for the compact board representation."""
+    
+    current_status = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Employee
+        fields = ['id', 'name', 'email', 'current_status', 'is_active']
+    
+    def get_current_status(self, obj):
+        """
+        Get current active status log without derived fields.
+        
+        Status name/color live in the response-level ``statuses`` dictionary and
+        elapsed/remaining times are left to the client, which computes them from
+        ``start_time``/``planned_end_time`` and the response ``server_time``.
+        Built as a plain dict, without a nested serializer per row.
+        """
+        current_log = obj.get_current_status_log()
+        if not current_log:
+            return None
+        to_representation = COMPACT_DATETIME_FIELD.to_representation
+        return {
+            'id': current_log.id,
+            'status_id': current_log.status_id,
+            'start_time': to_representation(current_log.start_time),
+            'planned_end_time': to_representation(current_log.planned_end_time),
+            'notes': current_log.notes,
+        }
+
+
 class EmployeeDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for employee with current status."""
     
@@ -81,10 +141,32 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
         """Get current active status log."""
         current_log = obj.get_current_status_log()
         if current_log:
-            return CurrentStatusSerializer(current_log).data
+            return CurrentStatusSerializer(current_log, context=self.context).data
         return None
 
 
+class BulkEmployeeSerializer(serializers.Serializer):
+    """
+    One item of a bulk create/update request.
+
+    Email uniqueness is checked for the whole batch at once by
+    ``employees.bulk``, not per item. Blank emails are stored as null.
+    """
+
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=100)
+    email = serializers.EmailField(required=False, allow_null=True, allow_blank=True)
+
+    def validate_email(self, value):
+        return value or None
+
+
+class BulkDeactivateSerializer(serializers.Serializer):
+    """Employee ids to deactivate in bulk."""
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
 class StatusLogSerializer(serializers.ModelSerializer):
     """Serializer for status log history."""
     
@@ -107,7 +189,7 @@ class StatusLogSerializer(serializers.ModelSerializer):
         if obj.end_time:
             return int((obj.end_time - obj.start_time).total_seconds())
         # For active logs, calculate from start_time to now
-        return obj.get_elapsed_seconds()
+        return obj.get_elapsed_seconds(self.context.get('now'))
 
 
 class ChangeStatusSerializer(serializers.Serializer):
@@ -156,3 +238,26 @@ class EmployeeStatisticsSerializer(serializers.Serializer):
     total_seconds = serializers.IntegerField()
     count = serializers.IntegerField()
     total_overdue_seconds = serializers.IntegerField()
+
+
+class ReportFilterSerializer(serializers.Serializer):
+    """
+    Filters of the Excel report.
+    
+    Dates may be ISO 8601 datetimes or plain dates (midnight, current
+    timezone), so equal filters normalize to equal values for the report cache.
+    """
+    employee_id = serializers.IntegerField(required=False, allow_null=True)
+    status_id = serializers.IntegerField(required=False, allow_null=True)
+    start_date = serializers.DateTimeField(
+        required=False, allow_null=True, input_formats=[ISO_8601, '%Y-%m-%d']
+    )
+    end_date = serializers.DateTimeField(
+        required=False, allow_null=True, input_formats=[ISO_8601, '%Y-%m-%d']
+    )
+    
+    def to_internal_value(self, data):
+        """Treat empty values as "no filter", like unset ones."""
+        data = {key: value for key, value in data.items() if value not in (None, '')}
+        values = super().to_internal_value(data)
+        return {name: values.get(name) for name in self.fields}
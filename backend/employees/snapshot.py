@@ -0,0 +1,60 @@
+"""
+Point-in-time board snapshots: which status every employee was in at time T.
+
+The log active at T is the employee's latest log with ``start_time <= T``,
+provided it had not ended by T. Both lookups are index-driven: a correlated
+subquery walks the ``(employee, -start_time)`` index once per employee, and
+the matching logs are then fetched by primary key.
+"""
+from django.db.models import OuterRef, Q, Subquery
+
+from .models import Employee, StatusLog
+
+
+def employees_at(at, queryset=None):
+    """
+    Employees on the board at `at`, annotated with ``snapshot_log_id``.
+
+    An employee counts when they existed at `at` (or already had a log then,
+    e.g. imported history) and had not been deleted or deactivated before it.
+    ``snapshot_log_id`` is the latest log started by `at`, which may have
+    ended before it; ``logs_at()`` applies the end time check.
+    """
+    if queryset is None:
+        queryset = Employee.objects.all()
+
+    latest_log = (
+        StatusLog.objects
+        .filter(employee=OuterRef('pk'), start_time__lte=at)
+        .order_by('-start_time')
+        .values('id')[:1]
+    )
+    return (
+        queryset
+        .filter(Q(deleted_at__gt=at) | Q(deleted_at__isnull=True, is_active=True))
+        .annotate(snapshot_log_id=Subquery(latest_log))
+        .filter(Q(created_at__lte=at) | Q(snapshot_log_id__isnull=False))
+    )
+
+
+def active_logs_at(at, log_ids):
+    """The logs among `log_ids` (``snapshot_log_id`` values) still open at `at`."""
+    return StatusLog.objects.filter(pk__in=log_ids).filter(
+        Q(end_time__isnull=True) | Q(end_time__gt=at)
+    )
+
+
+def logs_at(at, employees):
+    """
+    Map employee id -> the StatusLog active at `at`, for `employees`.
+
+    `employees` must come from ``employees_at()``. Logs are returned as they
+    looked at `at`: still open, so their derived fields (elapsed, remaining,
+    overdue) can be computed against `at` like for the live board.
+    """
+    log_ids = [employee.snapshot_log_id for employee in employees if employee.snapshot_log_id]
+    active = {}
+    for log in active_logs_at(at, log_ids).select_related('status'):
+        log.end_time = None
+        active[log.employee_id] = log
+    return active
@@ -0,0 +1,14 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    // Apply an autocomplete list filter as soon as a value is picked or cleared
+    $(document).on('change', 'select.autocomplete-list-filter', function() {
+        const base = this.dataset.baseQuery || '?';
+        const separator = base === '?' ? '' : '&';
+        const value = $(this).val();
+        window.location.search = value
+            ? `${base}${separator}${encodeURIComponent(this.dataset.parameterName)}=${encodeURIComponent(value)}`
+            : base;
+    });
+}
@@ -5,6 +5,7 @@ from celery import shared_task
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
+from . import journal, outbox, recompute, report_cache
 from .models import StatusLog, Employee
 
 
@@ -125,3 +126,66 @@ def cleanup_old_logs():
     # old_logs.delete()
     
     return f"Found {count} logs older than 2 years (not deleted, just counted)."
+
+
+@shared_task
+def compact_status_journal():
+    """
+    Prune status change journal entries older than the retention window.
+    Clients whose version falls into the pruned range get a resync signal.
+    """
+    from datetime import timedelta
+    
+    cutoff_date = timezone.now() - timedelta(days=settings.STATUS_JOURNAL_RETENTION_DAYS)
+    deleted = journal.compact(cutoff_date)
+    
+    return f"Pruned {deleted} journal entries older than {settings.STATUS_JOURNAL_RETENTION_DAYS} days."
+
+
+@shared_task
+def drain_outbox():
+    """
+    Deliver pending outbox events to their handlers in batches.
+    Scheduled every few seconds by Celery beat; safe to run concurrently.
+    """
+    delivered, failed = outbox.drain()
+    return f"Delivered {delivered} outbox events, {failed} failed."
+
+
+@shared_task
+def purge_outbox():
+    """
+    Delete delivered outbox events older than the retention window.
+    """
+    from datetime import timedelta
+    
+    cutoff_date = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    deleted = outbox.purge(cutoff_date)
+    
+    return f"Purged {deleted} delivered outbox events."
+
+
+@shared_task
+def prewarm_monthly_reports():
+    """
+    Build the standard monthly reports of recent months into the report cache.
+    Scheduled nightly; months whose data is unchanged are cache hits. Large
+    reports are rendered in shards by REPORT_WORKERS processes.
+    """
+    states = report_cache.prewarm_monthly(settings.REPORT_PREWARM_MONTHS, workers=settings.REPORT_WORKERS)
+    built = sum(1 for state in states.values() if state == report_cache.MISS)
+    
+    return f"Prewarmed {len(states)} monthly reports ({built} rebuilt)."
+
+
+@shared_task
+def recompute_derived_fields(fields=None, first_id=None, last_id=None):
+    """
+    Recompute derived status log fields (e.g. overdue_duration) in bulk.
+    Runs in the worker process: prefork workers can't start a process pool,
+    use the recompute_derived_fields command with --workers for that.
+    """
+    totals = recompute.recompute(fields=fields, first_id=first_id, last_id=last_id)
+    summary = ', '.join(f'{count} {field}' for field, count in totals.items())
+    
+    return f"Recomputed derived fields: {summary} rows changed."
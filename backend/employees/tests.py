@@ -1,14 +1,46 @@
 """
 Tests for Employee Status Tracking System.
 """
-from django.test import TestCase
+import gzip
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from types import ModuleType
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
+from django.urls import include, path
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
 
-from .models import Employee, Status, StatusLog
+from . import fastpath, journal, live_board, log_integrity, outbox, recompute, report_cache, report_shards, reports, search, urls
+from .models import Employee, Status, StatusLog, StatusChangeJournal, OutboxEvent
+from .renderers import FastJSONRenderer
+from .serializers import EmployeeListSerializer, StatusLogSerializer
+from .throttling import TokenBucketThrottle
 
 
 class EmployeeModelTest(TestCase):
@@ -191,3 +223,2039 @@ class AuthenticationAPITest(APITestCase):
             format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EmployeeBoardRepresentationTest(APITestCase):
+    """Test sparse fieldsets and the compact board representation."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        
+        self.status = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.employees = [
+            Employee.objects.create(name=f'Employee {i}') for i in range(3)
+        ]
+        for employee in self.employees[:2]:
+            StatusLog.objects.create(
+                employee=employee,
+                status=self.status,
+                planned_end_time=timezone.now() + timedelta(hours=1)
+            )
+    
+    def test_sparse_fieldset(self):
+        """Test ?fields= limits row fields."""
+        response = self.client.get('/api/employees/?fields=id,name')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for row in response.data['results']:
+            self.assertEqual(set(row), {'id', 'name'})
+    
+    def test_compact_board(self):
+        """Test compact board references statuses by id and shares one timestamp."""
+        response = self.client.get('/api/employees/?view=compact')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('server_time', response.data)
+        self.assertEqual(
+            response.data['statuses'],
+            {str(self.status.id): {'name': 'Repair', 'color': '#3b82f6'}}
+        )
+        rows = {row['id']: row for row in response.data['results']}
+        current = rows[self.employees[0].id]['current_status']
+        self.assertEqual(current['status_id'], self.status.id)
+        self.assertNotIn('elapsed_seconds', current)
+        self.assertIsNone(rows[self.employees[2].id]['current_status'])
+    
+    def test_list_query_count_is_constant(self):
+        """Test the board does not issue a query per employee."""
+        for i in range(5):
+            employee = Employee.objects.create(name=f'Extra {i}')
+            StatusLog.objects.create(employee=employee, status=self.status)
+        with self.assertNumQueries(3):
+            self.client.get('/api/employees/')
+
+
+class FastPathEquivalenceTest(TestCase):
+    """Test the fast read path renders byte-identical output to the serializers."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        ready = Status.objects.create(name='Ready', color='#22c55e')
+        repair = Status.objects.create(name='Ремонт', color='#3b82f6', has_end_time=True)
+        
+        overdue = Employee.objects.create(name='Overdue', email='overdue@example.com')
+        closed = StatusLog.objects.create(employee=overdue, status=ready, created_by=self.user)
+        closed.end_time = timezone.now()
+        closed.save()
+        StatusLog.objects.create(
+            employee=overdue,
+            status=repair,
+            planned_end_time=timezone.now() - timedelta(minutes=5),
+            notes='Line\u2028separator and "quotes"'
+        )
+        pending = Employee.objects.create(name='Pending')
+        StatusLog.objects.create(
+            employee=pending,
+            status=repair,
+            planned_end_time=timezone.now() + timedelta(hours=3)
+        )
+        Employee.objects.create(name='Idle', email='idle@example.com')
+        self.now = timezone.now()
+    
+    def test_employee_list_output_is_identical(self):
+        """Test employee rows match EmployeeListSerializer."""
+        queryset = Employee.objects.filter(is_active=True)
+        expected = JSONRenderer().render(
+            EmployeeListSerializer(queryset, many=True, context={'now': self.now}).data
+        )
+        rows = fastpath.employee_list_queryset(queryset)
+        actual = FastJSONRenderer().render(fastpath.serialize_employee_rows(rows, self.now))
+        self.assertEqual(actual, expected)
+    
+    def test_sparse_employee_list_output_is_identical(self):
+        """Test sparse fieldsets match EmployeeListSerializer."""
+        queryset = Employee.objects.filter(is_active=True)
+        fields = ['name', 'id']
+        expected = JSONRenderer().render(
+            EmployeeListSerializer(queryset, many=True, fields=fields).data
+        )
+        rows = fastpath.employee_list_queryset(queryset)
+        actual = FastJSONRenderer().render(fastpath.serialize_employee_rows(rows, fields=fields))
+        self.assertEqual(actual, expected)
+    
+    def test_status_log_output_is_identical(self):
+        """Test status log rows match StatusLogSerializer."""
+        queryset = StatusLog.objects.select_related('employee', 'status', 'created_by')
+        expected = JSONRenderer().render(
+            StatusLogSerializer(queryset, many=True, context={'now': self.now}).data
+        )
+        rows = fastpath.status_log_queryset(queryset)
+        actual = FastJSONRenderer().render(fastpath.serialize_status_log_rows(rows, self.now))
+        self.assertEqual(actual, expected)
+
+
+class ResponseEncodingTest(APITestCase):
+    """Test MessagePack negotiation and response compression."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        ready = Status.objects.create(name='Ready', color='#22c55e')
+        for i in range(20):
+            employee = Employee.objects.create(name=f'Employee {i}')
+            StatusLog.objects.create(employee=employee, status=ready)
+    
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_messagepack_response(self):
+        """Test the board can be requested as MessagePack."""
+        response = self.client.get('/api/employees/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data['count'], 20)
+        self.assertEqual(data['results'][0]['current_status']['status_name'], 'Ready')
+    
+    def test_gzip_response(self):
+        """Test large responses are gzipped when the client accepts it."""
+        plain = self.client.get('/api/employees/?view=compact')
+        response = self.client.get('/api/employees/?view=compact', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['results'], plain.data['results'])
+    
+    def test_html_is_not_compressed(self):
+        """Test HTML pages (with CSRF tokens) are never compressed."""
+        response = self.client.get('/api/employees/', HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        self.assertGreater(len(response.content), settings.COMPRESSION_MIN_SIZE)
+        self.assertFalse(response.has_header('Content-Encoding'))
+    
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_responses_are_not_compressed(self):
+        """Test responses under the size threshold are sent as-is."""
+        response = self.client.get('/api/employees/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class DeltaSyncTest(APITestCase):
+    """Test the status change journal and the delta sync endpoint."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.status = Status.objects.create(name='Ready', color='#22c55e')
+        self.first = Employee.objects.create(name='First')
+        self.second = Employee.objects.create(name='Second')
+    
+    def change_status(self, employee):
+        return self.client.post(
+            f'/api/employees/{employee.id}/change_status/',
+            {'status_id': self.status.id},
+            format='json'
+        )
+    
+    def test_change_status_appends_journal_entry(self):
+        """Test change_status records old and new log ids."""
+        self.change_status(self.first)
+        old_log = self.first.get_current_status_log()
+        self.change_status(self.first)
+        
+        entry = StatusChangeJournal.objects.last()
+        self.assertEqual(entry.kind, StatusChangeJournal.KIND_STATUS_CHANGE)
+        self.assertEqual(entry.employee_id, self.first.id)
+        self.assertEqual(entry.old_log_id, old_log.id)
+        self.assertEqual(entry.new_log_id, self.first.get_current_status_log().id)
+    
+    def test_changes_since_version(self):
+        """Test only employees changed after the version are returned."""
+        self.change_status(self.first)
+        version = self.client.get('/api/employees/changes/?since=0').data['version']
+        
+        self.change_status(self.second)
+        self.second.soft_delete()
+        journal.record(StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE, self.second.id)
+        self.change_status(self.first)
+        
+        with self.settings(STATUS_JOURNAL_SETTLE_SECONDS=0):
+            response = self.client.get(f'/api/employees/changes/?since={version}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['resync'])
+        self.assertEqual([row['id'] for row in response.data['changed']], [self.first.id])
+        self.assertEqual(response.data['removed'], [self.second.id])
+        self.assertEqual(response.data['version'], journal.latest_seq())
+    
+    def test_resync_after_compaction(self):
+        """Test a version pruned by compaction requires a resync."""
+        for _ in range(3):
+            self.change_status(self.first)
+        deleted = journal.compact(timezone.now() + timedelta(seconds=1))
+        self.assertEqual(deleted, 2)
+        
+        response = self.client.get('/api/employees/changes/?since=0')
+        self.assertTrue(response.data['resync'])
+        latest = self.client.get(f'/api/employees/changes/?since={journal.latest_seq()}')
+        self.assertFalse(latest.data['resync'])
+    
+    def test_invalid_since(self):
+        """Test a missing or negative version is rejected."""
+        response = self.client.get('/api/employees/changes/?since=-1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OutboxTest(APITestCase):
+    """Test the transactional outbox and its consumer."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.status = Status.objects.create(name='Ready', color='#22c55e')
+        self.employee = Employee.objects.create(name='Test Employee')
+        self.calls = []
+    
+    def register(self, topic, fail_times=0):
+        """Register a recording handler that fails its first `fail_times` calls."""
+        failures = {'left': fail_times}
+        
+        def record(event):
+            self.calls.append(event.id)
+            if failures['left']:
+                failures['left'] -= 1
+                raise RuntimeError('handler failed')
+        
+        outbox.handler(topic, name=f'test.{topic}')(record)
+        self.addCleanup(outbox._handlers[topic].pop, f'test.{topic}')
+    
+    def test_change_status_emits_event(self):
+        """Test change_status writes an outbox event in its transaction."""
+        self.client.post(
+            f'/api/employees/{self.employee.id}/change_status/',
+            {'status_id': self.status.id},
+            format='json'
+        )
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.topic, outbox.TOPIC_STATUS_CHANGED)
+        self.assertEqual(event.payload['employee_id'], self.employee.id)
+        self.assertIsNone(event.processed_at)
+    
+    def test_drain_delivers_in_batches(self):
+        """Test drain runs handlers for every pending event and marks them processed."""
+        self.register('test.topic')
+        for i in range(5):
+            outbox.emit('test.topic', {'n': i})
+        
+        delivered, failed = outbox.drain(batch_size=2)
+        self.assertEqual((delivered, failed), (5, 0))
+        self.assertEqual(len(self.calls), 5)
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+        self.assertEqual(outbox.drain(), (0, 0))
+    
+    def test_failed_handler_is_retried_later(self):
+        """Test a failing handler is retried after backoff without re-running others."""
+        self.register('test.retry', fail_times=1)
+        outbox.handler('test.retry', name='test.ok')(lambda event: self.calls.append('ok'))
+        self.addCleanup(outbox._handlers['test.retry'].pop, 'test.ok')
+        event = outbox.emit('test.retry', {})
+        
+        self.assertEqual(outbox.drain(), (0, 1))
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(event.completed_handlers, ['test.ok'])
+        self.assertGreater(event.available_at, timezone.now())
+        
+        OutboxEvent.objects.filter(id=event.id).update(available_at=timezone.now())
+        self.assertEqual(outbox.drain(), (1, 0))
+        self.assertEqual(self.calls.count('ok'), 1)
+    
+    def test_claimed_batch_is_leased(self):
+        """Test a batch is hidden from other consumers while its handlers run."""
+        leased = []
+        outbox.handler('test.lease', name='test.lease')(
+            lambda event: leased.append(OutboxEvent.objects.get(id=event.id).available_at > timezone.now())
+        )
+        self.addCleanup(outbox._handlers['test.lease'].pop, 'test.lease')
+        outbox.emit('test.lease', {})
+        
+        self.assertEqual(outbox.drain(), (1, 0))
+        self.assertEqual(leased, [True])
+    
+    def close_overdue_status(self):
+        log = StatusLog.objects.create(
+            employee=self.employee,
+            status=self.status,
+            planned_end_time=timezone.now() - timedelta(hours=1)
+        )
+        self.client.post(
+            f'/api/employees/{self.employee.id}/change_status/',
+            {'status_id': self.status.id},
+            format='json'
+        )
+        return log
+    
+    @override_settings(OVERDUE_CLOSE_ALERT_SECONDS=60)
+    def test_overdue_close_alert(self):
+        """Test closing a long-overdue status sends one alert."""
+        log = self.close_overdue_status()
+        outbox.drain()
+        OutboxEvent.objects.update(processed_at=None, available_at=timezone.now())
+        outbox.drain()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(self.employee.name, mail.outbox[0].subject)
+        log.refresh_from_db()
+        self.assertIsNotNone(log.overdue_alert_sent_at)
+    
+    @override_settings(OVERDUE_CLOSE_ALERT_SECONDS=60)
+    def test_failed_overdue_close_alert_is_retried(self):
+        """Test an alert whose send failed is sent when the event is retried."""
+        log = self.close_overdue_status()
+        with mock.patch('employees.handlers.send_mail', side_effect=OSError('SMTP down')):
+            self.assertEqual(outbox.drain(), (0, 1))
+        log.refresh_from_db()
+        self.assertIsNone(log.overdue_alert_sent_at)
+        
+        OutboxEvent.objects.update(available_at=timezone.now())
+        self.assertEqual(outbox.drain(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class AdminChangelistTest(TestCase):
+    """Test admin changelists run a bounded number of queries."""
+    
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='root', password='test123')
+        self.client.force_login(self.admin)
+        self.status = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+    
+    def add_employees(self, count):
+        for i in range(count):
+            employee = Employee.objects.create(name=f'Employee {Employee.objects.count()}')
+            StatusLog.objects.create(
+                employee=employee,
+                status=self.status,
+                planned_end_time=timezone.now() - timedelta(hours=1),
+                created_by=self.admin
+            )
+    
+    def count_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test both changelists use the same number of queries for 2 and 20 rows."""
+        for url in ('/admin/employees/employee/', '/admin/employees/statuslog/'):
+            self.add_employees(2)
+            small = self.count_queries(url)
+            self.add_employees(18)
+            self.assertEqual(self.count_queries(url), small, url)
+    
+    def test_statuslog_annotations(self):
+        """Test durations and live overdue time come from SQL annotations."""
+        self.add_employees(1)
+        response = self.client.get('/admin/employees/statuslog/?is_overdue=yes')
+        self.assertContains(response, '1.00h (Active)')
+        self.assertContains(response, '1.00h')
+    
+    def test_employee_autocomplete_filter(self):
+        """Test the employee filter restricts rows without listing all employees."""
+        self.add_employees(3)
+        employee = Employee.objects.first()
+        response = self.client.get(f'/admin/employees/statuslog/?employee={employee.id}')
+        self.assertEqual(response.context['cl'].result_count, 1)
+        self.assertContains(response, 'autocomplete-list-filter')
+
+
+class FullTextSearchTest(APITestCase):
+    """Test full-text search of employees and notes, its index and its backends."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        self.user = User.objects.create_superuser(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.status = Status.objects.create(name='Repair', color='#3b82f6')
+        self.ann = Employee.objects.create(name='Ann Müller', email='ann@example.com')
+        self.bob = Employee.objects.create(name='Bob Engel', email='bob@depot.example.com')
+        self.notes = {}
+        for employee, notes in [
+            (self.ann, 'Engine failure on line 3'),
+            (self.bob, 'Waiting for parts'),
+            (self.ann, 'engine fixed'),
+            (self.bob, 'Brake pads'),
+        ]:
+            log = StatusLog.objects.create(employee=employee, status=self.status, notes=notes)
+            self.notes[notes] = log.id
+    
+    def search_employees(self, term):
+        response = self.client.get('/api/employees/', {'search': term, 'fields': 'id'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['id'] for row in response.data['results']]
+    
+    def search_notes(self, term):
+        response = self.client.get('/api/employees/notes/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['notes'] for row in response.data['results']]
+    
+    def test_employee_search(self):
+        """Test names and emails match by word prefix, ignoring case and accents."""
+        self.assertEqual(self.search_employees('ann'), [self.ann.id])
+        self.assertEqual(self.search_employees('MULLER'), [self.ann.id])
+        self.assertEqual(self.search_employees('depot'), [self.bob.id])
+        self.assertEqual(self.search_employees('eng'), [self.bob.id])
+        self.assertEqual(self.search_employees('example'), [self.ann.id, self.bob.id])
+        self.assertEqual(self.search_employees('ann depot'), [])
+        self.assertEqual(self.search_employees('"*'), [])
+        with self.settings(LIVE_BOARD=True):
+            self.assertEqual(self.search_employees('bob'), [self.bob.id])
+    
+    def test_search_does_not_filter_detail_routes(self):
+        """Test ?search= (e.g. kept from the board URL) can't 404 an employee's own routes."""
+        for path in (f'/api/employees/{self.ann.id}/', f'/api/employees/{self.ann.id}/history/'):
+            response = self.client.get(path, {'search': 'bob'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, path)
+        response = self.client.post(
+            f'/api/employees/{self.ann.id}/change_status/?search=bob', {'status_id': self.status.id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_notes_search_pages_newest_first(self):
+        """Test notes matches come newest first with a next link."""
+        self.assertEqual(self.search_notes('eng'), ['engine fixed', 'Engine failure on line 3'])
+        self.assertEqual(self.search_notes('engine fail'), ['Engine failure on line 3'])
+        
+        with mock.patch.object(PageNumberPagination, 'page_size', 1):
+            response = self.client.get('/api/employees/notes/', {'search': 'engine'})
+            self.assertEqual(response.data['results'][0]['employee_name'], 'Ann Müller')
+            self.assertIn(f'before={self.notes["engine fixed"]}', response.data['next'])
+            response = self.client.get(response.data['next'])
+        self.assertEqual([row['notes'] for row in response.data['results']], ['Engine failure on line 3'])
+        self.assertIsNone(response.data['next'])
+        
+        response = self.client.get('/api/employees/notes/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/employees/notes/', {'search': 'engine', 'before': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_index_follows_writes(self):
+        """Test saves, bulk inserts, UPDATEs and deletes reach the index."""
+        log = StatusLog.objects.get(pk=self.notes['Brake pads'])
+        log.notes = 'Clutch replaced'
+        log.save()
+        StatusLog.objects.filter(pk=self.notes['Waiting for parts']).update(notes='Gearbox')
+        StatusLog.objects.bulk_create([StatusLog(employee=self.bob, status=self.status, notes='Brake lights')])
+        StatusLog.objects.filter(pk=self.notes['engine fixed']).delete()
+        Employee.objects.filter(pk=self.bob.pk).update(name='Robert Engel')
+        
+        self.assertEqual(self.search_notes('brake'), ['Brake lights'])
+        self.assertEqual(self.search_notes('clutch'), ['Clutch replaced'])
+        self.assertEqual(self.search_notes('gear'), ['Gearbox'])
+        self.assertEqual(self.search_notes('engine'), ['Engine failure on line 3'])
+        self.assertEqual(self.search_employees('robert'), [self.bob.id])
+        self.assertEqual(self.search_employees('bob'), [self.bob.id])
+    
+    @override_settings(SEARCH_BACKEND='employees.search.ScanBackend')
+    def test_scan_backend(self):
+        """Test the scan backend used for other databases finds the same rows."""
+        self.assertEqual(self.search_employees('müller'), [self.ann.id])
+        self.assertEqual(self.search_notes('engine fail'), ['Engine failure on line 3'])
+    
+    def test_admin_search(self):
+        """Test the admin changelists search through the index."""
+        self.client.force_login(self.user)
+        response = self.client.get('/admin/employees/statuslog/', {'q': 'parts'})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        response = self.client.get('/admin/employees/statuslog/', {'q': 'ann'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+        response = self.client.get('/admin/employees/statuslog/', {'q': 'repair'})
+        self.assertEqual(response.context['cl'].result_count, 4)
+        response = self.client.get('/admin/employees/employee/', {'q': 'engel'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.bob])
+    
+    def test_missing_triggers_are_recreated(self):
+        """Test migrate recreates triggers dropped by a table rebuild and reindexes."""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER employees_statuslog_fts_insert')
+        StatusLog.objects.create(employee=self.ann, status=self.status, notes='Unindexed')
+        self.assertEqual(self.search_notes('unindexed'), [])
+        
+        with self.assertLogs('employees.search', 'WARNING'):
+            search.ensure_index(sender=None, using='default')
+        self.assertEqual(self.search_notes('unindexed'), ['Unindexed'])
+
+
+class SnapshotTest(APITestCase):
+    """Test the point-in-time snapshot endpoint."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.t0 = timezone.now() - timedelta(days=30)
+        self.first = Employee.objects.create(name='First')
+        self.second = Employee.objects.create(name='Second')
+        Employee.objects.update(created_at=self.t0)
+        
+        self.add_log(self.first, self.ready, 0, 2)
+        self.add_log(self.first, self.repair, 2, None, planned=3)
+        self.add_log(self.second, self.ready, 1, 2)
+    
+    def hours(self, hours):
+        return self.t0 + timedelta(hours=hours) if hours is not None else None
+    
+    def add_log(self, employee, status_obj, start_hours, end_hours, planned=None):
+        return StatusLog.objects.create(
+            employee=employee,
+            status=status_obj,
+            start_time=self.hours(start_hours),
+            end_time=self.hours(end_hours),
+            planned_end_time=self.hours(planned),
+        )
+    
+    def get_snapshot(self, at):
+        response = self.client.get('/api/employees/snapshot/', {'at': at.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row['name']: row['current_status'] for row in response.data['results']}
+    
+    def test_status_at_instant(self):
+        """Test each employee gets the log that was active at the instant."""
+        board = self.get_snapshot(self.t0 + timedelta(hours=1, minutes=30))
+        self.assertEqual(board['First']['status_name'], 'Ready')
+        self.assertEqual(board['First']['elapsed_seconds'], 5400)
+        self.assertEqual(board['Second']['status_name'], 'Ready')
+        
+        board = self.get_snapshot(self.t0 + timedelta(hours=4))
+        self.assertEqual(board['First']['status_name'], 'Repair')
+        self.assertTrue(board['First']['is_overdue'])
+        self.assertEqual(board['First']['overdue_seconds'], 3600)
+        self.assertIsNone(board['Second'])
+    
+    def test_employee_presence(self):
+        """Test employees are only listed while they were on the board."""
+        self.second.soft_delete()
+        self.assertNotIn('Second', self.get_snapshot(timezone.now() + timedelta(seconds=1)))
+        self.assertIn('Second', self.get_snapshot(self.t0 + timedelta(hours=1)))
+        self.assertEqual(self.get_snapshot(self.t0 - timedelta(days=1)), {})
+    
+    def test_fast_path_matches_serializer(self):
+        """Test the fast read path renders the same snapshot as the serializer."""
+        at = (self.t0 + timedelta(hours=2, minutes=15)).isoformat()
+        fast = self.client.get('/api/employees/snapshot/', {'at': at})
+        with self.settings(FAST_READ_PATH=False):
+            slow = self.client.get('/api/employees/snapshot/', {'at': at})
+        self.assertEqual(fast.content, slow.content)
+    
+    def test_invalid_instant(self):
+        """Test a missing or malformed instant is rejected."""
+        response = self.client.get('/api/employees/snapshot/?at=yesterday')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('at', response.data)
+
+
+class HistoryPageTest(APITestCase):
+    """Test the cacheable cursor pages of employee history."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        cache.clear()
+        page_size = mock.patch.object(PageNumberPagination, 'page_size', 3)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+        
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.employee = Employee.objects.create(name='Test Employee')
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        start = timezone.now() - timedelta(days=30)
+        # 10 logs: head page of 4, then pages of 3
+        for i in range(10):
+            StatusLog.objects.create(
+                employee=self.employee,
+                status=self.ready,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i + 1) if i < 9 else None,
+            )
+        self.url = f'/api/employees/{self.employee.id}/history/'
+    
+    def page(self, cursor, **extra):
+        """Get the history page at `cursor`."""
+        return self.client.get(self.url, {'cursor': cursor}, **extra)
+    
+    def walk(self):
+        """Follow the cursor pages from the head; returns the responses."""
+        responses = [self.page('')]
+        while responses[-1].data['next_cursor']:
+            responses.append(self.page(responses[-1].data['next_cursor']))
+        return responses
+    
+    def test_pages_cover_history_newest_first(self):
+        """Test pages are cut from the oldest log and only the head is uncacheable."""
+        responses = self.walk()
+        self.assertEqual([len(r.data['results']) for r in responses], [4, 3, 3])
+        ids = [row['id'] for r in responses for row in r.data['results']]
+        expected = list(StatusLog.objects.order_by('-start_time').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        
+        self.assertEqual(responses[0]['Cache-Control'], 'private, no-cache')
+        for response in responses[1:]:
+            self.assertEqual(response['Cache-Control'], f'private, max-age={settings.HISTORY_PAGE_MAX_AGE}')
+            self.assertEqual(response['X-History-Cache'], 'miss')
+        # The page-number API is unchanged
+        self.assertEqual(self.client.get(self.url).data['count'], 10)
+    
+    def test_new_logs_only_grow_the_head(self):
+        """Test older pages keep their cursors and are served from the cache."""
+        before = self.walk()
+        StatusLog.objects.filter(end_time__isnull=True).update(end_time=timezone.now())
+        StatusLog.objects.create(employee=self.employee, status=self.ready)
+        
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.page(before[0].data['next_cursor'])
+        after = self.walk()
+        self.assertEqual(len(after[0].data['results']), 5)
+        self.assertEqual(after[0].data['next_cursor'], before[0].data['next_cursor'])
+        self.assertEqual(cached['X-History-Cache'], 'hit')
+        self.assertEqual(cached.data, before[1].data)
+        self.assertFalse(any('JOIN' in q['sql'] for q in queries))
+        
+        # Past 2 pages' worth of new logs, the head is cut again
+        for _ in range(2):
+            StatusLog.objects.create(employee=self.employee, status=self.ready)
+        self.assertEqual([len(r.data['results']) for r in self.walk()], [4, 3, 3, 3])
+    
+    def test_changed_page_is_rebuilt(self):
+        """Test editing or deleting a closed log changes its page."""
+        before = self.walk()
+        cursor = before[0].data['next_cursor']
+        log = StatusLog.objects.get(pk=before[1].data['results'][0]['id'])
+        log.notes = 'Corrected'
+        log.save()
+        
+        response = self.page(cursor)
+        self.assertEqual(response['X-History-Cache'], 'miss')
+        self.assertEqual(response.data['results'][0]['notes'], 'Corrected')
+        
+        log.delete()
+        response = self.page(cursor)
+        self.assertEqual(response['X-History-Cache'], 'miss')
+        self.assertNotIn(log.pk, [row['id'] for row in response.data['results']])
+    
+    def test_revalidation_and_invalid_cursor(self):
+        """Test pages answer If-None-Match with 304 and bad cursors with 404."""
+        cursor = self.walk()[0].data['next_cursor']
+        first = self.page(cursor)
+        response = self.page(cursor, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['Cache-Control'], first['Cache-Control'])
+        
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_next_page_is_a_cursor_not_a_link(self):
+        """Test behind the TLS proxy the client gets no http:// link to follow."""
+        response = self.page('', HTTP_X_FORWARDED_PROTO='https')
+        cursor = response.data['next_cursor']
+        self.assertNotIn('://', cursor)
+        self.assertEqual(self.page(cursor).data, self.walk()[1].data)
+        self.assertIsNone(self.walk()[-1].data['next_cursor'])
+
+
+class HeadcountReportTest(APITestCase):
+    """Test the status headcount time series."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.t0 = (timezone.now() - timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        
+        def minutes(m):
+            return self.t0 + timedelta(minutes=m) if m is not None else None
+        
+        logs = [
+            # employee, status, start, end, planned (minutes from t0)
+            ('First', self.ready, -30, 40, None),
+            ('First', self.repair, 40, 130, 60),
+            ('First', self.ready, 130, None, None),
+            ('Second', self.repair, 15, 45, 100),
+            ('Second', self.repair, 45, 200, 90),
+            ('Third', self.ready, 60, 61, None),
+        ]
+        for name, status_obj, start, end, planned in logs:
+            employee, _ = Employee.objects.get_or_create(name=name)
+            StatusLog.objects.create(
+                employee=employee,
+                status=status_obj,
+                start_time=minutes(start),
+                end_time=minutes(end),
+                planned_end_time=minutes(planned),
+            )
+        Employee.objects.update(created_at=self.t0 - timedelta(days=1))
+    
+    def get_headcount(self, **params):
+        return self.client.get('/api/reports/headcount/', params)
+    
+    def test_counts_match_snapshots(self):
+        """Test each bucket matches the snapshot taken at its start."""
+        response = self.get_headcount(
+            **{'from': self.t0.isoformat(), 'to': (self.t0 + timedelta(hours=4)).isoformat(), 'bucket': '15m'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['buckets']), 16)
+        counts = {s['name']: s['counts'] for s in response.data['statuses']}
+        
+        for k, bucket_start in enumerate(response.data['buckets']):
+            board = self.client.get('/api/employees/snapshot/', {'at': bucket_start.isoformat()})
+            current = [row['current_status'] for row in board.data['results'] if row['current_status']]
+            for name in ('Ready', 'Repair'):
+                expected = sum(1 for c in current if c['status_name'] == name)
+                self.assertEqual(counts[name][k], expected, f'{name} at bucket {k}')
+            expected_overdue = sum(1 for c in current if c['is_overdue'])
+            self.assertEqual(response.data['overdue'][k], expected_overdue, f'overdue at bucket {k}')
+        
+        self.assertEqual(counts['Repair'][:6], [0, 1, 1, 2, 2, 2])
+        self.assertEqual(response.data['overdue'][4:10], [0, 1, 1, 2, 2, 1])
+    
+    def test_deleted_employee_leaves_the_count(self):
+        """Test logs stop counting when their employee was deleted."""
+        employee = Employee.objects.get(name='First')
+        Employee.objects.filter(pk=employee.pk).update(
+            is_active=False, deleted_at=self.t0 + timedelta(minutes=150)
+        )
+        response = self.get_headcount(
+            **{'from': self.t0.isoformat(), 'to': (self.t0 + timedelta(hours=3)).isoformat()}
+        )
+        counts = {s['name']: s['counts'] for s in response.data['statuses']}
+        self.assertEqual(counts['Ready'], [1, 1, 0])
+    
+    def test_invalid_parameters(self):
+        """Test malformed ranges and buckets are rejected."""
+        response = self.get_headcount(**{'from': 'yesterday', 'bucket': '5m'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'from', 'to', 'bucket'})
+        
+        response = self.get_headcount(**{'from': self.t0.isoformat(), 'to': self.t0.isoformat()})
+        self.assertIn('to', response.data)
+        
+        with self.settings(HEADCOUNT_MAX_BUCKETS=10):
+            response = self.get_headcount(
+                **{'from': self.t0.isoformat(), 'to': (self.t0 + timedelta(days=1)).isoformat()}
+            )
+        self.assertIn('bucket', response.data)
+
+
+class UtilizationReportTest(APITestCase):
+    """Test the employee x status utilization matrix."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.ready = Status.objects.create(name='Ready', color='#22c55e', display_order=1)
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True, display_order=2)
+        self.t0 = (timezone.now() - timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+        self.first = Employee.objects.create(name='First')
+        self.second = Employee.objects.create(name='Second')
+        
+        def minutes(m):
+            return self.t0 + timedelta(minutes=m) if m is not None else None
+        
+        logs = [
+            # employee, status, start, end, planned (minutes from t0)
+            (self.first, self.ready, -30, 40, None),
+            (self.first, self.repair, 40, 130, 60),
+            (self.first, self.ready, 130, None, None),
+            (self.second, self.repair, 15, 45, 100),
+            (self.second, self.repair, 45, 200, 90),
+        ]
+        for employee, status_obj, start, end, planned in logs:
+            StatusLog.objects.create(
+                employee=employee,
+                status=status_obj,
+                start_time=minutes(start),
+                end_time=minutes(end),
+                planned_end_time=minutes(planned),
+            )
+        self.window = {
+            'from': self.t0.isoformat(),
+            'to': (self.t0 + timedelta(hours=3)).isoformat(),
+        }
+    
+    def get_utilization(self, **params):
+        return self.client.get('/api/reports/utilization/', {**self.window, **params})
+    
+    def test_matrix_is_clipped_to_the_window(self):
+        """Test seconds, overdue and log counts per employee and status in one query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_utilization()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        grouped = [q['sql'] for q in queries if 'GROUP BY' in q['sql']]
+        self.assertEqual(len(grouped), 1)
+        
+        self.assertEqual([s['name'] for s in response.data['statuses']], ['Ready', 'Repair'])
+        rows = {row['name']: row for row in response.data['employees']}
+        # First: Ready 0-40 and 130-180, Repair 40-130 (overdue after 60)
+        self.assertEqual(rows['First']['seconds'], [90 * 60, 90 * 60])
+        self.assertEqual(rows['First']['overdue_seconds'], [0, 70 * 60])
+        self.assertEqual(rows['First']['logs'], [2, 1])
+        # Second: Repair 15-45 and 45-180 (overdue after 90)
+        self.assertEqual(rows['Second']['seconds'], [0, 165 * 60])
+        self.assertEqual(rows['Second']['overdue_seconds'], [0, 90 * 60])
+        self.assertEqual(response.data['totals']['seconds'], [90 * 60, 255 * 60])
+        self.assertEqual(response.data['totals']['total_seconds'], 345 * 60)
+        
+        # Agrees with the per-log durations clipped in Python
+        start, end = self.t0, self.t0 + timedelta(hours=3)
+        for log in StatusLog.objects.all():
+            log_end = min(log.end_time or timezone.now(), end)
+            clipped = max(0, int((log_end - max(log.start_time, start)).total_seconds()))
+            row = rows[log.employee.name]
+            column = [s['id'] for s in response.data['statuses']].index(log.status_id)
+            row['seconds'][column] -= clipped
+        for row in rows.values():
+            self.assertEqual(row['seconds'], [0, 0])
+    
+    def test_selected_and_deleted_employees(self):
+        """Test ?employees= selects the team and deletion ends an employee's time."""
+        Employee.objects.filter(pk=self.first.pk).update(
+            is_active=False, deleted_at=self.t0 + timedelta(minutes=150)
+        )
+        response = self.get_utilization()
+        self.assertEqual([row['name'] for row in response.data['employees']], ['Second'])
+        
+        response = self.get_utilization(employees=f'{self.first.pk}')
+        self.assertEqual(response.data['employees'][0]['seconds'], [60 * 60, 90 * 60])
+        
+        response = self.get_utilization(employees=f'{self.first.pk},999')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999', str(response.data['employees']))
+        response = self.get_utilization(employees='first')
+        self.assertIn('employees', response.data)
+        response = self.get_utilization(to=self.window['from'])
+        self.assertIn('to', response.data)
+    
+    def test_excel_export(self):
+        """Test ?format=xlsx downloads the matrix in hours; errors stay JSON."""
+        from openpyxl import load_workbook
+        
+        response = self.get_utilization(format='xlsx')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], reports.EXCEL_CONTENT_TYPE)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(load_workbook(io.BytesIO(response.content)).active.values)
+        self.assertEqual(rows[0], ('Employee', 'Ready', 'Repair', 'Total (hours)'))
+        self.assertEqual(rows[1], ('First', 1.5, 1.5, 3))
+        self.assertEqual(rows[-1], ('Total', 1.5, 4.25, 5.75))
+        
+        response = self.get_utilization(format='xlsx', employees='first')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('employees', response.json())
+
+
+class ReportCacheTest(APITestCase):
+    """Test the report artifact cache."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings_override = self.settings(REPORT_CACHE_DIR=self.cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # More report requests than the reports scope allows at once
+        TokenBucketThrottle.buckets.clear()
+        
+        self.status = Status.objects.create(name='Ready', color='#22c55e')
+        self.employee = Employee.objects.create(name='Test Employee')
+        self.month = report_cache.monthly_filters(2026, 3)
+        self.log = StatusLog.objects.create(
+            employee=self.employee,
+            status=self.status,
+            start_time=self.month['start_date'] + timedelta(days=2),
+            end_time=self.month['start_date'] + timedelta(days=2, hours=3),
+        )
+    
+    def post_report(self, **filters):
+        data = {
+            'start_date': self.month['start_date'].isoformat(),
+            'end_date': self.month['end_date'].isoformat(),
+            **filters,
+        }
+        response = self.client.post('/api/reports/excel/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+    
+    def test_hit_serves_identical_file(self):
+        """Test a repeated report is served from the cache byte for byte."""
+        first = self.post_report()
+        second = self.post_report()
+        self.assertEqual(first['X-Report-Cache'], report_cache.MISS)
+        self.assertEqual(second['X-Report-Cache'], report_cache.HIT)
+        self.assertEqual(first.content, second.content)
+    
+    def test_changed_data_rebuilds(self):
+        """Test edits to covered logs or renamed employees miss the cache."""
+        self.post_report()
+        self.log.notes = 'Corrected'
+        self.log.save()
+        self.assertEqual(self.post_report()['X-Report-Cache'], report_cache.MISS)
+        
+        self.employee.name = 'Renamed'
+        self.employee.save()
+        self.assertEqual(self.post_report()['X-Report-Cache'], report_cache.MISS)
+        self.assertEqual(self.post_report()['X-Report-Cache'], report_cache.HIT)
+    
+    def test_reports_with_open_logs_are_not_cached(self):
+        """Test reports covering open logs are always generated."""
+        StatusLog.objects.create(employee=self.employee, status=self.status)
+        for _ in range(2):
+            response = self.client.get('/api/reports/excel/')
+            self.assertEqual(response['X-Report-Cache'], report_cache.BYPASS)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+    
+    def test_least_recently_used_files_are_evicted(self):
+        """Test eviction keeps the cache under its size bound, LRU first."""
+        for n, name in enumerate(['first', 'second', 'third']):
+            path = os.path.join(self.cache_dir, name)
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100)
+            os.utime(path, (1000 + n, 1000 + n))
+        report_cache.read(os.path.join(self.cache_dir, 'first'))
+        
+        self.assertEqual(report_cache.evict(max_bytes=250), 1)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['first', 'third'])
+    
+    def test_prewarm_monthly_reports(self):
+        """Test prewarmed monthly reports are hits for matching requests."""
+        today = self.month['start_date'].date() + timedelta(days=40)
+        states = report_cache.prewarm_monthly(2, today=today)
+        self.assertEqual(states, {(2026, 3): report_cache.MISS, (2026, 2): report_cache.MISS})
+        self.assertEqual(self.post_report()['X-Report-Cache'], report_cache.HIT)
+    
+    def test_invalid_filters(self):
+        """Test malformed filters are rejected."""
+        response = self.client.post('/api/reports/excel/', {'start_date': 'March'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start_date', response.data)
+
+
+class ShardedReportTest(APITestCase):
+    """Test large Excel reports rendered in time range shards."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        
+        ready = Status.objects.create(name='Ready', color='#22c55e')
+        repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        employees = [Employee.objects.create(name=name) for name in ('Ann', 'Bartholomew Longname')]
+        self.now = timezone.now().replace(microsecond=0)
+        notes = ['', 'Brakes & <clutch>', '  padded  ', 'Waiting for parts']
+        for day in range(12):
+            start = self.now - timedelta(days=12 - day)
+            StatusLog.objects.create(
+                employee=employees[day % 2],
+                status=repair if day % 3 else ready,
+                start_time=start,
+                end_time=start + timedelta(hours=5),
+                planned_end_time=start + timedelta(hours=4) if day % 3 else None,
+                overdue_duration=3600 if day % 3 else 0,
+                notes=notes[day % len(notes)],
+            )
+        StatusLog.objects.create(employee=employees[0], status=ready, start_time=self.now - timedelta(hours=1))
+    
+    def sheet(self, content):
+        """Rows and column widths of a report workbook."""
+        from openpyxl import load_workbook
+        
+        ws = load_workbook(io.BytesIO(content)).active
+        widths = {letter: ws.column_dimensions[letter].width for letter in report_shards.COLUMNS}
+        return list(ws.values), widths, ws.dimensions
+    
+    def test_shards_match_single_process(self):
+        """Test shards spliced in order give the same cells and widths."""
+        single = reports.build_excel(reports.report_logs({}), now=self.now)
+        with mock.patch.object(report_shards, 'SHARDS_PER_WORKER', 5):
+            self.assertEqual(len(report_shards.shards(reports.report_logs({}), 5)), 5)
+            sharded = report_shards.build_excel({}, workers=1, now=self.now)
+        self.assertEqual(self.sheet(sharded), self.sheet(single))
+        rows, _, dimensions = self.sheet(sharded)
+        self.assertEqual(len(rows), 14)
+        self.assertEqual(dimensions, 'A1:H14')
+        self.assertIn('  padded  ', [row[7] for row in rows])
+        
+        filters = {'status_id': Status.objects.get(name='Repair').id}
+        single = reports.build_excel(reports.report_logs(filters), now=self.now)
+        sharded = report_shards.build_excel(filters, workers=1, now=self.now)
+        self.assertEqual(self.sheet(sharded), self.sheet(single))
+    
+    def test_logs_created_while_rendering(self):
+        """Test logs created mid-build are left out instead of shifting rows."""
+        import re
+        import zipfile
+        
+        expected = self.sheet(reports.build_excel(reports.report_logs({}), now=self.now))
+        render_shard = report_shards.render_shard
+        
+        def create_and_render(*args):
+            StatusLog.objects.create(employee=Employee.objects.first(), status=Status.objects.first())
+            return render_shard(*args)
+        
+        with mock.patch.object(report_shards, 'SHARDS_PER_WORKER', 3), \
+                mock.patch.object(report_shards, 'render_shard', side_effect=create_and_render):
+            content = report_shards.build_excel({}, workers=1, now=self.now)
+        self.assertEqual(self.sheet(content), expected)
+        sheet = zipfile.ZipFile(io.BytesIO(content)).read(report_shards.SHEET).decode()
+        row_numbers = re.findall(r'<row r="(\d+)"', sheet)
+        self.assertEqual(len(row_numbers), 14)
+        self.assertEqual(len(set(row_numbers)), 14)
+    
+    def test_empty_report(self):
+        """Test a report without logs has just the header row."""
+        filters = {'employee_id': Employee.objects.create(name='New').id}
+        rows, _, dimensions = self.sheet(report_shards.build_excel(filters, workers=2))
+        self.assertEqual(rows, [tuple(reports.HEADERS)])
+        self.assertEqual(dimensions, 'A1:H1')
+    
+    # Workers only see the in-memory test database if they are forked
+    @skipUnless(multiprocessing.get_start_method() == 'fork', 'needs forked workers')
+    @override_settings(REPORT_SHARD_MIN_ROWS=1)
+    def test_process_pool(self):
+        """Test a background build renders shards in worker processes."""
+        filters = {'employee_id': None, 'status_id': None, 'start_date': None, 'end_date': None}
+        with mock.patch.object(report_shards, 'build_excel', wraps=report_shards.build_excel) as build_excel:
+            content, _ = report_cache.excel(filters, workers=2)
+        build_excel.assert_called_once_with(filters, 2)
+        rows, _, _ = self.sheet(content)
+        self.assertEqual(rows[0], tuple(reports.HEADERS))
+        self.assertEqual([row[0] for row in rows[1:3]], ['Ann', 'Bartholomew Longname'])
+        self.assertEqual(len(rows), 14)
+    
+    @override_settings(REPORT_WORKERS=2, REPORT_SHARD_MIN_ROWS=1)
+    def test_requests_never_start_a_pool(self):
+        """Test the report endpoint builds in its own process and keeps its connections."""
+        with mock.patch.object(report_shards, 'build_excel') as build_excel, \
+                mock.patch.object(report_shards.connections, 'close_all') as close_all:
+            response = self.client.get('/api/reports/excel/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        build_excel.assert_not_called()
+        close_all.assert_not_called()
+        self.assertEqual(len(self.sheet(response.content)[0]), 14)
+    
+    @override_settings(REPORT_WORKERS=2, REPORT_SHARD_MIN_ROWS=100)
+    def test_prewarm_task_shards_large_reports_only(self):
+        """Test the prewarm task uses REPORT_WORKERS, for reports of REPORT_SHARD_MIN_ROWS rows."""
+        from . import tasks
+        
+        with mock.patch.object(report_cache, 'prewarm_monthly', return_value={}) as prewarm:
+            tasks.prewarm_monthly_reports()
+        prewarm.assert_called_once_with(settings.REPORT_PREWARM_MONTHS, workers=2)
+        
+        with mock.patch.object(report_shards, 'build_excel') as build_excel:
+            report_cache.excel({'employee_id': None, 'status_id': None, 'start_date': None, 'end_date': None}, workers=2)
+        build_excel.assert_not_called()
+
+
+class CeleryQueueTest(TestCase):
+    """Test report, archival, alert and housekeeping tasks are kept apart."""
+    
+    def test_routes_and_time_limits(self):
+        """Test each task goes to its queue with that queue's time limits."""
+        from config.celery import QUEUES, TASK_QUEUES, app
+        from . import tasks  # noqa: F401 - registers the shared tasks
+        
+        for task_name, queue in TASK_QUEUES.items():
+            route = app.amqp.router.route({}, task_name)
+            self.assertEqual(route['queue'].name, queue, task_name)
+            if task_name.startswith('employees.'):
+                task = app.tasks[task_name]
+                self.assertEqual(task.soft_time_limit, QUEUES[queue]['soft_time_limit'], task_name)
+                self.assertEqual(task.time_limit, QUEUES[queue]['time_limit'], task_name)
+        self.assertNotEqual(TASK_QUEUES['employees.tasks.prewarm_monthly_reports'],
+                            TASK_QUEUES['employees.tasks.drain_outbox'])
+        
+        scheduled = {entry['task'] for entry in app.conf.beat_schedule.values()}
+        self.assertEqual(scheduled, {t for t in TASK_QUEUES if t.startswith('employees.')})
+    
+    def test_worker_without_queue_setting_consumes_every_queue(self):
+        """Test a plain `celery worker` runs alerts, reports and archival too."""
+        from config.celery import QUEUES, app, task_queues
+        
+        self.assertEqual({queue.name for queue in app.conf.task_queues}, set(QUEUES))
+        self.assertEqual([queue.name for queue in task_queues(['alerts'])], ['alerts'])
+    
+    def run_report_and_alert(self, worker_queues):
+        """
+        Start one embedded worker per entry of `worker_queues`, then send a
+        report that blocks and an outbox drain. Returns whether the drain ran
+        while the report was still running.
+        """
+        import threading
+        from contextlib import ExitStack
+        
+        from celery import Celery, current_app
+        from celery.contrib.testing.worker import start_worker
+        from config.celery import app
+        from . import tasks  # noqa: F401 - registers the shared tasks
+        
+        previous = current_app._get_current_object()
+        self.addCleanup(previous.set_default)
+        self.addCleanup(previous.set_current)
+        test_app = Celery('queues_test', broker='memory://', fixups=[], set_as_current=False)
+        test_app.conf.update(
+            task_routes=app.conf.task_routes,
+            task_default_queue=app.conf.task_default_queue,
+            task_ignore_result=True,
+        )
+        report_started = threading.Event()
+        report_released = threading.Event()
+        alert_delivered = threading.Event()
+        
+        def slow_prewarm(months, workers=1):
+            report_started.set()
+            report_released.wait(10)
+            return {}
+        
+        def drain():
+            alert_delivered.set()
+            return 1, 0
+        
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch.object(report_cache, 'prewarm_monthly', slow_prewarm))
+            stack.enter_context(mock.patch.object(outbox, 'drain', drain))
+            for queues in worker_queues:
+                stack.enter_context(start_worker(
+                    test_app, pool='solo', perform_ping_check=False, queues=queues
+                ))
+            # Registered last: the report must be released before workers stop
+            stack.callback(report_released.set)
+            
+            test_app.tasks['employees.tasks.prewarm_monthly_reports'].delay()
+            self.assertTrue(report_started.wait(5))
+            test_app.tasks['employees.tasks.drain_outbox'].delay()
+            return alert_delivered.wait(2)
+    
+    def test_long_report_does_not_starve_alerts(self):
+        """Test an alert is delivered while a report is still running."""
+        self.assertTrue(self.run_report_and_alert([['reports'], ['alerts']]))
+    
+    def test_shared_worker_would_starve_alerts(self):
+        """Test the scenario above starves alerts when one worker takes both queues."""
+        self.assertFalse(self.run_report_and_alert([['reports', 'alerts']]))
+
+
+@override_settings(JWT_USER_CACHE_TTL=60)
+class CachedJWTAuthenticationTest(APITestCase):
+    """Test the per-token user cache of JWT authentication."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='admin', password='test123')
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def user_queries(self, method='get'):
+        """Make a request and return (status code, number of user lookups)."""
+        with CaptureQueriesContext(connection) as ctx:
+            if method == 'get':
+                response = self.client.get('/api/statuses/')
+            else:
+                response = self.client.post('/api/statuses/', {'name': 'New', 'color': '#000000'})
+        lookups = [q for q in ctx.captured_queries if 'FROM "auth_user"' in q['sql']]
+        return response.status_code, len(lookups)
+    
+    def test_user_is_cached_per_token(self):
+        """Test only the first request of a token loads the user."""
+        self.assertEqual(self.user_queries(), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.user_queries(), (status.HTTP_200_OK, 0))
+    
+    def test_cached_user_fields(self):
+        """Test the cached user holds no password and saving it keeps the other fields."""
+        from .authentication import CachedJWTAuthentication
+        
+        token = AccessToken.for_user(self.user)
+        authentication = CachedJWTAuthentication()
+        authentication.get_user(token)
+        entries = [value for key, value in cache._cache.items() if ':jwt-user:' in key and ':gen:' not in key]
+        self.assertEqual(len(entries), 1)
+        self.assertNotIn(b'pbkdf2', entries[0])
+        
+        with self.assertNumQueries(0):
+            user = authentication.get_user(token)
+        self.assertEqual((user.pk, user.username, user.is_active), (self.user.pk, 'admin', True))
+        self.assertIn('password', user.get_deferred_fields())
+        user.is_staff = True
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('test123'))
+    
+    def test_deactivation_invalidates(self):
+        """Test a deactivated user is rejected despite the cache."""
+        self.user_queries()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.user_queries()[0], status.HTTP_401_UNAUTHORIZED)
+    
+    def test_password_change_invalidates(self):
+        """Test a password change reloads the user."""
+        self.user_queries()
+        self.user.set_password('changed456')
+        self.user.save()
+        self.assertEqual(self.user_queries(), (status.HTTP_200_OK, 1))
+    
+    @override_settings(JWT_CLAIMS_ONLY_READS=True)
+    def test_claims_only_reads(self):
+        """Test reads can be served from token claims without a lookup."""
+        self.assertEqual(self.user_queries(), (status.HTTP_200_OK, 0))
+        self.assertEqual(self.user_queries('post'), (status.HTTP_201_CREATED, 1))
+
+
+def throttle_rates(**rates):
+    """Override some DEFAULT_THROTTLE_RATES scopes."""
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates},
+    })
+
+
+@throttle_rates(board='3/min', writes='2/min', auth='2/min')
+class TokenBucketThrottleTest(APITestCase):
+    """Test the token bucket throttle scopes and conditional GET."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        self.clock = mock.Mock(return_value=1000.0)
+        timer = mock.patch.object(TokenBucketThrottle, 'timer', self.clock)
+        timer.start()
+        self.addCleanup(timer.stop)
+        
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.status = Status.objects.create(name='Ready', color='#22c55e')
+        self.employee = Employee.objects.create(name='Test Employee')
+    
+    def get_statuses(self, **headers):
+        return self.client.get('/api/statuses/', headers=headers)
+    
+    def test_burst_then_refill(self):
+        """Test a full bucket allows a burst and then refills over time."""
+        for _ in range(3):
+            self.assertEqual(self.get_statuses().status_code, status.HTTP_200_OK)
+        response = self.get_statuses()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '20')
+        
+        self.clock.return_value += 20
+        self.assertEqual(self.get_statuses().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_statuses().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    def test_scopes_are_separate(self):
+        """Test exhausting writes leaves board reads available."""
+        url = f'/api/employees/{self.employee.id}/change_status/'
+        for _ in range(2):
+            response = self.client.post(url, {'status_id': self.status.id})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {'status_id': self.status.id})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.get_statuses().status_code, status.HTTP_200_OK)
+    
+    def test_not_modified_is_free(self):
+        """Test polls answered with 304 give their token back."""
+        etag = self.get_statuses()['ETag']
+        for _ in range(10):
+            response = self.get_statuses(if_none_match=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(response.content, b'')
+        
+        # A change yields a new body and a new ETag, charged as usual
+        Status.objects.create(name='Break', color='#f59e0b')
+        response = self.get_statuses(if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.get_statuses().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_statuses().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    def test_auth_throttled_by_client_ip(self):
+        """Test login attempts are limited per client IP."""
+        self.client.force_authenticate(user=None)
+        credentials = {'username': 'admin', 'password': 'wrong'}
+        for _ in range(2):
+            response = self.client.post('/api/auth/login/', credentials)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post('/api/auth/login/', credentials)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.client.post('/api/auth/refresh/', {'refresh': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class ImportHistoryTest(TestCase):
+    """Test the import_history management command."""
+    
+    HEADER = 'employee_email,employee_name,status,start_time,end_time,planned_end_time,notes\n'
+    
+    def setUp(self):
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+    
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def run_import(self, path, *args):
+        out = io.StringIO()
+        call_command('import_history', path, *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+    
+    def test_import_csv(self):
+        """Test logs are imported with their times and overdue durations."""
+        path = self.write('history.csv', self.HEADER + (
+            'ann@example.com,Ann,Ready,2024-01-01T08:00:00Z,2024-01-01T12:00:00Z,,\n'
+            'ann@example.com,Ann,Repair,2024-01-01T12:00:00Z,2024-01-01T15:00:00Z,2024-01-01T14:00:00Z,late\n'
+            'ann@example.com,Ann,Ready,2024-01-01T15:00:00Z,,,\n'
+        ))
+        output = self.run_import(path, '--create-employees')
+        self.assertIn('rows/sec', output)
+        
+        employee = Employee.objects.get(email='ann@example.com')
+        logs = list(employee.status_logs.order_by('start_time'))
+        self.assertEqual([log.status for log in logs], [self.ready, self.repair, self.ready])
+        self.assertEqual(logs[0].start_time.isoformat(), '2024-01-01T08:00:00+00:00')
+        self.assertEqual(logs[1].overdue_duration, 3600)
+        self.assertEqual(logs[1].notes, 'late')
+        self.assertIsNone(logs[2].end_time)
+        self.assertTrue(StatusChangeJournal.objects.filter(
+            employee_id=employee.id, kind=StatusChangeJournal.KIND_STATUS_CHANGE
+        ).exists())
+        self.assertFalse(os.path.exists(path + '.progress'))
+    
+    def test_overlaps_are_rejected(self):
+        """Test overlapping and second open logs reject the whole chunk."""
+        employee = Employee.objects.create(name='Ann', email='ann@example.com')
+        StatusLog.objects.create(employee=employee, status=self.ready)
+        cases = [
+            'ann@example.com,,Ready,2024-01-01T08:00:00Z,,,\n',
+            'ann@example.com,,Ready,2024-01-01T08:00:00Z,2024-01-01T12:00:00Z,,\n'
+            'ann@example.com,,Repair,2024-01-01T11:00:00Z,2024-01-01T13:00:00Z,,\n',
+        ]
+        for rows in cases:
+            path = self.write('history.csv', self.HEADER + rows)
+            with self.assertRaises(CommandError):
+                self.run_import(path)
+        self.assertEqual(StatusLog.objects.count(), 1)
+        
+        # Skipping invalid rows imports the rest
+        self.run_import(path, '--skip-invalid', '--restart')
+        self.assertEqual(StatusLog.objects.count(), 2)
+    
+    def test_unknown_employee_and_status(self):
+        """Test rows must name existing statuses and (by default) employees."""
+        for row in (
+            'nobody@example.com,Nobody,Ready,2024-01-01T08:00:00Z,,,\n',
+            ',Ann,Lunch,2024-01-01T08:00:00Z,,,\n',
+        ):
+            path = self.write('history.csv', self.HEADER + row)
+            with self.assertRaises(CommandError):
+                self.run_import(path)
+        self.assertFalse(Employee.objects.exists())
+    
+    def test_resume_ndjson(self):
+        """Test a rerun continues after the rows of committed chunks."""
+        rows = [
+            {'employee_name': 'Ann', 'status': 'Ready', 'start_time': f'2024-01-0{day}T08:00:00Z',
+             'end_time': f'2024-01-0{day}T16:00:00Z'}
+            for day in range(1, 6)
+        ]
+        rows[3]['status'] = 'Lunch'
+        path = self.write('history.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+        with self.assertRaises(CommandError):
+            self.run_import(path, '--create-employees', '--chunk-size', '2')
+        self.assertEqual(StatusLog.objects.count(), 2)
+        with open(path + '.progress') as f:
+            self.assertEqual(json.load(f)['rows'], 2)
+        
+        rows[3]['status'] = 'Ready'
+        self.write('history.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+        output = self.run_import(path, '--create-employees', '--chunk-size', '2')
+        self.assertIn('Resuming after 2 rows', output)
+        self.assertEqual(StatusLog.objects.count(), 5)
+        self.assertEqual(Employee.objects.count(), 1)
+    
+    def test_resume_settles_interrupted_commit(self):
+        """Test a chunk committed just before a crash is not imported twice."""
+        path = self.write('history.csv', self.HEADER + (
+            'ann@example.com,Ann,Ready,2024-01-01T08:00:00Z,2024-01-01T12:00:00Z,,\n'
+            'ann@example.com,Ann,Ready,2024-01-02T08:00:00Z,2024-01-02T12:00:00Z,,\n'
+        ))
+        self.run_import(path, '--create-employees', '--chunk-size', '1')
+        first = StatusLog.objects.order_by('start_time').first()
+        # As left by a crash after the second chunk committed
+        with open(path + '.progress', 'w') as f:
+            json.dump({'rows': 1, 'pending': {'rows': 2, 'first_log': {
+                'employee_id': first.employee_id,
+                'status_id': first.status_id,
+                'start_time': '2024-01-02T08:00:00+00:00',
+            }}}, f)
+        output = self.run_import(path)
+        self.assertIn('Resuming after 2 rows', output)
+        self.assertEqual(StatusLog.objects.count(), 2)
+
+
+class CheckStatusLogsTest(TestCase):
+    """Test the check_status_logs integrity scanner."""
+    
+    def setUp(self):
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.broken = Employee.objects.create(name='Broken')
+        self.clean = Employee.objects.create(name='Clean')
+        self.base = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        
+        # Stale overdue duration, overlapping the next log by 30 minutes
+        self.late = self.log(self.broken, 0, 240, planned=180, status_obj=self.repair)
+        self.overlapped = self.log(self.broken, 210, 300)
+        # An hour's gap, then two open logs
+        self.stale_open = self.log(self.broken, 360, None)
+        self.newest = self.log(self.broken, 361, None)
+        # Closed half an hour late but saved with no overdue duration
+        self.stale_overdue = self.log(self.clean, 0, 60, planned=30)
+        self.log(self.clean, 60, None)
+    
+    def log(self, employee, start, end, planned=None, status_obj=None):
+        at = lambda minutes: None if minutes is None else self.base + timedelta(minutes=minutes)
+        return StatusLog.objects.create(
+            employee=employee,
+            status=status_obj or self.ready,
+            start_time=at(start),
+            end_time=at(end),
+            planned_end_time=at(planned),
+        )
+    
+    def run_check(self, *args):
+        out = io.StringIO()
+        call_command('check_status_logs', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_check_reports_issues(self):
+        """Test each kind of issue is reported and nothing is changed without --repair."""
+        output = self.run_check()
+        self.assertIn(f'overlap: employee {self.broken.id}, log {self.late.id}', output)
+        self.assertIn(f'gap: employee {self.broken.id}, log {self.overlapped.id}', output)
+        self.assertIn(f'multiple_open: employee {self.broken.id}, log {self.stale_open.id}', output)
+        self.assertIn(f'overdue_mismatch: employee {self.clean.id}, log {self.stale_overdue.id}', output)
+        self.assertIn('logs/sec', output)
+        self.assertIn('Found 4 issues (1 gap, 1 overlap, 1 multiple_open, 1 overdue_mismatch)', output)
+        self.late.refresh_from_db()
+        self.assertEqual(self.late.end_time, self.base + timedelta(minutes=240))
+    
+    def test_pages_and_batches(self):
+        """Test one-log pages and one-repair transactions give the same result."""
+        self.log(self.clean, 60, 61)
+        output = self.run_check('--page-size', '1', '--show', '2')
+        self.assertIn('Found 5 issues (1 gap, 2 overlap, 1 multiple_open, 1 overdue_mismatch)', output)
+        self.assertIn('3 more issues not listed', output)
+        
+        self.run_check('--repair', '--page-size', '1', '--batch-size', '1')
+        self.assertIn('Found 1 issues (1 gap,', self.run_check())
+    
+    def test_repair(self):
+        """Test overlaps are closed at the next start and overdue durations recomputed."""
+        before = timezone.now()
+        output = self.run_check('--repair')
+        self.assertIn('repaired 3 logs', output)
+        
+        self.late.refresh_from_db()
+        self.assertEqual(self.late.end_time, self.overlapped.start_time)
+        self.assertEqual(self.late.overdue_duration, 30 * 60)
+        self.assertGreaterEqual(self.late.updated_at, before)
+        self.stale_open.refresh_from_db()
+        self.assertEqual(self.stale_open.end_time, self.newest.start_time)
+        self.assertEqual(self.broken.get_current_status_log(), self.newest)
+        self.stale_overdue.refresh_from_db()
+        self.assertEqual(self.stale_overdue.overdue_duration, 30 * 60)
+        self.assertEqual(
+            sorted(StatusChangeJournal.objects.values_list('kind', 'employee_id')),
+            [(StatusChangeJournal.KIND_LOG_UPDATE, self.broken.id), (StatusChangeJournal.KIND_LOG_UPDATE, self.clean.id)],
+        )
+        
+        # Only the gap is left: there is nothing to fill it with
+        self.assertIn('Found 1 issues (1 gap, 0 overlap, 0 multiple_open, 0 overdue_mismatch)', self.run_check())
+    
+    def test_repair_skips_logs_saved_since_read(self):
+        """Test a log changed after the scan read it is not overwritten."""
+        scanner = log_integrity.LogScanner()
+        _, repairs = scanner.feed(StatusLog.objects.filter(pk=self.late.pk).values_list(*log_integrity.COLUMNS))
+        self.assertEqual(len(repairs), 1)
+        self.late.notes = 'Edited'
+        self.late.save()
+        
+        self.assertEqual(log_integrity.repair(repairs), 0)
+        self.late.refresh_from_db()
+        self.assertEqual(self.late.overdue_duration, 0)
+        self.assertFalse(StatusChangeJournal.objects.exists())
+
+
+class RecomputeDerivedFieldsTest(TestCase):
+    """Test the bulk recompute of derived status log fields."""
+    
+    def setUp(self):
+        self.status = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.late_employee = Employee.objects.create(name='Late')
+        self.on_time_employee = Employee.objects.create(name='On time')
+        start = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        self.late = self.log(self.late_employee, start, start + timedelta(minutes=90), start + timedelta(minutes=60))
+        self.open = self.log(self.late_employee, start + timedelta(minutes=90), None, start + timedelta(minutes=120))
+        self.on_time = self.log(self.on_time_employee, start, start + timedelta(minutes=30), start + timedelta(minutes=60))
+        # Stored wrong: the log was closed on time
+        StatusLog.objects.filter(pk=self.on_time.pk).update(overdue_duration=600)
+        self.saved_at = {log.pk: log.updated_at for log in StatusLog.objects.all()}
+    
+    def log(self, employee, start, end, planned):
+        return StatusLog.objects.create(
+            employee=employee, status=self.status, start_time=start, end_time=end, planned_end_time=planned,
+        )
+    
+    def run_recompute(self, *args):
+        out = io.StringIO()
+        call_command('recompute_derived_fields', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_recomputes_stale_values(self):
+        """Test stale values are fixed, only changed logs are touched and journaled."""
+        output = self.run_recompute()
+        self.assertIn('Changed 2 overdue_duration', output)
+        
+        overdue = dict(StatusLog.objects.values_list('pk', 'overdue_duration'))
+        self.assertEqual(overdue, {self.late.pk: 30 * 60, self.open.pk: 0, self.on_time.pk: 0})
+        self.open.refresh_from_db()
+        self.assertEqual(self.open.updated_at, self.saved_at[self.open.pk])
+        self.late.refresh_from_db()
+        self.assertGreater(self.late.updated_at, self.saved_at[self.late.pk])
+        self.assertEqual(
+            sorted(StatusChangeJournal.objects.values_list('kind', 'employee_id')),
+            [(StatusChangeJournal.KIND_LOG_UPDATE, self.late_employee.id),
+             (StatusChangeJournal.KIND_LOG_UPDATE, self.on_time_employee.id)],
+        )
+        
+        self.assertIn('Changed 0 overdue_duration', self.run_recompute())
+    
+    def test_dry_run_and_chunks(self):
+        """Test --dry-run changes nothing and one-id chunks give the same result."""
+        self.assertIn('Would change 2 overdue_duration', self.run_recompute('--dry-run'))
+        self.assertEqual(StatusLog.objects.get(pk=self.on_time.pk).overdue_duration, 600)
+        self.assertFalse(StatusChangeJournal.objects.exists())
+        
+        output = self.run_recompute('--chunk-size', '1', '--verbosity', '2')
+        self.assertIn('ids/sec', output)
+        self.assertIn('Changed 2 overdue_duration', output)
+        
+        self.assertEqual(recompute.recompute(first_id=self.on_time.pk), {'overdue_duration': 0})
+        with self.assertRaises(ValueError):
+            recompute.recompute(fields=['notes'])
+    
+    def test_celery_task(self):
+        """Test the task recomputes in the worker process."""
+        from . import tasks
+        
+        result = tasks.recompute_derived_fields.apply().get()
+        self.assertEqual(result, 'Recomputed derived fields: 2 overdue_duration rows changed.')
+        self.assertEqual(StatusLog.objects.get(pk=self.on_time.pk).overdue_duration, 0)
+    
+    def test_unsupported_database(self):
+        """Test a database without SQL for the expressions is refused at startup."""
+        from django.core.exceptions import ImproperlyConfigured
+        from django.db import NotSupportedError
+        from .expressions import SecondsBetween, check_database_backends
+        
+        check_database_backends()
+        queryset = StatusLog.objects.annotate(seconds=SecondsBetween('end_time', 'start_time'))
+        compiler = queryset.query.get_compiler(using='default')
+        with mock.patch.object(type(connections['default']), 'vendor', 'oracle'):
+            with self.assertRaisesMessage(ImproperlyConfigured, "'default' (oracle)"):
+                check_database_backends()
+            with self.assertRaisesMessage(NotSupportedError, 'SecondsBetween has no SQL for the oracle backend'):
+                queryset.query.annotations['seconds'].as_sql(compiler, connection)
+
+
+class BulkEmployeeAPITest(APITestCase):
+    """Test the bulk create/update/deactivate endpoints."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.client.force_authenticate(user=self.user)
+        self.status = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.existing = Employee.objects.create(name='Existing', email='taken@example.com')
+    
+    def post(self, action, data):
+        response = self.client.post(f'/api/employees/{action}/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_bulk_create(self):
+        """Test valid items are created and invalid ones reported per item."""
+        data = self.post('bulk_create', [
+            {'name': 'Ann', 'email': 'ann@example.com'},
+            {'name': 'Bob', 'email': 'taken@example.com'},
+            {'email': 'noname@example.com'},
+            {'name': 'Ann Again', 'email': 'ann@example.com'},
+            {'name': 'Cid', 'email': ''},
+        ])
+        self.assertEqual(
+            [result['status'] for result in data['results']],
+            ['created', 'error', 'error', 'error', 'created'],
+        )
+        self.assertIn('email', data['results'][1]['errors'])
+        self.assertIn('name', data['results'][2]['errors'])
+        self.assertEqual(data['counts'], {'created': 2, 'error': 3})
+        self.assertEqual(Employee.objects.get(pk=data['results'][0]['id']).name, 'Ann')
+        self.assertIsNone(Employee.objects.get(pk=data['results'][4]['id']).email)
+        self.assertEqual(StatusChangeJournal.objects.filter(
+            kind=StatusChangeJournal.KIND_EMPLOYEE_CREATE).count(), 2)
+    
+    def test_bulk_create_queries_do_not_grow(self):
+        """Test validation and writes take the same queries for any batch size."""
+        def queries(count, offset):
+            items = [{'name': f'E{i}', 'email': f'e{i}@example.com'} for i in range(offset, offset + count)]
+            with CaptureQueriesContext(connection) as ctx:
+                self.post('bulk_create', items)
+            return len(ctx.captured_queries)
+        self.assertEqual(queries(2, 0), queries(50, 100))
+    
+    def test_bulk_update(self):
+        """Test names/emails are updated in one pass with per-item errors."""
+        other = Employee.objects.create(name='Other')
+        before = other.updated_at
+        data = self.post('bulk_update', [
+            {'id': other.id, 'name': 'Renamed', 'email': 'new@example.com'},
+            {'id': self.existing.id, 'name': 'Existing 2'},
+            {'id': other.id, 'email': 'taken@example.com'},
+            {'id': 999999, 'name': 'Ghost'},
+            {'name': 'No id'},
+        ])
+        self.assertEqual(
+            [result['status'] for result in data['results']],
+            ['updated', 'updated', 'error', 'error', 'error'],
+        )
+        other.refresh_from_db()
+        self.existing.refresh_from_db()
+        self.assertEqual((other.name, other.email), ('Renamed', 'new@example.com'))
+        self.assertGreater(other.updated_at, before)
+        self.assertEqual((self.existing.name, self.existing.email), ('Existing 2', 'taken@example.com'))
+    
+    def test_bulk_deactivate_closes_open_logs(self):
+        """Test deactivation closes open logs with their overdue duration."""
+        now = timezone.now()
+        overdue = StatusLog.objects.create(
+            employee=self.existing, status=self.status,
+            start_time=now - timedelta(hours=3), planned_end_time=now - timedelta(hours=1),
+        )
+        on_time = Employee.objects.create(name='On Time')
+        open_log = StatusLog.objects.create(
+            employee=on_time, status=self.status, planned_end_time=now + timedelta(hours=1),
+        )
+        inactive = Employee.objects.create(name='Gone', is_active=False)
+        
+        response = self.client.post('/api/employees/bulk_deactivate/', {
+            'ids': [self.existing.id, on_time.id, inactive.id, 999999],
+        }, format='json')
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['deactivated', 'deactivated', 'unchanged', 'error'],
+        )
+        self.assertEqual(response.data['closed_logs'], 2)
+        
+        overdue.refresh_from_db()
+        open_log.refresh_from_db()
+        self.existing.refresh_from_db()
+        self.assertFalse(self.existing.is_active)
+        self.assertEqual(self.existing.deleted_at, overdue.end_time)
+        overdue.calculate_and_save_overdue_duration()
+        expected = overdue.overdue_duration
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.overdue_duration, expected)
+        self.assertGreaterEqual(expected, 3600)
+        self.assertIsNotNone(open_log.end_time)
+        self.assertEqual(open_log.overdue_duration, 0)
+        self.assertEqual(StatusChangeJournal.objects.filter(
+            kind=StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE).count(), 2)
+    
+    def test_bulk_rejects_malformed_requests(self):
+        """Test non-list bodies and oversized batches are rejected."""
+        response = self.client.post('/api/employees/bulk_create/', {'name': 'Ann'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(BULK_MAX_ITEMS=1):
+            response = self.client.post('/api/employees/bulk_deactivate/', {'ids': [1, 2]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class WorkerStartupTest(TestCase):
+    """Test lazy heavy imports and worker warm-up."""
+    
+    def test_views_do_not_import_report_dependencies(self):
+        """Test loading the URLconf leaves openpyxl, NumPy and Celery unloaded."""
+        code = (
+            'import sys, config.wsgi; '
+            'from django.urls import get_resolver; get_resolver().resolve("/api/employees/"); '
+            'print(sorted(m for m in ("openpyxl", "numpy", "celery") if m in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
+    
+    @override_settings(ALLOWED_HOSTS=['.example.com'])
+    def test_warm_up_command(self):
+        """Test warm-up runs the board reads successfully (with production hosts)."""
+        Status.objects.create(name='Ready', color='#22c55e')
+        Employee.objects.create(name='Test Employee')
+        out = io.StringIO()
+        call_command('warm_up', stdout=out)
+        self.assertEqual(out.getvalue().count('(200)'), 3)
+    
+    def test_failed_warm_up_leaves_worker_cold(self):
+        """Test the gunicorn hook logs a warm-up failure instead of killing the worker."""
+        import runpy
+        
+        with mock.patch.dict(os.environ):
+            hooks = runpy.run_path(os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+            worker = mock.Mock(pid=1234)
+            with mock.patch('employees.warmup.warm_up', side_effect=RuntimeError('database unreachable')):
+                hooks['post_worker_init'](worker)
+        worker.log.exception.assert_called_once()
+
+
+# The API with the async read routes in front, as served by config.asgi
+ASYNC_URLCONF = ModuleType('async_urlconf')
+ASYNC_URLCONF.urlpatterns = [path('api/', include(urls.async_urlpatterns + urls.urlpatterns))]
+
+
+class AsyncReadViewTest(TestCase):
+    """Test the async board, history and snapshot views against the sync ones."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.headers = {'authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        ready = Status.objects.create(name='Ready', color='#22c55e')
+        repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.employee = Employee.objects.create(name='Overdue', email='overdue@example.com')
+        closed = StatusLog.objects.create(employee=self.employee, status=ready, created_by=self.user)
+        closed.end_time = timezone.now()
+        closed.save()
+        StatusLog.objects.create(
+            employee=self.employee,
+            status=repair,
+            planned_end_time=timezone.now() - timedelta(minutes=5),
+        )
+        Employee.objects.create(name='Idle')
+        self.now = timezone.now()
+    
+    def sync_get(self, path, data=None, **headers):
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            return self.client.get(path, data, headers={**self.headers, **headers})
+    
+    def async_get(self, path, data=None, **headers):
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            with mock.patch('django.utils.timezone.now', return_value=self.now):
+                return async_to_sync(AsyncClient().get)(path, data, headers={**self.headers, **headers})
+    
+    def assertSameResponse(self, path, data=None):
+        expected = self.sync_get(path, data)
+        actual = self.async_get(path, data)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+        return actual
+    
+    def test_board_matches_sync_view(self):
+        """Test board pages, sparse fields and JSON/MessagePack match the sync view."""
+        response = self.assertSameResponse('/api/employees/')
+        self.assertEqual(response.json()['count'], 2)
+        self.assertSameResponse('/api/employees/', {'fields': 'id,name'})
+        self.assertSameResponse('/api/employees/', {'fields': 'current_status'})
+        self.assertSameResponse('/api/employees/', {'view': 'compact'})
+        self.assertSameResponse('/api/employees/', {'page': 'last'})
+        self.assertSameResponse('/api/employees/', {'page': 9})
+        if msgpack is not None:
+            self.assertSameResponse('/api/employees/', {'format': 'msgpack'})
+    
+    def test_history_and_snapshot_match_sync_view(self):
+        """Test history and snapshot (including their errors) match the sync views."""
+        response = self.assertSameResponse(f'/api/employees/{self.employee.id}/history/')
+        self.assertEqual(response.json()['count'], 2)
+        self.assertSameResponse('/api/employees/999/history/')
+        self.assertSameResponse('/api/employees/x/history/')
+        response = self.assertSameResponse('/api/employees/snapshot/', {'at': self.now.isoformat()})
+        self.assertEqual(response.json()['count'], 2)
+        self.assertSameResponse('/api/employees/snapshot/', {'at': 'yesterday'})
+    
+    def test_authentication_and_conditional_requests(self):
+        """Test 401s, 304s and the browsable API on the async routes."""
+        response = self.async_get('/api/employees/', authorization='')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+        
+        response = self.async_get('/api/employees/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        not_modified = self.async_get('/api/employees/', if_none_match=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = self.async_get('/api/employees/', accept='text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'Overdue', response.content)
+    
+    def test_writes_run_the_sync_view(self):
+        """Test a POST to an async route creates the employee."""
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = async_to_sync(AsyncClient().post)(
+                '/api/employees/', {'name': 'New'}, content_type='application/json',
+                headers=self.headers,
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Employee.objects.filter(name='New').exists())
+    
+    def test_live_board_with_shipped_asgi_config(self):
+        """Test with config.asgi's settings the board list is served by the async view."""
+        import runpy
+        
+        from .async_views import AsyncEmployeeViewSet
+        
+        with mock.patch.dict(os.environ):
+            os.environ.pop('LIVE_BOARD', None)
+            os.environ.pop('ASYNC_READ_VIEWS', None)
+            runpy.run_path(os.path.join(settings.BASE_DIR, 'config', 'asgi.py'))
+            shipped = {name: os.environ[name] == 'True' for name in ('LIVE_BOARD', 'ASYNC_READ_VIEWS')}
+        self.assertEqual(shipped, {'LIVE_BOARD': True, 'ASYNC_READ_VIEWS': True})
+        
+        live_board.board.reset()
+        self.addCleanup(live_board.board.reset)
+        with override_settings(LIVE_BOARD=shipped['LIVE_BOARD'], JWT_USER_CACHE_TTL=60), \
+                mock.patch.object(AsyncEmployeeViewSet, 'list', side_effect=AssertionError('sync list')):
+            response = self.assertSameResponse('/api/employees/')
+            self.assertEqual(response.json()['count'], 2)
+            self.assertSameResponse('/api/employees/', {'fields': 'id,name'})
+            not_modified = self.async_get('/api/employees/', if_none_match=response['ETag'])
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+            # Loaded: further reads are served from memory
+            self.async_get('/api/employees/')
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.async_get('/api/employees/').status_code, status.HTTP_200_OK)
+            self.assertEqual(len(queries), 0)
+    
+    @override_settings(COMPRESSION_MIN_SIZE=1)
+    def test_async_responses_are_compressed(self):
+        """Test the compression middleware also runs in the async stack."""
+        expected = self.sync_get('/api/employees/')
+        response = self.async_get('/api/employees/', accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), expected.content)
+
+
+@override_settings(LIVE_BOARD=True, LIVE_BOARD_CHECK_SECONDS=0)
+class LiveBoardTest(TestCase):
+    """Test the in-memory live board against the database read path."""
+    
+    def setUp(self):
+        TokenBucketThrottle.buckets.clear()
+        self.addCleanup(TokenBucketThrottle.buckets.clear)
+        live_board.board.reset()
+        self.addCleanup(live_board.board.reset)
+        self.user = User.objects.create_user(username='admin', password='test123')
+        self.headers = {'authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        self.ready = Status.objects.create(name='Ready', color='#22c55e')
+        self.repair = Status.objects.create(name='Repair', color='#3b82f6', has_end_time=True)
+        self.first = Employee.objects.create(name='First', email='first@example.com')
+        self.second = Employee.objects.create(name='Second')
+        StatusLog.objects.create(
+            employee=self.first,
+            status=self.repair,
+            planned_end_time=timezone.now() - timedelta(minutes=5),
+            notes='Engine',
+        )
+        self.now = timezone.now().replace(microsecond=0)
+    
+    def get(self, path, data=None, **headers):
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            return self.client.get(path, data, headers={**self.headers, **headers})
+    
+    def change_status(self, employee, status_obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                f'/api/employees/{employee.id}/change_status/',
+                {'status_id': status_obj.id},
+                content_type='application/json',
+                headers=self.headers,
+            )
+    
+    def assertMatchesDatabase(self, data=None):
+        response = self.get('/api/employees/', data)
+        with self.settings(LIVE_BOARD=False):
+            expected = self.get('/api/employees/', data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        return response
+    
+    def test_list_matches_database(self):
+        """Test board pages and sparse fields match the database read path."""
+        response = self.assertMatchesDatabase()
+        self.assertEqual([row['name'] for row in response.json()['results']], ['First', 'Second'])
+        self.assertMatchesDatabase({'fields': 'id,current_status'})
+        if msgpack is not None:
+            self.assertMatchesDatabase({'format': 'msgpack'})
+        self.assertMatchesDatabase({'page': 'last'})
+    
+    def test_order_follows_database(self):
+        """Test the board is in the database's order (collation, ties by id), also after renames."""
+        for name in ('émile', 'Zoe', 'adam', 'Second', 'Émile'):
+            Employee.objects.create(name=name)
+        response = self.assertMatchesDatabase()
+        expected = list(Employee.objects.filter(is_active=True).values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in response.json()['results']], expected)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Employee.objects.filter(pk=self.first.pk).update(name='zz', updated_at=timezone.now())
+            journal.record(StatusChangeJournal.KIND_EMPLOYEE_UPDATE, self.first.id)
+        ids = [row['id'] for row in self.assertMatchesDatabase().json()['results']]
+        self.assertEqual(ids, list(Employee.objects.filter(is_active=True).values_list('id', flat=True)))
+        self.assertNotEqual(ids, expected)
+        
+        # Whatever the database's collation, the board takes its order
+        live_board.board.reset()
+        with mock.patch.object(live_board, 'read_order', return_value=expected[::-1]):
+            _, rows, _ = live_board.board.current().snapshot()
+        self.assertEqual([row[0] for row in rows], expected[::-1])
+    
+    # With the user cached too, as with a shared cache in production
+    @override_settings(LIVE_BOARD_CHECK_SECONDS=60, JWT_USER_CACHE_TTL=60)
+    def test_reads_do_not_query_once_loaded(self):
+        """Test a loaded board serves the list without touching the database."""
+        self.get('/api/employees/')
+        with self.assertNumQueries(0):
+            response = self.get('/api/employees/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    @override_settings(LIVE_BOARD_CHECK_SECONDS=60)
+    def test_change_events_update_board(self):
+        """Test journaled writes of this process reach the board on commit."""
+        self.get('/api/employees/')
+        self.change_status(self.second, self.ready)
+        Employee.objects.create(name='Third')
+        self.first.soft_delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            journal.record(StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE, self.first.id)
+        
+        response = self.get('/api/employees/')
+        names = [row['name'] for row in response.json()['results']]
+        self.assertEqual(names, ['Second'])
+        self.assertEqual(response.json()['results'][0]['current_status']['status_name'], 'Ready')
+    
+    def test_version_check_catches_other_processes(self):
+        """Test changes journaled by another process are read at the next check."""
+        self.get('/api/employees/')
+        StatusLog.objects.create(employee=self.second, status=self.ready)
+        StatusChangeJournal.objects.create(
+            kind=StatusChangeJournal.KIND_STATUS_CHANGE, employee_id=self.second.id
+        )
+        self.assertMatchesDatabase()
+        
+        Status.objects.filter(pk=self.ready.pk).update(name='Available', updated_at=timezone.now())
+        response = self.assertMatchesDatabase()
+        self.assertEqual(response.json()['results'][1]['current_status']['status_name'], 'Available')
+    
+    def test_reconcile_logs_drift(self):
+        """Test an unjournaled write is found, logged and repaired by reconciliation."""
+        live_board.board.current()
+        Employee.objects.filter(pk=self.second.pk).update(name='Renamed')
+        with self.assertLogs('employees.live_board', 'WARNING') as logs:
+            drifted = live_board.board.reconcile()
+        self.assertEqual(drifted, {self.second.id})
+        self.assertIn(str(self.second.id), logs.output[0])
+        self.assertEqual(live_board.board.reconcile(), set())
+        self.assertMatchesDatabase()
+    
+    def test_freed_slots_are_reused(self):
+        """Test employees leaving and joining the board reuse its slots."""
+        board = live_board.board.current()
+        slots = len(board.ids)
+        self.second.soft_delete()
+        Employee.objects.create(name='Third')
+        with self.assertLogs('employees.live_board', 'WARNING'):
+            board.reconcile()
+        self.assertEqual(len(board), 2)
+        self.assertEqual(len(board.ids), slots)
+    
+    def test_not_modified_without_serializing(self):
+        """Test a matching If-None-Match is answered before any row is serialized."""
+        etag = self.get('/api/employees/')['ETag']
+        with mock.patch.object(live_board, 'serialize', side_effect=AssertionError):
+            response = self.get('/api/employees/', if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        
+        self.change_status(self.second, self.ready)
+        self.assertNotEqual(self.get('/api/employees/')['ETag'], etag)
+    
+    def test_changes_served_from_board(self):
+        """Test delta sync rows come from the board and match the database path."""
+        version = journal.latest_seq()
+        self.change_status(self.second, self.ready)
+        
+        with self.settings(STATUS_JOURNAL_SETTLE_SECONDS=0):
+            response = self.get('/api/employees/changes/', {'since': version})
+            with self.settings(LIVE_BOARD=False):
+                expected = self.get('/api/employees/changes/', {'since': version})
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual([row['id'] for row in response.json()['changed']], [self.second.id])
@@ -0,0 +1,116 @@
+"""
+Token bucket throttling for Employee Status Tracking System API.
+
+Each (scope, user or client IP) key owns a bucket holding up to N tokens
+that refills at N per period, for a rate of ``N/period`` in
+DEFAULT_THROTTLE_RATES. A request takes one token, so clients can burst up
+to N requests and then sustain the rate. State is two numbers per key kept
+in process memory: checking a request is O(1) with no cache round trip.
+Limits therefore apply per worker process.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle requests by the view's scope with an in-memory token bucket.
+
+    The scope comes from ``view.get_throttle_scope(request)`` when defined,
+    else ``view.throttle_scope``; views without a scope are not throttled.
+    Tokens taken by a request can be given back with ``refund()``, e.g. when
+    it is answered with 304 Not Modified.
+    """
+    timer = time.monotonic
+
+    # key -> (tokens, last refill time), least recently used first
+    buckets = OrderedDict()
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.key = None
+        self.wait_seconds = None
+
+    def get_scope(self, request, view):
+        get_throttle_scope = getattr(view, 'get_throttle_scope', None)
+        if get_throttle_scope is not None:
+            return get_throttle_scope(request)
+        return getattr(view, 'throttle_scope', None)
+
+    def get_rate(self, scope):
+        """Return ``(capacity, tokens per second)`` for `scope`, or None."""
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return None
+        num, period = rate.split('/')
+        seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        return int(num), int(num) / seconds
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = self.get_rate(scope) if scope else None
+        if rate is None:
+            return True
+        self.capacity, self.refill_rate = rate
+
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        self.key = f'{scope}:{ident}'
+
+        if not self.take(self.key, self.capacity, self.refill_rate):
+            return False
+        # Remember the charge so the view can refund it
+        charges = getattr(request, 'throttle_charges', None)
+        if charges is None:
+            charges = request.throttle_charges = []
+        charges.append(self)
+        return True
+
+    def take(self, key, capacity, refill_rate):
+        """Take one token from the bucket of `key`; False if it is empty."""
+        now = self.timer()
+        with self.lock:
+            tokens, stamp = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                self.wait_seconds = (1 - tokens) / refill_rate
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > settings.THROTTLE_MAX_KEYS:
+                # A forgotten bucket simply starts full again
+                self.buckets.popitem(last=False)
+        return allowed
+
+    def refund(self):
+        """Give back the token taken by ``allow_request()``."""
+        with self.lock:
+            bucket = self.buckets.get(self.key)
+            if bucket is not None:
+                self.buckets[self.key] = (min(self.capacity, bucket[0] + 1), bucket[1])
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ReadWriteScopeMixin:
+    """
+    Throttle safe-method requests under ``read_throttle_scope`` and the
+    others under ``write_throttle_scope``.
+    """
+    read_throttle_scope = 'board'
+    write_throttle_scope = 'writes'
+
+    def get_throttle_scope(self, request):
+        if request.method in SAFE_METHODS:
+            return self.read_throttle_scope
+        return self.write_throttle_scope
@@ -1,8 +1,10 @@
 """
 URL configuration for employees app.
 """
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
+from .async_views import AsyncEmployeeViewSet
 from .views import EmployeeViewSet, StatusViewSet, ReportViewSet
 
 router = DefaultRouter()
@@ -13,3 +15,31 @@ router.register(r'reports', ReportViewSet, basename='report')
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+# Async versions of the router's read routes, matched first under ASGI
+async_urlpatterns = [
+    re_path(
+        r'^employees/$',
+        AsyncEmployeeViewSet.as_async_view(
+            {'get': 'list', 'post': 'create'}, basename='employee', detail=False
+        ),
+        name='employee-list',
+    ),
+    re_path(
+        r'^employees/snapshot/$',
+        AsyncEmployeeViewSet.as_async_view(
+            {'get': 'snapshot'}, basename='employee', detail=False
+        ),
+        name='employee-snapshot',
+    ),
+    re_path(
+        r'^employees/(?P<pk>[^/.]+)/history/$',
+        AsyncEmployeeViewSet.as_async_view(
+            {'get': 'history'}, basename='employee', detail=True
+        ),
+        name='employee-history',
+    ),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = async_urlpatterns + urlpatterns
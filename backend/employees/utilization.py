@@ -0,0 +1,172 @@
+"""
+Team utilization matrix: time per employee per status over a window.
+
+The logs overlapping the window are clipped to it and summed per
+(employee, status) in a single grouped query, on whole epoch seconds like
+``headcount``. Open logs run until now and logs stop counting when their
+employee was deleted. The grouped rows are scattered into employee x status
+matrices with NumPy.
+
+NumPy and openpyxl are imported by the functions that use them, so that
+importing the API views doesn't load them in every web worker.
+"""
+from io import BytesIO
+
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .expressions import EpochSeconds
+from .headcount import NEVER
+from .models import Status, StatusLog
+
+
+def grouped_rows(employees, start, end, now):
+    """
+    Clipped totals per (employee, status) of the `employees` queryset, as an int64 array.
+
+    Columns: employee id, status id, seconds in [`start`, `end`), overdue
+    seconds in that window and number of overlapping logs.
+    """
+    import numpy as np
+
+    start_epoch = int(start.timestamp())
+    end_epoch = int(end.timestamp())
+    clipped_start = Greatest(EpochSeconds('start_time'), Value(start_epoch))
+    clipped_end = Least(
+        Coalesce(EpochSeconds('end_time'), Value(int(now.timestamp()))),
+        Coalesce(EpochSeconds('employee__deleted_at'), Value(NEVER)),
+        Value(end_epoch),
+    )
+    overdue_start = Greatest(
+        Coalesce(EpochSeconds('planned_end_time'), Value(NEVER)), Value(start_epoch)
+    )
+    rows = (
+        StatusLog.objects
+        .filter(employee__in=employees.values('pk'), start_time__lt=end)
+        .filter(Q(end_time__isnull=True) | Q(end_time__gt=start))
+        .annotate(
+            seconds=Greatest(clipped_end - clipped_start, Value(0)),
+            overdue=Greatest(clipped_end - overdue_start, Value(0)),
+        )
+        .order_by()
+        .values('employee_id', 'status_id')
+        .annotate(
+            total_seconds=Sum('seconds'),
+            total_overdue=Sum('overdue'),
+            logs=Count('id'),
+        )
+        .values_list('employee_id', 'status_id', 'total_seconds', 'total_overdue', 'logs')
+    )
+    return np.array(list(rows), dtype=np.int64).reshape(-1, 5)
+
+
+def scatter(rows, employee_ids, status_ids):
+    """
+    Spread grouped rows into (employees x statuses) matrices.
+
+    `employee_ids` and `status_ids` must be sorted and contain every id in
+    `rows`. Returns ``(seconds, overdue, logs)``.
+    """
+    import numpy as np
+
+    shape = (len(employee_ids), len(status_ids))
+    employee_index = np.searchsorted(employee_ids, rows[:, 0])
+    status_index = np.searchsorted(status_ids, rows[:, 1])
+    matrices = []
+    for column in (2, 3, 4):
+        matrix = np.zeros(shape, dtype=np.int64)
+        # (employee, status) pairs are unique: plain assignment is enough
+        matrix[employee_index, status_index] = rows[:, column]
+        matrices.append(matrix)
+    return tuple(matrices)
+
+
+def utilization(employees, start, end, now):
+    """
+    Seconds per employee per status in [`start`, `end`).
+
+    `employees` is an Employee queryset. Columns are the active statuses plus
+    any seen in the window; each employee row holds ``seconds``,
+    ``overdue_seconds`` and ``logs`` aligned with them, and ``totals`` sums
+    the rows.
+    """
+    import numpy as np
+
+    rows = grouped_rows(employees, start, end, now)
+    employees = list(employees.order_by('pk').only('id', 'name'))
+    employee_ids = np.array([e.id for e in employees], dtype=np.int64)
+
+    statuses = list(
+        Status.objects
+        .filter(Q(is_active=True) | Q(pk__in=np.unique(rows[:, 1]).tolist()))
+        .order_by('pk')
+    )
+    status_ids = np.array([s.id for s in statuses], dtype=np.int64)
+    seconds, overdue, logs = scatter(rows, employee_ids, status_ids)
+
+    # Columns in display order, employees by name
+    columns = sorted(range(len(statuses)), key=lambda i: (statuses[i].display_order, statuses[i].name))
+    order = sorted(range(len(employees)), key=lambda i: (employees[i].name, employees[i].id))
+    seconds, overdue, logs = (matrix[np.ix_(order, columns)] for matrix in (seconds, overdue, logs))
+
+    return {
+        'statuses': [
+            {'id': statuses[i].id, 'name': statuses[i].name, 'color': statuses[i].color}
+            for i in columns
+        ],
+        'employees': [
+            {
+                'id': employees[i].id,
+                'name': employees[i].name,
+                'seconds': seconds[row].tolist(),
+                'total_seconds': int(seconds[row].sum()),
+                'overdue_seconds': overdue[row].tolist(),
+                'logs': logs[row].tolist(),
+            }
+            for row, i in enumerate(order)
+        ],
+        'totals': {
+            'seconds': seconds.sum(axis=0).tolist(),
+            'total_seconds': int(seconds.sum()),
+            'overdue_seconds': overdue.sum(axis=0).tolist(),
+            'logs': logs.sum(axis=0).tolist(),
+        },
+    }
+
+
+def build_excel(data):
+    """Render a utilization matrix into an Excel workbook of hours, returned as bytes."""
+    # Imported here: openpyxl is slow to import and only reports need it
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Utilization"
+
+    headers = ['Employee'] + [s['name'] for s in data['statuses']] + ['Total (hours)']
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    ws.append(headers)
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    def hours(seconds):
+        return [round(value / 3600, 2) for value in seconds]
+
+    for employee in data['employees']:
+        ws.append([employee['name']] + hours(employee['seconds'] + [employee['total_seconds']]))
+    totals = data['totals']
+    ws.append(['Total'] + hours(totals['seconds'] + [totals['total_seconds']]))
+    for cell in ws[ws.max_row]:
+        cell.font = Font(bold=True)
+
+    ws.column_dimensions['A'].width = min(max((len(e['name']) for e in data['employees']), default=8) + 2, 50)
+    ws.freeze_panes = 'B2'
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
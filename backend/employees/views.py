@@ -1,45 +1,352 @@
 """
 API Views for Employee Status Tracking System.
 """
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, serializers
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
+from django.db import transaction
+from django.db.models import Sum, Count, Q, Prefetch
 from django.http import HttpResponse
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 
-from .models import Employee, Status, StatusLog
+from . import (
+    bulk, fastpath, headcount, history_pages, journal, live_board, outbox, report_cache, reports, search,
+    snapshot, utilization,
+)
+from .conditional import ConditionalGetMixin, etag_matches
+from .models import Employee, Status, StatusLog, StatusChangeJournal
+from .renderers import ExcelRenderer, api_renderer_classes
+from .throttling import ReadWriteScopeMixin
 from .serializers import (
     EmployeeListSerializer,
+    CompactEmployeeSerializer,
     EmployeeDetailSerializer,
     StatusSerializer,
     StatusLogSerializer,
     ChangeStatusSerializer,
+    BulkDeactivateSerializer,
     EmployeeStatisticsSerializer,
+    ReportFilterSerializer,
 )
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, ReadWriteScopeMixin, viewsets.ModelViewSet):
     """
     ViewSet for Employee operations.
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = api_renderer_classes()
+    filter_backends = [search.FullTextSearchFilter]
     
     def get_queryset(self):
         """Get active employees only by default."""
         queryset = Employee.objects.filter(is_active=True)
-        return queryset.select_related().prefetch_related('status_logs__status')
+        # Load only the open log of each employee (not the whole history)
+        return queryset.prefetch_related(
+            Prefetch(
+                'status_logs',
+                queryset=StatusLog.objects.filter(end_time__isnull=True).select_related('status'),
+                to_attr='open_status_logs',
+            )
+        )
+    
+    def filter_queryset(self, queryset):
+        """Apply ``?search=`` to the list only: detail routes must still find their employee."""
+        if self.action != 'list':
+            return queryset
+        return super().filter_queryset(queryset)
+    
+    def is_compact(self):
+        """Whether the client asked for the compact board (``?view=compact``)."""
+        return self.request.query_params.get('view') == 'compact'
+    
+    def get_requested_fields(self):
+        """Parse the sparse fieldset from ``?fields=id,name,...``."""
+        fields = self.request.query_params.get('fields')
+        if not fields:
+            return None
+        return [name.strip() for name in fields.split(',') if name.strip()]
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'list':
+            if self.is_compact():
+                return CompactEmployeeSerializer
             return EmployeeListSerializer
         return EmployeeDetailSerializer
     
+    def get_serializer_context(self):
+        """Compute all rows of a response against one consistent "now"."""
+        context = super().get_serializer_context()
+        context['now'] = timezone.now()
+        return context
+    
+    def get_serializer(self, *args, **kwargs):
+        """Apply ``?fields=`` selection to the list serializers."""
+        if self.action == 'list':
+            kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List active employees with their current status.
+        
+        ``?fields=`` limits the row fields. ``?search=`` keeps employees
+        whose name or email matches (see ``employees.search``).
+        ``?view=compact`` returns raw start/planned times plus a single
+        ``server_time`` and a ``statuses`` dictionary referenced by
+        ``current_status.status_id``.
+        """
+        if not self.is_compact():
+            if live_board.is_enabled() and not request.query_params.get('search'):
+                return self.live_list()
+            if fastpath.is_enabled():
+                return self.fast_list()
+            return super().list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        employees = page if page is not None else list(queryset)
+        serializer = self.get_serializer(employees, many=True)
+        
+        statuses = {}
+        for employee in employees:
+            current_log = employee.get_current_status_log()
+            if current_log and current_log.status_id not in statuses:
+                statuses[current_log.status_id] = {
+                    'name': current_log.status.name,
+                    'color': current_log.status.color,
+                }
+        
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response({'results': serializer.data})
+        # Whole seconds keep the body stable between changes (and cacheable)
+        response.data['server_time'] = serializers.DateTimeField().to_representation(
+            serializer.context['now'].replace(microsecond=0)
+        )
+        response.data['statuses'] = {str(pk): data for pk, data in statuses.items()}
+        return response
+    
+    def fast_list(self):
+        """Serve the list from values_list() tuples (same output as the serializer)."""
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = fastpath.employee_list_queryset(queryset)
+        now = timezone.now()
+        fields = self.get_requested_fields()
+        
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = fastpath.serialize_employee_rows(page, now, fields)
+            return self.get_paginated_response(data)
+        return Response(fastpath.serialize_employee_rows(rows, now, fields))
+    
+    def live_list(self, board_state=None):
+        """
+        Serve the list from this process's in-memory live board.
+        
+        Times are computed against the current whole second, so the ETag is
+        known from the board state before any row is serialized.
+        `board_state` is a ``board.current().snapshot()`` already taken
+        (taken here if not given).
+        """
+        if board_state is None:
+            board_state = live_board.board.current().snapshot()
+        version, rows, logs = board_state
+        now = timezone.now().replace(microsecond=0)
+        etag = live_board.etag(version, now, self.request)
+        if_none_match = self.request.headers.get('If-None-Match')
+        if if_none_match and etag_matches(etag, if_none_match):
+            # Nothing to serialize: ConditionalGetMixin turns this into a 304
+            response = Response()
+            response['ETag'] = etag
+            return response
+        
+        fields = self.get_requested_fields()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            response = self.get_paginated_response(live_board.serialize(page, logs, now, fields))
+        else:
+            response = Response(live_board.serialize(rows, logs, now, fields))
+        response['ETag'] = etag
+        return response
+    
+    def perform_create(self, serializer):
+        """Create the employee and journal it for delta sync clients."""
+        with transaction.atomic():
+            employee = serializer.save()
+            journal.record(StatusChangeJournal.KIND_EMPLOYEE_CREATE, employee.id)
+    
+    def perform_update(self, serializer):
+        """Update the employee and journal it for delta sync clients."""
+        with transaction.atomic():
+            employee = serializer.save()
+            kind = (
+                StatusChangeJournal.KIND_EMPLOYEE_UPDATE if employee.is_active
+                else StatusChangeJournal.KIND_EMPLOYEE_DEACTIVATE
+            )
+            journal.record(kind, employee.id)
+    
+    def perform_destroy(self, instance):
+        """Delete the employee and journal it for delta sync clients."""
+        with transaction.atomic():
+            journal.record(StatusChangeJournal.KIND_EMPLOYEE_DELETE, instance.id)
+            instance.delete()
+    
+    def bulk_response(self, results, **extra):
+        """Per-item results plus a count per outcome."""
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return Response({'results': results, 'counts': counts, **extra})
+    
+    def bulk_items(self, request):
+        """The request body as a list of items, or an error Response."""
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return None, Response(
+                {'detail': 'Expected a non-empty list of employees.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.BULK_MAX_ITEMS:
+            return None, Response(
+                {'detail': f'At most {settings.BULK_MAX_ITEMS} employees per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return items, None
+    
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Create employees from a list of ``{name, email}``.
+        
+        Returns one result per item; invalid items don't block the others.
+        """
+        items, error_response = self.bulk_items(request)
+        if error_response:
+            return error_response
+        return self.bulk_response(bulk.create_employees(items))
+    
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """Update the name and/or email of a list of ``{id, name, email}``."""
+        items, error_response = self.bulk_items(request)
+        if error_response:
+            return error_response
+        return self.bulk_response(bulk.update_employees(items))
+    
+    @action(detail=False, methods=['post'])
+    def bulk_deactivate(self, request):
+        """
+        Deactivate ``{"ids": [...]}`` and close their open status logs.
+        
+        ``closed_logs`` tells how many open logs were closed.
+        """
+        serializer = BulkDeactivateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data['ids']
+        if len(ids) > settings.BULK_MAX_ITEMS:
+            return Response(
+                {'ids': [f'At most {settings.BULK_MAX_ITEMS} employees per request.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results, closed = bulk.deactivate_employees(ids)
+        return self.bulk_response(results, closed_logs=closed)
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta sync: employees changed since journal version ``?since=N``.
+        
+        Returns the new ``version``, the current rows of changed active
+        employees and the ids of employees that left the board. When
+        ``resync`` is true the client must refetch the full list.
+        """
+        try:
+            since = int(request.query_params.get('since', ''))
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'since': 'A non-negative integer journal version is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        version, employee_ids = journal.changes_since(since)
+        if employee_ids is None:
+            return Response({'version': version, 'resync': True, 'changed': [], 'removed': []})
+        
+        queryset = self.get_queryset().filter(pk__in=employee_ids)
+        now = timezone.now()
+        if live_board.is_enabled():
+            board = live_board.board.current()
+            board.sync(version)
+            _, rows, logs = board.snapshot(employee_ids)
+            changed = live_board.serialize(rows, logs, now)
+        elif fastpath.is_enabled():
+            rows = fastpath.employee_list_queryset(queryset.prefetch_related(None))
+            changed = fastpath.serialize_employee_rows(rows, now)
+        else:
+            changed = EmployeeListSerializer(queryset, many=True, context={'now': now}).data
+        active_ids = {row['id'] for row in changed}
+        
+        return Response({
+            'version': version,
+            'resync': False,
+            'changed': changed,
+            'removed': sorted(employee_ids - active_ids),
+        })
+    
+    def get_snapshot_time(self, request):
+        """The ``?at=`` time of a snapshot request, or an error Response."""
+        try:
+            at = serializers.DateTimeField().run_validation(request.query_params.get('at', ''))
+        except serializers.ValidationError as e:
+            return None, Response({'at': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return at, None
+    
+    @action(detail=False, methods=['get'])
+    def snapshot(self, request):
+        """
+        Point-in-time board: each employee's status at ``?at=<ISO 8601>``.
+        
+        Rows use the list layout, with elapsed/remaining/overdue computed as
+        of ``at``. Employees deleted before ``at`` are left out.
+        """
+        at, error_response = self.get_snapshot_time(request)
+        if error_response:
+            return error_response
+        
+        queryset = snapshot.employees_at(at)
+        if fastpath.is_enabled():
+            rows = queryset.values_list(*fastpath.EMPLOYEE_COLUMNS, 'snapshot_log_id')
+            page = self.paginate_queryset(rows)
+            data = fastpath.serialize_snapshot_rows(page if page is not None else rows, at)
+        else:
+            page = self.paginate_queryset(queryset)
+            employees = page if page is not None else list(queryset)
+            active_logs = snapshot.logs_at(at, employees)
+            for employee in employees:
+                log = active_logs.get(employee.id)
+                employee.open_status_logs = [log] if log else []
+            data = EmployeeListSerializer(
+                employees, many=True, context={'request': request, 'now': at}
+            ).data
+        
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response({'results': data})
+        response.data['at'] = serializers.DateTimeField().to_representation(at)
+        return response
+    
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
         """
@@ -60,21 +367,40 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         validated_data = serializer.validated_data
         new_status = Status.objects.get(id=validated_data['status_id'])
         
-        # Close current status log if exists
-        current_log = employee.get_current_status_log()
-        if current_log:
-            current_log.end_time = timezone.now()
-            current_log.calculate_and_save_overdue_duration()
-            current_log.save()
-        
-        # Create new status log
-        new_log = StatusLog.objects.create(
-            employee=employee,
-            status=new_status,
-            planned_end_time=validated_data.get('planned_end_time'),
-            notes=validated_data.get('notes', ''),
-            created_by=request.user
-        )
+        with transaction.atomic():
+            # Serialize concurrent changes of the same employee
+            Employee.objects.select_for_update().filter(pk=employee.pk).first()
+            
+            # Close current status log if exists
+            current_log = employee.status_logs.filter(end_time__isnull=True).first()
+            if current_log:
+                current_log.end_time = timezone.now()
+                current_log.calculate_and_save_overdue_duration()
+                current_log.save()
+            
+            # Create new status log
+            new_log = StatusLog.objects.create(
+                employee=employee,
+                status=new_status,
+                planned_end_time=validated_data.get('planned_end_time'),
+                notes=validated_data.get('notes', ''),
+                created_by=request.user
+            )
+            
+            journal.record(
+                StatusChangeJournal.KIND_STATUS_CHANGE,
+                employee.id,
+                old_log_id=current_log.id if current_log else None,
+                new_log_id=new_log.id,
+            )
+            outbox.emit(outbox.TOPIC_STATUS_CHANGED, {
+                'employee_id': employee.id,
+                'old_log_id': current_log.id if current_log else None,
+                'new_log_id': new_log.id,
+                'status_id': new_status.id,
+                'user_id': request.user.id,
+            })
+        employee.open_status_logs = [new_log]
         
         # Return updated employee data
         employee_serializer = EmployeeDetailSerializer(employee)
@@ -88,6 +414,16 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         employee = self.get_object()
         logs = StatusLog.objects.filter(employee=employee).select_related('status', 'created_by')
         
+        if 'cursor' in request.query_params:
+            return self.history_page(request, employee, logs)
+        
+        if fastpath.is_enabled():
+            rows = fastpath.status_log_queryset(logs)
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                return self.get_paginated_response(fastpath.serialize_status_log_rows(page))
+            return Response(fastpath.serialize_status_log_rows(rows))
+        
         # Apply pagination
         page = self.paginate_queryset(logs)
         if page is not None:
@@ -97,6 +433,79 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         serializer = StatusLogSerializer(logs, many=True)
         return Response(serializer.data)
     
+    def history_page(self, request, employee, logs):
+        """
+        Cursor page of ``history()``: ``?cursor=`` (empty for the newest page).
+        
+        Returns ``{'next_cursor', 'results'}``; ``next_cursor`` is the
+        ``?cursor=`` of the next (older) page, null on the oldest.
+        
+        Pages of closed logs come from the server cache when their rows are
+        unchanged and may be kept by clients for HISTORY_PAGE_MAX_AGE
+        seconds; the newest page is always revalidated.
+        """
+        page_size = self.paginator.page_size
+        cursor = request.query_params['cursor']
+        if cursor:
+            try:
+                key = history_pages.decode_cursor(cursor)
+            except ValueError:
+                raise NotFound('Invalid cursor.')
+            page, next_key, version = history_pages.older_page(logs, key, page_size, employee)
+            data, hit = history_pages.cached(
+                employee.id, key, page_size, version, lambda: self.serialize_history(page)
+            )
+        else:
+            page, next_key = history_pages.head_page(logs, page_size)
+            version = None
+            data = self.serialize_history(page)
+        
+        # The cursor alone, not a link: behind the TLS-terminating proxy the
+        # request looks like plain HTTP, and so would an absolute URL
+        next_cursor = None if next_key is None else history_pages.encode_cursor(next_key)
+        response = Response({'next_cursor': next_cursor, 'results': data})
+        if version is None:
+            response['Cache-Control'] = 'private, no-cache'
+        else:
+            response['Cache-Control'] = f'private, max-age={settings.HISTORY_PAGE_MAX_AGE}'
+            response['X-History-Cache'] = 'hit' if hit else 'miss'
+        return response
+    
+    def serialize_history(self, logs):
+        """Serialize a StatusLog queryset like the history list."""
+        if fastpath.is_enabled():
+            return fastpath.serialize_status_log_rows(fastpath.status_log_queryset(logs))
+        return StatusLogSerializer(logs, many=True).data
+    
+    @action(detail=False, methods=['get'])
+    def notes(self, request):
+        """
+        Status logs whose notes match ``?search=``, newest first.
+        
+        Returns ``{'next', 'results'}`` with history rows; ``next`` pages on
+        with ``?before=<log id>``.
+        """
+        term = request.query_params.get('search', '').strip()
+        if not term:
+            return Response({'search': 'A search term is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        before = request.query_params.get('before')
+        if before is not None:
+            try:
+                before = int(before)
+            except ValueError:
+                return Response({'before': 'A log id is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        page_size = self.paginator.page_size
+        ids = search.backend().log_ids(term, page_size + 1, before=before)
+        has_next = len(ids) > page_size
+        ids = ids[:page_size]
+        logs = StatusLog.objects.filter(pk__in=ids).select_related('status', 'created_by').order_by('-pk')
+        
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(request.build_absolute_uri(), 'before', ids[-1])
+        return Response({'next': next_url, 'results': self.serialize_history(logs)})
+    
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         """
@@ -137,20 +546,103 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class StatusViewSet(viewsets.ModelViewSet):
+class StatusViewSet(ConditionalGetMixin, ReadWriteScopeMixin, viewsets.ModelViewSet):
     """
     ViewSet for Status operations.
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = api_renderer_classes()
     serializer_class = StatusSerializer
     queryset = Status.objects.filter(is_active=True).order_by('display_order', 'name')
 
 
-class ReportViewSet(viewsets.ViewSet):
+class ReportViewSet(ConditionalGetMixin, viewsets.ViewSet):
     """
     ViewSet for generating reports.
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
+    
+    def get_range(self, request):
+        """
+        Parse the ``?from=&to=`` (ISO 8601) range of a report.
+        
+        Returns ``(bounds, errors)``: the datetimes by parameter name and the
+        validation errors, if any.
+        """
+        errors = {}
+        bounds = {}
+        for param in ('from', 'to'):
+            try:
+                bounds[param] = serializers.DateTimeField().run_validation(
+                    request.query_params.get(param, '')
+                )
+            except serializers.ValidationError as e:
+                errors[param] = e.detail
+        if not errors and bounds['to'] <= bounds['from']:
+            errors['to'] = ['Must be after "from".']
+        return bounds, errors
+    
+    @action(detail=False, methods=['get'])
+    def headcount(self, request):
+        """
+        Headcount time series: employees per status and overdue per bucket.
+        
+        ``?from=&to=`` (ISO 8601) delimit the range and ``?bucket=`` is one
+        of 15m, 1h (default) or 1d. Counts are taken at each bucket start.
+        """
+        bounds, errors = self.get_range(request)
+        bucket = request.query_params.get('bucket', '1h')
+        if bucket not in headcount.BUCKET_SECONDS:
+            errors['bucket'] = [f'Must be one of: {", ".join(headcount.BUCKET_SECONDS)}.']
+        if not errors:
+            buckets = headcount.number_of_buckets(bounds['from'], bounds['to'], bucket)
+            if buckets > settings.HEADCOUNT_MAX_BUCKETS:
+                errors['bucket'] = [f'At most {settings.HEADCOUNT_MAX_BUCKETS} buckets per request.']
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = headcount.headcount(bounds['from'], bounds['to'], bucket, timezone.now())
+        return Response({'from': bounds['from'], 'to': bounds['to'], 'bucket': bucket, **data})
+    
+    @action(detail=False, methods=['get'], renderer_classes=[*api_renderer_classes(), ExcelRenderer])
+    def utilization(self, request):
+        """
+        Hours matrix: time per employee per status over a range.
+        
+        ``?from=&to=`` (ISO 8601) delimit the range and ``?employees=1,2,3``
+        selects the team (default: all active employees). Logs are clipped to
+        the range; ``?format=xlsx`` downloads the matrix as a workbook.
+        """
+        bounds, errors = self.get_range(request)
+        employees = Employee.objects.filter(is_active=True)
+        ids = request.query_params.get('employees')
+        if ids:
+            try:
+                ids = {int(i) for i in ids.split(',')}
+            except ValueError:
+                errors['employees'] = ['Must be a comma-separated list of employee ids.']
+            else:
+                employees = Employee.objects.filter(pk__in=ids)
+                unknown = ids - set(employees.values_list('pk', flat=True))
+                if unknown:
+                    errors['employees'] = [
+                        f'Unknown employee ids: {", ".join(map(str, sorted(unknown)))}.'
+                    ]
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = {
+            'from': bounds['from'],
+            'to': bounds['to'],
+            **utilization.utilization(employees, bounds['from'], bounds['to'], timezone.now()),
+        }
+        if request.accepted_renderer.format != ExcelRenderer.format:
+            return Response(data)
+        response = Response(utilization.build_excel(data))
+        filename = f'utilization_{bounds["from"]:%Y%m%d}_{bounds["to"]:%Y%m%d}.xlsx'
+        response['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
     
     @action(detail=False, methods=['get', 'post'])
     def excel(self, request):
@@ -160,88 +652,16 @@ class ReportViewSet(viewsets.ViewSet):
         GET: Download all current employee statuses
         POST: Download custom report with filters (employee_id, status_id, start_date, end_date)
         """
-        # Parse filters from request
-        employee_id = request.data.get('employee_id') if request.method == 'POST' else None
-        status_id = request.data.get('status_id') if request.method == 'POST' else None
-        start_date = request.data.get('start_date') if request.method == 'POST' else None
-        end_date = request.data.get('end_date') if request.method == 'POST' else None
-        
-        # Build query
-        logs = StatusLog.objects.select_related('employee', 'status', 'created_by')
-        
-        if employee_id:
-            logs = logs.filter(employee_id=employee_id)
-        if status_id:
-            logs = logs.filter(status_id=status_id)
-        if start_date:
-            logs = logs.filter(start_time__gte=start_date)
-        if end_date:
-            logs = logs.filter(start_time__lte=end_date)
-        
-        logs = logs.order_by('-start_time')
-        
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Status Report"
-        
-        # Define headers
-        headers = [
-            'Employee', 'Status', 'Start Time', 'End Time',
-            'Planned End', 'Duration (hours)', 'Overdue (hours)', 'Notes'
-        ]
-        
-        # Style headers
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Add data rows
-        for row_num, log in enumerate(logs, 2):
-            ws.cell(row=row_num, column=1).value = log.employee.name
-            ws.cell(row=row_num, column=2).value = log.status.name
-            ws.cell(row=row_num, column=3).value = log.start_time.strftime('%Y-%m-%d %H:%M:%S')
-            ws.cell(row=row_num, column=4).value = log.end_time.strftime('%Y-%m-%d %H:%M:%S') if log.end_time else 'Active'
-            ws.cell(row=row_num, column=5).value = log.planned_end_time.strftime('%Y-%m-%d %H:%M:%S') if log.planned_end_time else 'N/A'
-            
-            # Calculate duration
-            if log.end_time:
-                duration_hours = (log.end_time - log.start_time).total_seconds() / 3600
-            else:
-                duration_hours = (timezone.now() - log.start_time).total_seconds() / 3600
-            ws.cell(row=row_num, column=6).value = round(duration_hours, 2)
-            
-            # Overdue duration
-            overdue_hours = log.overdue_duration / 3600
-            ws.cell(row=row_num, column=7).value = round(overdue_hours, 2) if overdue_hours > 0 else 0
-            
-            ws.cell(row=row_num, column=8).value = log.notes
-        
-        # Auto-size columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Generate response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        data = request.data if request.method == 'POST' else {}
+        filter_serializer = ReportFilterSerializer(data=data)
+        if not filter_serializer.is_valid():
+            return Response(filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Past periods are served from the report cache while their data is unchanged
+        content, cache_state = report_cache.excel(filter_serializer.validated_data)
+        
+        response = HttpResponse(content, content_type=reports.EXCEL_CONTENT_TYPE)
         filename = f'employee_status_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         response['Content-Disposition'] = f'attachment; filename={filename}'
-        
-        wb.save(response)
+        response['X-Report-Cache'] = cache_state
         return response
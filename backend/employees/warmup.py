@@ -0,0 +1,69 @@
+"""
+Worker warm-up.
+
+A fresh worker pays one-off costs on its first requests: importing the URL
+configuration and views, opening the database connection, filling the
+database page cache for the board tables, loading the live board and
+building serializers and renderers. ``warm_up()`` pays them up front by
+running the busiest read endpoints once, in-process, as an unsaved user and
+without throttling.
+
+Run it from a post-fork hook (see gunicorn.conf.py) or with
+``python manage.py warm_up``.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import live_board
+
+# Board reads clients make right after a deploy
+WARM_UP_PATHS = (
+    '/api/statuses/',
+    '/api/employees/',
+    '/api/employees/?view=compact',
+)
+
+
+def warm_up_host():
+    """A Host header accepted by ALLOWED_HOSTS (pagination links need one)."""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and host != '*':
+            return host
+    return 'localhost'
+
+
+def warm_request(path, user):
+    """Run one GET through the view behind `path`; returns the status code."""
+    match = resolve(path.split('?')[0])
+    view = match.func.cls.as_view(match.func.actions, throttle_classes=())
+    request = APIRequestFactory().get(path, HTTP_HOST=warm_up_host())
+    force_authenticate(request, user=user)
+    response = view(request, *match.args, **match.kwargs)
+    response.render()
+    return response.status_code
+
+
+def warm_up(paths=WARM_UP_PATHS):
+    """Warm up this process; returns ``[(step, status code or None, seconds)]``."""
+    steps = []
+    started = time.perf_counter()
+    connection.ensure_connection()
+    steps.append(('database connection', None, time.perf_counter() - started))
+
+    if live_board.is_enabled():
+        started = time.perf_counter()
+        live_board.board.load()
+        steps.append(('live board', None, time.perf_counter() - started))
+
+    user = User(username='warm-up')
+    for path in paths:
+        started = time.perf_counter()
+        status_code = warm_request(path, user)
+        steps.append((path, status_code, time.perf_counter() - started))
+    return steps
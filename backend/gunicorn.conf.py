@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration (loaded automatically when started from backend/).
+"""
+import os
+
+# Workers serve the board list from their in-memory live board
+os.environ.setdefault('LIVE_BOARD', 'True')
+
+
+def post_worker_init(worker):
+    """
+    Warm up each new worker before it accepts requests.
+
+    A failed warm-up (database unreachable at boot, ...) is logged and the
+    worker serves cold: it must never keep gunicorn from booting.
+    """
+    if os.getenv('WARM_UP_WORKERS', 'True') != 'True':
+        return
+    try:
+        from employees.warmup import warm_up
+
+        for step, status_code, seconds in warm_up():
+            worker.log.debug('Warm-up %s (%s): %.1f ms', step, status_code, seconds * 1000)
+    except Exception:  # noqa: BLE001 - a cold worker beats no worker
+        worker.log.exception('Warm-up failed; worker %s starts cold', worker.pid)
@@ -0,0 +1,120 @@
+/**
+ * Windowed list: renders only the items near the viewport.
+ *
+ * The page keeps scrolling as usual (window scroll); items above and below
+ * the visible range are replaced by spacers of their height. Heights are
+ * measured once rendered (items may differ, e.g. cards with notes) and
+ * estimated until then, so the list stays cheap with thousands of items.
+ */
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+
+// Index of the first item whose bottom edge is below `position`
+const findFirstVisible = (offsets, position) => {
+  let low = 0;
+  let high = offsets.length - 2;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (offsets[middle + 1] <= position) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return low;
+};
+
+const VirtualList = ({ items, getKey, renderItem, estimatedHeight = 300, overscan = 800 }) => {
+  const containerRef = useRef(null);
+  const heights = useRef(new Map());
+  const [measured, setMeasured] = useState(0);
+  const [viewport, setViewport] = useState({ top: 0, bottom: window.innerHeight });
+
+  // Visible range relative to the top of the list, read once per animation frame
+  useEffect(() => {
+    let frame = null;
+    const update = () => {
+      frame = null;
+      if (!containerRef.current) return;
+      const top = -containerRef.current.getBoundingClientRect().top;
+      setViewport({ top, bottom: top + window.innerHeight });
+    };
+    const onScroll = () => {
+      if (frame === null) frame = requestAnimationFrame(update);
+    };
+    update();
+    window.addEventListener('scroll', onScroll, { passive: true });
+    window.addEventListener('resize', onScroll);
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener('scroll', onScroll);
+      window.removeEventListener('resize', onScroll);
+    };
+  }, []);
+
+  // offsets[i] = top of item i; offsets[items.length] = total height
+  const offsets = useMemo(() => {
+    const result = new Array(items.length + 1);
+    result[0] = 0;
+    items.forEach((item, index) => {
+      const height = heights.current.get(String(getKey(item))) ?? estimatedHeight;
+      result[index + 1] = result[index] + height;
+    });
+    return result;
+  }, [items, getKey, estimatedHeight, measured]);
+
+  const first = items.length ? findFirstVisible(offsets, viewport.top - overscan) : 0;
+  let last = first;
+  while (last < items.length && offsets[last] < viewport.bottom + overscan) {
+    last += 1;
+  }
+
+  // Record the real heights of rendered items; re-layout only when one changed
+  const observer = useRef(null);
+  const measure = useCallback((entries) => {
+    let changed = false;
+    entries.forEach((entry) => {
+      if (!entry.target.isConnected) {
+        // Scrolled out of range: keep the height it had
+        observer.current.unobserve(entry.target);
+        return;
+      }
+      const key = entry.target.dataset.key;
+      const height = Math.ceil(entry.borderBoxSize?.[0]?.blockSize ?? entry.target.offsetHeight);
+      if (heights.current.get(key) !== height) {
+        heights.current.set(key, height);
+        changed = true;
+      }
+    });
+    if (changed) setMeasured((version) => version + 1);
+  }, []);
+
+  useEffect(() => () => {
+    observer.current?.disconnect();
+    observer.current = null;
+  }, []);
+
+  // Item refs are attached before effects run, so the observer is created here
+  const itemRef = useCallback((element) => {
+    if (!element) return;
+    if (!observer.current) observer.current = new ResizeObserver(measure);
+    observer.current.observe(element);
+  }, [measure]);
+
+  return (
+    <div ref={containerRef}>
+      <div style={{ height: offsets[first] }} />
+      {items.slice(first, last).map((item) => {
+        const key = String(getKey(item));
+        return (
+          // flow-root keeps the item's margins inside the measured box
+          <div key={key} data-key={key} ref={itemRef} style={{ display: 'flow-root' }}>
+            {renderItem(item)}
+          </div>
+        );
+      })}
+      <div style={{ height: offsets[items.length] - offsets[last] }} />
+    </div>
+  );
+};
+
+export default VirtualList;
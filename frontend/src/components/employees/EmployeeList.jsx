@@ -1,13 +1,16 @@
 /**
  * Main employee list component (dashboard).
  */
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import api from '../../services/api';
 import { usePolling } from '../../hooks/usePolling';
 import EmployeeCard from './EmployeeCard';
 import StatusChangeModal from './StatusChangeModal';
 import LoadingSpinner from '../common/LoadingSpinner';
+import VirtualList from '../common/VirtualList';
+
+const employeeKey = (employee) => employee.id;
 
 const EmployeeList = () => {
   const [employees, setEmployees] = useState([]);
@@ -36,17 +39,26 @@ const EmployeeList = () => {
     fetchEmployees();
   }, []);
 
-  // Poll server every 5 seconds
+  // Poll server every 5 seconds while the tab is visible (hidden tabs don't poll)
   usePolling(fetchEmployees, 5000);
 
-  const handleChangeStatus = (employee) => {
+  // Stable handlers, so memoized cards only re-render when their employee changes
+  const handleChangeStatus = useCallback((employee) => {
     setSelectedEmployee(employee);
     setShowStatusModal(true);
-  };
+  }, []);
 
-  const handleViewHistory = (employee) => {
+  const handleViewHistory = useCallback((employee) => {
     navigate(`/history/${employee.id}`);
-  };
+  }, [navigate]);
+
+  const renderEmployee = useCallback((employee) => (
+    <EmployeeCard
+      employee={employee}
+      onChangeStatus={handleChangeStatus}
+      onViewHistory={handleViewHistory}
+    />
+  ), [handleChangeStatus, handleViewHistory]);
 
   const handleStatusChangeSuccess = () => {
     fetchEmployees();
@@ -76,18 +88,9 @@ const EmployeeList = () => {
           </div>
         )}
 
-        {/* Employee Cards */}
+        {/* Employee Cards (only those near the viewport are rendered) */}
         {employees.length > 0 ? (
-          <div className="space-y-4">
-            {employees.map((employee) => (
-              <EmployeeCard
-                key={employee.id}
-                employee={employee}
-                onChangeStatus={handleChangeStatus}
-                onViewHistory={handleViewHistory}
-              />
-            ))}
-          </div>
+          <VirtualList items={employees} getKey={employeeKey} renderItem={renderEmployee} />
         ) : (
           <div className="bg-white rounded-lg shadow-md p-8 text-center">
             <p className="text-gray-500">Співробітників не знайдено</p>
@@ -6,11 +6,11 @@ import { useTimer } from '../../hooks/useTimer';
 import { calculateElapsedSeconds, calculateRemainingSeconds, formatDurationHuman, isOverdue } from '../../utils/timeUtils';
 
 const Timer = ({ startTime, plannedEndTime }) => {
-  const currentTime = useTimer(1000); // Update every second
+  const currentTime = useTimer(1000); // Shared clock, ticks every second
 
-  const elapsedSeconds = calculateElapsedSeconds(startTime);
-  const remainingSeconds = calculateRemainingSeconds(plannedEndTime);
-  const overdue = isOverdue(plannedEndTime);
+  const elapsedSeconds = calculateElapsedSeconds(startTime, currentTime);
+  const remainingSeconds = calculateRemainingSeconds(plannedEndTime, currentTime);
+  const overdue = isOverdue(plannedEndTime, currentTime);
 
   return (
     <div className="space-y-2">
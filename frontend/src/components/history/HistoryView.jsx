@@ -14,47 +14,60 @@ const HistoryView = () => {
   const [employee, setEmployee] = useState(null);
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
-  const [page, setPage] = useState(1);
-  const [hasMore, setHasMore] = useState(true);
+  // Cursor pages: the newest page first, then the page at each `next_cursor`.
+  // Pages of closed logs never change, so the browser serves them from its cache.
+  const historyUrl = `/employees/${employeeId}/history/`;
+  const [nextCursor, setNextCursor] = useState(null);
 
   useEffect(() => {
     fetchEmployeeAndHistory();
-  }, [employeeId, page]);
+  }, [employeeId]);
 
   const fetchEmployeeAndHistory = async () => {
+    setLoading(true);
     try {
       // Fetch employee details
       const empResponse = await api.get(`/employees/${employeeId}/`);
       setEmployee(empResponse.data);
 
-      // Fetch history
-      const historyResponse = await api.get(`/employees/${employeeId}/history/?page=${page}`);
-      
-      if (page === 1) {
-        setHistory(historyResponse.data.results || historyResponse.data);
-      } else {
-        setHistory(prev => [...prev, ...(historyResponse.data.results || historyResponse.data)]);
-      }
-      
-      setHasMore(!!historyResponse.data.next);
-      setLoading(false);
+      // Fetch the newest history page
+      const historyResponse = await api.get(historyUrl, {
+        params: { cursor: '' },
+      });
+      setHistory(historyResponse.data.results);
+      setNextCursor(historyResponse.data.next_cursor);
       setError('');
     } catch (err) {
       setError('Помилка завантаження історії');
+    } finally {
       setLoading(false);
     }
   };
 
-  const handleLoadMore = () => {
-    setPage(prev => prev + 1);
+  const handleLoadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const historyResponse = await api.get(historyUrl, {
+        params: { cursor: nextCursor },
+      });
+      setHistory(prev => [...prev, ...historyResponse.data.results]);
+      setNextCursor(historyResponse.data.next_cursor);
+      setError('');
+    } catch (err) {
+      setError('Помилка завантаження історії');
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
   const handleBack = () => {
     navigate('/');
   };
 
-  if (loading && page === 1) {
+  if (loading) {
     return (
       <div className="min-h-screen bg-gray-100 py-8">
         <LoadingSpinner text="Завантаження історії..." />
@@ -112,7 +125,7 @@ const HistoryView = () => {
             </div>
 
             {/* Load More Button */}
-            {hasMore && (
+            {nextCursor && (
               <div className="mt-6 text-center">
                 <button
                   onClick={handleLoadMore}
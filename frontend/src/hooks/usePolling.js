@@ -1,9 +1,15 @@
 /**
  * Custom hook for polling data at regular intervals.
+ *
+ * Polls are chained (the next one is scheduled when the callback's promise
+ * settles), so slow responses never pile up. While the tab is hidden,
+ * polling stops, or slows down to `hiddenInterval` when one is given; when
+ * the tab becomes visible again it polls right away and resumes the normal
+ * interval.
  */
 import { useEffect, useRef } from 'react';
 
-export const usePolling = (callback, interval = 5000, dependencies = []) => {
+export const usePolling = (callback, interval = 5000, dependencies = [], { hiddenInterval = null } = {}) => {
   const savedCallback = useRef();
 
   // Remember the latest callback
@@ -11,15 +17,55 @@ export const usePolling = (callback, interval = 5000, dependencies = []) => {
     savedCallback.current = callback;
   }, [callback]);
 
-  // Set up the interval
+  // Set up the polling loop
   useEffect(() => {
-    function tick() {
-      savedCallback.current();
+    if (interval === null) {
+      return undefined;
     }
 
-    if (interval !== null) {
-      const id = setInterval(tick, interval);
-      return () => clearInterval(id);
+    let timeoutId = null;
+    let inFlight = false;
+    let cancelled = false;
+
+    const schedule = () => {
+      clearTimeout(timeoutId);
+      const delay = document.hidden ? hiddenInterval : interval;
+      timeoutId = delay === null ? null : setTimeout(tick, delay);
+    };
+
+    async function tick() {
+      timeoutId = null;
+      inFlight = true;
+      try {
+        await savedCallback.current();
+      } finally {
+        inFlight = false;
+        if (!cancelled) {
+          schedule();
+        }
+      }
     }
-  }, [interval, ...dependencies]);
+
+    // A poll in flight reschedules itself when it settles
+    const handleVisibilityChange = () => {
+      if (inFlight) {
+        return;
+      }
+      if (document.hidden) {
+        schedule();
+      } else {
+        // Catch up at once instead of showing stale data for a whole interval
+        clearTimeout(timeoutId);
+        tick();
+      }
+    };
+
+    schedule();
+    document.addEventListener('visibilitychange', handleVisibilityChange);
+    return () => {
+      cancelled = true;
+      clearTimeout(timeoutId);
+      document.removeEventListener('visibilitychange', handleVisibilityChange);
+    };
+  }, [interval, hiddenInterval, ...dependencies]);
 };
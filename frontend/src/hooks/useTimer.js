@@ -1,18 +1,65 @@
 /**
  * Custom hook for real-time timer updates.
+ *
+ * All components using the same interval share one ticker: a single
+ * setInterval drives every timer on the page, and React renders them in one
+ * batch per tick. Tickers stop when their last component unmounts, and
+ * pause while the tab is hidden.
  */
-import { useState, useEffect } from 'react';
+import { useSyncExternalStore } from 'react';
 
-export const useTimer = (interval = 1000) => {
-  const [currentTime, setCurrentTime] = useState(new Date());
+// interval -> { now, listeners, timerId, subscribe, getSnapshot }
+const tickers = new Map();
 
-  useEffect(() => {
-    const timer = setInterval(() => {
-      setCurrentTime(new Date());
-    }, interval);
+const tick = (ticker) => {
+  ticker.now = new Date();
+  ticker.listeners.forEach((listener) => listener());
+};
 
-    return () => clearInterval(timer);
-  }, [interval]);
+const start = (ticker, interval) => {
+  if (ticker.timerId === null && !document.hidden) {
+    tick(ticker);
+    ticker.timerId = setInterval(() => tick(ticker), interval);
+  }
+};
+
+const stop = (ticker) => {
+  clearInterval(ticker.timerId);
+  ticker.timerId = null;
+};
 
-  return currentTime;
+const getTicker = (interval) => {
+  let ticker = tickers.get(interval);
+  if (!ticker) {
+    ticker = { now: new Date(), listeners: new Set(), timerId: null };
+    // Stable functions, so components subscribe once rather than on every render
+    ticker.subscribe = (listener) => {
+      ticker.listeners.add(listener);
+      start(ticker, interval);
+      return () => {
+        ticker.listeners.delete(listener);
+        if (ticker.listeners.size === 0) {
+          stop(ticker);
+        }
+      };
+    };
+    ticker.getSnapshot = () => ticker.now;
+    tickers.set(interval, ticker);
+  }
+  return ticker;
+};
+
+document.addEventListener('visibilitychange', () => {
+  tickers.forEach((ticker, interval) => {
+    if (document.hidden) {
+      stop(ticker);
+    } else if (ticker.listeners.size > 0) {
+      start(ticker, interval);
+    }
+  });
+});
+
+export const useTimer = (interval = 1000) => {
+  const ticker = getTicker(interval);
+  return useSyncExternalStore(ticker.subscribe, ticker.getSnapshot);
 };
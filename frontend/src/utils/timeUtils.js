@@ -57,30 +57,28 @@ export const formatDate = (dateString) => {
 };
 
 /**
- * Calculate elapsed seconds from a start time to now.
+ * Calculate elapsed seconds from a start time to now (or to `now`).
  */
-export const calculateElapsedSeconds = (startTime) => {
+export const calculateElapsedSeconds = (startTime, now = new Date()) => {
   const start = new Date(startTime);
-  const now = new Date();
   return Math.floor((now - start) / 1000);
 };
 
 /**
- * Calculate remaining seconds from now to a planned end time.
+ * Calculate remaining seconds from now (or from `now`) to a planned end time.
  */
-export const calculateRemainingSeconds = (plannedEndTime) => {
+export const calculateRemainingSeconds = (plannedEndTime, now = new Date()) => {
   if (!plannedEndTime) return null;
   const end = new Date(plannedEndTime);
-  const now = new Date();
   return Math.floor((end - now) / 1000);
 };
 
 /**
- * Check if a status is overdue based on planned end time.
+ * Check if a status is overdue based on planned end time (at `now`).
  */
-export const isOverdue = (plannedEndTime) => {
+export const isOverdue = (plannedEndTime, now = new Date()) => {
   if (!plannedEndTime) return false;
-  return new Date(plannedEndTime) < new Date();
+  return new Date(plannedEndTime) < now;
 };
 
 /**